@@ -1,9 +1,36 @@
+"""
+Juego, generador y solucionador de Sudoku.
+
+Ejecutado como programa abre el menú interactivo (o un subcomando, ver main()).
+Importado como módulo no pide datos ni carga matplotlib, y expone una API sin
+estado global: resolver() devuelve un ResultadoSolucion con la solución, el camino,
+los contadores y el tiempo de cada llamada, así que se puede usar desde varios hilos.
+
+    import Sudoku
+    resultado = Sudoku.resolver("8..........36......7..9.2...5...7.......457.....1...3...1....68..85...1..9....4..")
+    print(resultado.resuelto, resultado.nodos_explorados, resultado.tiempo)
+"""
 import random
 import time  # Importar el módulo para medir el tiempo
 import sys
-import copy
 import heapq  # Para la cola de prioridad
-import matplotlib.pyplot as plt
+import itertools
+import os
+import argparse
+import multiprocessing
+import collections
+import dataclasses
+import json
+import csv
+import platform
+import hashlib
+import math
+import mmap
+import struct
+import asyncio
+import concurrent.futures
+import functools
+import queue
 
 # ========================
 # Funciones de utilidades
@@ -19,113 +46,661 @@ def barra_de_carga(iterable, total, prefix='', length=40, fill='█'):
 # ========================
 # Creacion y armado del tablero
 # ========================
-def crear_tablero_sudoku_vacio():
-    return [[0 for _ in range(9)] for _ in range(9)]
+def crear_tablero_sudoku_vacio(n=9):
+    """Tablero vacío de n×n (n tiene que ser un cuadrado: 9, 16, 25...)."""
+    return [[0 for _ in range(n)] for _ in range(n)]
 
-def imprimir_tablero(tablero):
-    """Imprime el tablero de Sudoku de forma legible."""
-    for i in range(9):
-        if i % 3 == 0 and i != 0:
-            print("-" * 21)
-        for j in range(9):
-            if j % 3 == 0 and j != 0:
+
+class Tablero:
+    """
+    Tablero compacto: las n×n celdas en un bytearray, recorridas por filas.
+    tablero[fila][col] funciona igual que con una lista de listas (cada fila pedida es una
+    vista memoryview nueva sobre las celdas, sin copiarlas), así que los solvers, los
+    validadores e imprimir_tablero lo aceptan sin cambios. Copiarlo es copiar n² bytes.
+    """
+    __slots__ = ("celdas", "n")
+
+    def __init__(self, celdas=None, n=9):
+        self.celdas = bytearray(n * n) if celdas is None else bytearray(celdas)
+        self.n = math.isqrt(len(self.celdas))
+        if self.n * self.n != len(self.celdas) or math.isqrt(self.n) ** 2 != self.n:
+            raise ValueError(f"Un Tablero tiene n×n celdas con n cuadrado (81, 256, 625...), no {len(self.celdas)}")
+
+    @classmethod
+    def desde_lista(cls, tablero):
+        return cls(celda for fila in tablero for celda in fila)
+
+    @classmethod
+    def desde_linea(cls, linea):
+        return cls.desde_lista(linea_a_tablero(linea))
+
+    def a_lista(self):
+        celdas, n = self.celdas, self.n
+        return [list(celdas[fila * n:fila * n + n]) for fila in range(n)]
+
+    def __getitem__(self, fila):
+        # No se guardan las vistas: n memoryviews por tablero pesan más que las celdas mismas
+        n = self.n
+        if fila < 0:
+            fila += n
+        if not 0 <= fila < n:
+            raise IndexError("fila fuera del tablero")
+        return memoryview(self.celdas)[fila * n:fila * n + n]
+
+    def __len__(self):
+        return self.n
+
+    def __iter__(self):
+        return iter(self[fila] for fila in range(self.n))
+
+    def __eq__(self, otro):
+        if isinstance(otro, Tablero):
+            return self.celdas == otro.celdas
+        return self.a_lista() == otro
+
+    __hash__ = None
+
+    def copia(self):
+        return Tablero(self.celdas)
+
+    __copy__ = copia
+
+    def __deepcopy__(self, memo):
+        return self.copia()
+
+    def __reduce__(self):
+        # Sólo viajan los n² bytes de las celdas
+        return (Tablero, (bytes(self.celdas),))
+
+    def __repr__(self):
+        return f"Tablero({tablero_a_linea(self)!r})"
+
+    @staticmethod
+    def vecinos(fila, col, n=9):
+        """Índices (de 0 a n²-1) de las celdas que comparten fila, columna o bloque (20 en 9x9)."""
+        return geometria(n).vecinos[fila * n + col]
+
+def copiar_tablero(tablero):
+    """Copia barata de un tablero, sea Tablero o lista de listas."""
+    if isinstance(tablero, Tablero):
+        return tablero.copia()
+    return [fila[:] for fila in tablero]
+
+def restaurar_tablero(tablero, copia):
+    """Vuelve a poner en tablero los valores de copia (sin crear un tablero nuevo)."""
+    n = len(tablero)
+    for fila in range(n):
+        for col in range(n):
+            tablero[fila][col] = copia[fila][col]
+
+def imprimir_tablero(tablero, jugables=None, conflictos=()):
+    """
+    Imprime el tablero de Sudoku de forma legible. Las celdas jugables (por defecto,
+    CELDAS_JUGABLES) van en amarillo y las de conflictos, en rojo.
+    """
+    n = len(tablero)
+    lado = math.isqrt(n)
+    ancho = len(str(n))  # En 16×16 y 25×25 los números ocupan dos columnas
+    jugables = set(CELDAS_JUGABLES if jugables is None else jugables)
+    for i in range(n):
+        if i % lado == 0 and i != 0:
+            print("-" * ((ancho + 1) * n + 2 * (lado - 1) - 1))
+        for j in range(n):
+            if j % lado == 0 and j != 0:
                 print("|", end=" ")
-            # Verifica si la celda actual está en CELDAS_JUGABLES
-            if (i, j) in CELDAS_JUGABLES:
+            texto = str(tablero[i][j] if tablero[i][j] != 0 else ".").rjust(ancho)
+            if (i, j) in conflictos:
+                # Código ANSI para texto rojo
+                print(f"\033[91m{texto}\033[0m", end=" ")
+            # Verifica si la celda actual es jugable
+            elif (i, j) in jugables:
                 # Código ANSI para texto amarillo
-                print(f"\033[93m{tablero[i][j] if tablero[i][j] != 0 else '.'}\033[0m", end=" ")
+                print(f"\033[93m{texto}\033[0m", end=" ")
             else:
-                print(tablero[i][j] if tablero[i][j] != 0 else ".", end=" ")
+                print(texto, end=" ")
         print()
 
-# Resolver Sudoku usando backtracking puro de forma aleatoria
-def resolver_aleatorio_backtracking_puro(tablero):
-    for fila in range(9):
-        for col in range(9):
-            if tablero[fila][col] == 0:
-                # Probar números del 1 al 9 en orden aleatorio
-                numeros = random.sample(range(1, 10), 9)
-                for num in numeros:
-                    if es_valido(tablero, fila, col, num):
-                        tablero[fila][col] = num
-                        if resolver_aleatorio_backtracking_puro(tablero):
-                            return True
-                        tablero[fila][col] = 0              
-                return False
-    return True
+# Símbolo de cada valor en el formato de una línea: '.' vacía, 1-9 y luego letras (hasta 25×25)
+SIMBOLOS = ".123456789ABCDEFGHIJKLMNOP"
+
+def tablero_a_linea(tablero):
+    """
+    Convierte el tablero al formato estándar de una línea ('.' para las celdas vacías):
+    81 caracteres en 9×9; en 16×16 y 25×25 los valores desde 10 se escriben A, B, C...
+    """
+    if isinstance(tablero, Tablero):
+        return bytes(tablero.celdas).translate(_BYTES_A_LINEA).decode("ascii")
+    return "".join(SIMBOLOS[celda] for fila in tablero for celda in fila)
 
+_BYTES_A_LINEA = bytes.maketrans(bytes(range(len(SIMBOLOS))), SIMBOLOS.encode("ascii"))
+
+def linea_a_tablero(linea):
+    """Convierte una línea de 81, 256 o 625 caracteres ('0' o '.' para las vacías) en un tablero."""
+    linea = linea.strip().upper()
+    n = math.isqrt(len(linea))
+    validos = "0." + SIMBOLOS[1:n + 1]
+    if n * n != len(linea) or n not in (9, 16, 25) or any(c not in validos for c in linea):
+        raise ValueError(f"La línea no es un tablero de 81, 256 o 625 caracteres: {linea!r}")
+    valores = [max(SIMBOLOS.find(c), 0) for c in linea]
+    return [valores[fila * n:fila * n + n] for fila in range(n)]
 
 # Función para resolver el tablero usando el algoritmo elegido
-def resolver_tablero_juego(tablero, algoritmo):
-    global PASOS_ATRAS
+# motor="bitmask" usa las máscaras de MotorBitmask, motor="listas" los recorridos originales con es_valido.
+# Con un Propagador (sólo en el motor bitmask) se propagan restricciones en cada nodo.
+# Con Limites, si se agotan devuelve None y deja el tablero como estaba.
+def resolver_tablero_juego(tablero, algoritmo, motor="bitmask", propagador=None, instrumentacion=None, limites=None,
+                           usar_cache=True):
+    global PASOS_ATRAS, CELDAS_JUGABLES
     PASOS_ATRAS = 0
-    if algoritmo == 1:
-        return resolver_backtracking_puro(tablero)
-    elif algoritmo == 2:
-        return resolver_sudoku_bb_cotas(tablero)
-    else:
+    if algoritmo not in (1, 2, 3):
         print("Opción inválida.")
         return False
+    if algoritmo == 2:
+        CELDAS_JUGABLES = celdas_vacias_de(tablero)
+    cache = CACHE_SOLUCIONES if usar_cache else None
+    if cache is not None:
+        # Un tablero ya resuelto (o equivalente a uno resuelto) se completa sin buscar
+        guardado = cache.buscar(tablero)
+        if guardado is not None and (guardado[0] == 0 or guardado[1] is not None):
+            soluciones, solucion = guardado
+            estado = EstadoBusqueda()
+            if soluciones != 0:
+                for fila, col in celdas_vacias_de(tablero):
+                    tablero[fila][col] = estado.solucion[(fila, col)] = solucion[fila][col]
+            _sincronizar_globales(estado)
+            return soluciones != 0
+    original = copiar_tablero(tablero) if cache is not None or limites is not None else None
+    if limites is None:
+        resuelto, estado = ejecutar_algoritmo(tablero, algoritmo, motor, propagador, instrumentacion)
+    else:
+        try:
+            resuelto, estado = ejecutar_algoritmo(tablero, algoritmo, motor, propagador, limites.observar(instrumentacion))
+        except BusquedaInterrumpida:
+            restaurar_tablero(tablero, original)
+            estado = limites.estado_parcial()
+            resuelto = None
+    # Ramificación y poda se rinde cuando ninguna celda tiene 6 opciones o menos: su "sin
+    # solución" no es definitivo y no se guarda (los otros algoritmos recorren todo el árbol)
+    if cache is not None and resuelto is not None and (resuelto or algoritmo != 2):
+        cache.guardar(original, None if resuelto else 0, tablero if resuelto else None)
+    _sincronizar_globales(estado, propagador)
+    return resuelto
+
+def ejecutar_algoritmo(tablero, algoritmo, motor="bitmask", propagador=None, instrumentacion=None):
+    """
+    Resuelve el tablero (modificándolo) sin tocar variables globales.
+    Devuelve (resuelto, estado), donde estado tiene pasos_atras, nodos_explorados y solucion.
+    Con una Instrumentacion se reportan los eventos y tiempos de la búsqueda.
+    motor es "bitmask" o "listas" (Dancing Links no usa ninguno de los dos).
+    """
+    if motor not in ("bitmask", "listas"):
+        raise ValueError(f"Motor inválido: {motor}")
+    if algoritmo == 1:
+        if motor == "bitmask":
+            return ejecutar_backtracking_bitmask(tablero, propagador, instrumentacion)
+        estado = EstadoBusqueda()
+        return resolver_backtracking_puro(tablero, estado, instrumentacion), estado
+    elif algoritmo == 2:
+        if motor == "bitmask":
+            return ejecutar_bb_bitmask(tablero, propagador=propagador, instrumentacion=instrumentacion)
+        estado = EstadoBusqueda()
+        return resolver_sudoku_bb_cotas(tablero, estado, instrumentacion), estado
+    elif algoritmo == 3:
+        return ejecutar_dlx(tablero, instrumentacion)
+    raise ValueError(f"Algoritmo inválido: {algoritmo}")
 
 # Generar un tablero completo de Sudoku (con una única solución)
-def generar_tablero_completo():
-    """Genera un tablero completo y válido de Sudoku."""
-    tablero = crear_tablero_sudoku_vacio()
-    resolver_aleatorio_backtracking_puro(tablero)  # Utiliza backtracking puro
-    return tablero
+def generar_tablero_completo(rng=random, limites=None, n=9):
+    """
+    Genera un tablero completo y válido de Sudoku de n×n (None si se agotan los limites).
+    Se llena con llenar_tablero_rapido: máscaras de bits y la celda con menos opciones primero.
+    """
+    try:
+        celdas = llenar_tablero_rapido(rng, n, limites)
+    except BusquedaInterrumpida:
+        return None
+    return [celdas[fila * n:fila * n + n] for fila in range(n)]
+
+def generar_tableros_completos(cantidad, rng=random, n=9, variantes=1):
+    """
+    Genera cantidad tableros completos de una vez. Cada llenado al azar se aprovecha para
+    variantes tableros: el primero tal cual y el resto con una transformación al azar que
+    conserva la validez (trasponer, permutar bandas, filas, pilas y columnas, renombrar
+    dígitos), que es mucho más barata que volver a llenar pero repite la clase del tablero.
+    """
+    tableros = []
+    while len(tableros) < cantidad:
+        celdas = llenar_tablero_rapido(rng, n)
+        base = [celdas[fila * n:fila * n + n] for fila in range(n)]
+        tableros.append(base)
+        for _ in range(min(variantes, cantidad - len(tableros) + 1) - 1):
+            transformadas = aplicar_transformacion(base, transformacion_aleatoria(n, rng))
+            tableros.append([list(transformadas[fila * n:fila * n + n]) for fila in range(n)])
+    return tableros
 
 
-def contar_soluciones(tablero):
+def contar_soluciones(tablero, limites=None):
     """
     Cuenta cuántas soluciones tiene un tablero de Sudoku.
-    Si hay más de 1 solución, se detiene temprano.
+    Si hay más de 1 solución, se detiene temprano. Devuelve None si se agotan los limites.
     """
-    soluciones = [0]  # Usamos una lista mutable para mantener el conteo
+    try:
+        return completar_busqueda(conteo_iterativo(MotorBitmask(tablero), 2), limites)
+    except BusquedaInterrumpida:
+        return None
 
-    def resolver(tablero):
-        if soluciones[0] > 1:
-            #print("Se encontró mas de una solución")
-            return  # Termina si encuentra más de 1 solución
-        for fila in range(9):
-            for col in range(9):
-                if tablero[fila][col] == 0:
-                    for num in range(1, 10):
-                        if es_valido(tablero, fila, col, num):
-                            tablero[fila][col] = num
-                            resolver(tablero)
-                            tablero[fila][col] = 0
-                    return
-        soluciones[0] += 1
+def conteo_iterativo(motor, limite):
+    """
+    Cuenta soluciones con una pila explícita hasta llegar a limite. Hace yield después de
+    cada colocación. Al terminar (o al cerrar el generador) el tablero queda como estaba.
+    """
+    vacias = [i for i, num in enumerate(motor.celdas) if num == 0]
+    digitos = motor.geometria.digitos
+    soluciones = 0
+    pila = []  # Por nivel: [celda, opciones, índice de la próxima opción]
+    try:
+        while True:
+            if len(pila) == len(vacias):
+                soluciones += 1
+                if soluciones >= limite:
+                    return soluciones
+            else:
+                i = vacias[len(pila)]
+                pila.append([i, digitos[motor.opciones(i)], 0])
+            while pila:
+                marco = pila[-1]
+                i, opciones, k = marco
+                if k:
+                    motor.quitar(i)
+                if k < len(opciones):
+                    break
+                pila.pop()
+            else:
+                return soluciones
+            marco[2] = k + 1
+            motor.colocar(i, opciones[k])
+            yield
+    finally:
+        for i, _, k in pila:
+            if k:
+                motor.quitar(i)
 
-    resolver(tablero)
-    return soluciones[0]
+def llenar_tablero_rapido(rng=random, n=9, limites=None):
+    """
+    Llena un tablero vacío de n×n al azar y devuelve sus n² celdas (por filas) en una lista.
+    Los bloques de la diagonal no comparten filas ni columnas, así que se llenan directamente
+    con una permutación cada uno; el resto se completa con máscaras de bits locales, eligiendo
+    la celda con menos opciones y probando sus números en orden aleatorio. Algunos llenados se
+    empantanan retrocediendo (sobre todo en 16×16 y 25×25): pasadas 4·n² colocaciones se
+    empieza de nuevo. Con limites revisa antes de cada intento y cada 256 colocaciones, y
+    lanza BusquedaInterrumpida.
+    """
+    geo = geometria(n)
+    while True:
+        # Un intento de 9×9 no llega a las 324 colocaciones: sin esta revisión, los reintentos
+        # nunca miraban el reloj
+        if limites is not None:
+            limites.revisar()
+        celdas = _intentar_llenado(geo, rng, 4 * geo.total, limites)
+        if celdas is not None:
+            return celdas
+
+def _intentar_llenado(geo, rng, max_colocaciones, limites):
+    # Un intento de llenar_tablero_rapido: None si pasa max_colocaciones sin completar
+    n = geo.n
+    fila_de, columna_de, caja_de, todos = geo.fila_de, geo.columna_de, geo.caja_de, geo.todos
+    digitos, cantidad = geo.digitos, geo.cantidad
+    celdas = [0] * geo.total
+    filas, columnas, cajas = [0] * n, [0] * n, [0] * n
+    for k in range(geo.lado):
+        bloque = k * geo.lado + k
+        for i, num in zip(geo.unidades[2 * n + bloque], rng.sample(range(1, n + 1), n)):
+            bit = 1 << num
+            celdas[i] = num
+            filas[fila_de[i]] |= bit
+            columnas[columna_de[i]] |= bit
+            cajas[bloque] |= bit
+    libres = [i for i in range(geo.total) if celdas[i] == 0]
+    pila = []  # Por nivel: [celda, números en orden aleatorio, índice del próximo a probar]
+    for colocaciones in range(1, max_colocaciones + 1):
+        if not libres:
+            return celdas
+        mejor, menor, opciones = 0, n + 1, 0
+        for posicion, i in enumerate(libres):
+            mascara = todos & ~(filas[fila_de[i]] | columnas[columna_de[i]] | cajas[caja_de[i]])
+            k = cantidad[mascara]
+            if k < menor:
+                mejor, menor, opciones = posicion, k, mascara
+                if k <= 1:
+                    break
+        if menor:
+            i = libres[mejor]
+            libres[mejor] = libres[-1]
+            libres.pop()
+            numeros = list(digitos[opciones])
+            rng.shuffle(numeros)
+            pila.append([i, numeros, 0])
+        # Se coloca el próximo número del nivel de arriba, retrocediendo si no quedan
+        while True:
+            if not pila:
+                return None
+            marco = pila[-1]
+            i, numeros, k = marco
+            if k:
+                bit = ~(1 << numeros[k - 1])
+                filas[fila_de[i]] &= bit
+                columnas[columna_de[i]] &= bit
+                cajas[caja_de[i]] &= bit
+            if k < len(numeros):
+                break
+            celdas[i] = 0
+            pila.pop()
+            libres.append(i)
+        num = numeros[k]
+        marco[2] = k + 1
+        bit = 1 << num
+        celdas[i] = num
+        filas[fila_de[i]] |= bit
+        columnas[columna_de[i]] |= bit
+        cajas[caja_de[i]] |= bit
+        if limites is not None and colocaciones & 255 == 0:
+            limites.revisar(256)
+    return celdas if not libres else None
 
 # Función para eliminar valores del tablero
-def eliminar_valores(tablero, celdas_a_eliminar):
+def eliminar_valores(tablero, celdas_a_eliminar, limites=None):
     """
     Elimina celdas garantizando que el tablero tenga una única solución.
     """
     global CELDAS_JUGABLES
-    CELDAS_JUGABLES = []
-    celdas = [(i, j) for i in range(9) for j in range(9)]
-    random.shuffle(celdas)
+    CELDAS_JUGABLES = quitar_pistas(tablero, celdas_a_eliminar, limites=limites, cache=CACHE_SOLUCIONES)
+    return tablero
+
+def quitar_pistas(tablero, celdas_a_eliminar, rng=random, limites=None, cache=None, simetria=None):
+    """
+    Igual que eliminar_valores pero sin tocar variables globales:
+    devuelve la lista de celdas eliminadas (las jugables).
+    Si se agotan los limites, se detiene con las celdas quitadas hasta ese momento
+    (el tablero sigue teniendo solución única) y limites.motivo indica por qué.
+    Con una CacheSoluciones se consulta la unicidad del tablero de partida y se guarda
+    el tablero resultante con su solución.
+    Con una simetria de SIMETRIAS las celdas se quitan de a grupos (la celda y sus
+    simétricas), así que el patrón de pistas queda simétrico. Pedir n² celdas deja un
+    tablero mínimo: ninguna pista (o grupo de pistas) se puede quitar sin perder la unicidad.
+    """
+    celdas_jugables = []
+    n = len(tablero)
+    celdas = [(i, j) for i in range(n) for j in range(n)]
+    rng.shuffle(celdas)
+    verificador = None
+
+    try:
+        # Si el tablero de partida no tiene solución única, quitar pistas tampoco la hará única
+        verificador = VerificadorUnicidad.desde_tablero(tablero, limites, cache, _nodos_por_prueba(n))
+        if verificador is None:
+            return celdas_jugables
+
+        for grupo in grupos_de_simetria(celdas, simetria, n):
+            if celdas_a_eliminar <= 0:
+                break
+            if len(grupo) > celdas_a_eliminar:
+                continue
 
+            # Verificar unicidad (el verificador restaura los valores si no es única)
+            if verificador.quitar_grupo_si_unica([fila * n + col for fila, col in grupo]):
+                celdas_jugables.extend(grupo)  # Registrar las celdas eliminadas
+                celdas_a_eliminar -= len(grupo)
+    except BusquedaInterrumpida:
+        pass
+
+    if cache is not None and verificador is not None:
+        cache.guardar(tablero, 1, Tablero(verificador.solucion))
+    return celdas_jugables
+
+# Simetrías del patrón de pistas: cada una lleva (fila, col) a sus celdas simétricas en un tablero de n×n
+SIMETRIAS = {
+    "rotacional": lambda fila, col, n: ((n - 1 - fila, n - 1 - col),),
+    "rotacional90": lambda fila, col, n: ((col, n - 1 - fila), (n - 1 - fila, n - 1 - col), (n - 1 - col, fila)),
+    "espejo": lambda fila, col, n: ((fila, n - 1 - col),),
+    "diagonal": lambda fila, col, n: ((col, fila),),
+}
+
+def grupos_de_simetria(celdas, simetria, n):
+    """
+    Agrupa las celdas (en el orden dado) con sus simétricas; cada celda aparece en un solo grupo.
+    Sin simetría, cada celda es su propio grupo.
+    """
+    if simetria is None:
+        return [(celda,) for celda in celdas]
+    simetricas = SIMETRIAS[simetria]
+    vistas = set()
+    grupos = []
     for fila, col in celdas:
-        if celdas_a_eliminar <= 0:
-            break
+        if (fila, col) in vistas:
+            continue
+        grupo = tuple(dict.fromkeys(((fila, col),) + simetricas(fila, col, n)))
+        vistas.update(grupo)
+        grupos.append(grupo)
+    return grupos
 
-        # Guardar el valor original de la celda
-        valor_original = tablero[fila][col]
-        tablero[fila][col] = 0
+def minimizar_pistas(tablero, rng=random, limites=None, simetria=None, rondas=0):
+    """
+    Deja en el tablero (con solución única) un tablero mínimo con la menor cantidad de
+    pistas que encuentre. Una pasada quitando todo lo que se pueda ya da un tablero mínimo;
+    cada ronda extra repone un par de grupos vacíos al azar y vuelve a pasar, y se queda
+    con el mejor. Todo sobre el mismo VerificadorUnicidad, así que cada prueba de unicidad
+    parte del estado de la anterior. Devuelve la lista de celdas jugables, o None si el
+    tablero no tiene solución única. Si se agotan los limites, deja el mejor hasta ese momento.
+    Con simetria, el resultado es mínimo por grupos: ningún grupo simétrico se puede quitar
+    entero, aunque alguna pista suelta sí. En 16×16 y 25×25 las pruebas de unicidad tienen
+    un presupuesto de nodos (NODOS_PRUEBA_UNICIDAD), así que puede quedar alguna pista de más.
+    """
+    n = len(tablero)
+    celdas = [(i, j) for i in range(n) for j in range(n)]
+    verificador = VerificadorUnicidad.desde_tablero(tablero, limites, max_nodos=_nodos_por_prueba(n))
+    if verificador is None:
+        return None
+    motor = verificador.motor
+    mejor = list(motor.celdas)
+    try:
+        for ronda in range(rondas + 1):
+            if ronda:
+                vacias = [celda for celda in celdas if motor.celdas[celda[0] * n + celda[1]] == 0]
+                for fila, col in rng.sample(vacias, min(2, len(vacias))):
+                    grupo = grupos_de_simetria([(fila, col)], simetria, n)[0]
+                    verificador.reponer([f * n + c for f, c in grupo])
+            rng.shuffle(celdas)
+            for grupo in grupos_de_simetria(celdas, simetria, n):
+                verificador.quitar_grupo_si_unica([fila * n + col for fila, col in grupo])
+            if motor.vacias >= mejor.count(0):
+                mejor = list(motor.celdas)
+    except BusquedaInterrumpida:
+        pass
+    for i, num in enumerate(mejor):
+        tablero[i // n][i % n] = num
+    return [(i // n, i % n) for i, num in enumerate(mejor) if num == 0]
 
-        # Verificar unicidad
-        if contar_soluciones([fila[:] for fila in tablero]) == 1:
-            CELDAS_JUGABLES.append((fila, col))  # Registrar la celda eliminada
-            celdas_a_eliminar -= 1
-        else:
-            tablero[fila][col] = valor_original  # Restaurar el valor original si no es único
+def es_minimo(tablero, limites=None):
+    """
+    True si el tablero tiene solución única y ninguna de sus pistas se puede quitar sin
+    perderla; None si no tiene solución única.
+    """
+    verificador = VerificadorUnicidad.desde_tablero(tablero, limites)
+    if verificador is None:
+        return None
+    return all(verificador.es_necesaria(i) for i, num in enumerate(verificador.motor.celdas) if num)
 
-    return tablero
+
+# Nodos máximos de cada prueba de unicidad al generar tableros de 16×16 y 25×25. Encontrar
+# otra solución puede llevar miles de nodos de varios milisegundos cada uno; pasado este
+# presupuesto la pista se deja (el tablero sigue siendo único, sólo queda con una pista más)
+NODOS_PRUEBA_UNICIDAD = 30
+
+def _nodos_por_prueba(n):
+    # En 9×9 las pruebas son baratas y se hacen completas, como siempre
+    return NODOS_PRUEBA_UNICIDAD if n > 9 else None
+
+class VerificadorUnicidad:
+    """
+    Verificador de unicidad para la generación de tableros.
+    Parte de un tablero con solución única y conocida, y mantiene su MotorBitmask entre
+    una eliminación y la siguiente. Al quitar una pista, cualquier otra solución tiene que
+    diferir justo en esa celda, así que alcanza con buscar una solución que no use el
+    valor conocido allí, deteniéndose en la primera que aparezca.
+    En 16×16 y 25×25 cada nodo aplica además singles desnudos y ocultos: sin esa poda
+    la búsqueda explota cuando el tablero ya tiene más de la mitad de las celdas vacías.
+    Con max_nodos, una prueba que lo pasa se da por no única: nunca se quita una pista
+    sin probar que la solución sigue siendo única.
+    """
+    __slots__ = ("motor", "solucion", "huecos", "limites", "propagador", "max_nodos", "nodos")
+
+    def __init__(self, tablero, solucion, limites=None, max_nodos=None):
+        self.motor = motor = MotorBitmask(tablero)
+        geo = motor.geometria
+        self.solucion = [solucion[geo.fila_de[i]][geo.columna_de[i]] for i in range(geo.total)]
+        self.huecos = [i for i in range(geo.total) if motor.celdas[i] == 0]
+        self.limites = limites
+        self.max_nodos = max_nodos
+        self.nodos = 0
+        self.propagador = None
+        if geo.n > 9:
+            self.propagador = Propagador(bloqueo=False, pares_desnudos=False, triples_desnudos=False)
+
+    @classmethod
+    def desde_tablero(cls, tablero, limites=None, cache=None, max_nodos=None):
+        """
+        Crea el verificador si el tablero tiene exactamente una solución; si no, devuelve None.
+        Con una CacheSoluciones, un tablero ya contado no se vuelve a buscar.
+        """
+        if all(0 not in fila for fila in tablero):
+            return cls(tablero, tablero, limites, max_nodos) if es_valido_sudoku(tablero) else None
+        guardado = None if cache is None else cache.buscar(tablero)
+        if guardado is not None and guardado[0] is not None:
+            cantidad, solucion = guardado
+            return cls(tablero, solucion, limites, max_nodos) if cantidad == 1 else None
+        soluciones = list(itertools.islice(enumerar_soluciones_dlx(tablero, limites), 2))
+        if cache is not None:
+            cache.guardar(tablero, len(soluciones), soluciones[0] if soluciones else None)
+        if len(soluciones) != 1:
+            return None
+        return cls(tablero, soluciones[0], limites, max_nodos)
+
+    def quitar_si_unica(self, i):
+        """
+        Vacía la celda i si el tablero sigue teniendo solución única; si no, la deja como estaba.
+        Si se agotan los limites, deja la celda como estaba y lanza BusquedaInterrumpida.
+        """
+        return self.quitar_grupo_si_unica((i,))
+
+    def quitar_grupo_si_unica(self, indices):
+        """
+        Como quitar_si_unica pero con varias celdas a la vez (las que ya estaban vacías se
+        ignoran): otra solución tendría que diferir en alguna de ellas, así que se busca
+        una vez por celda prohibiendo allí el valor conocido.
+        """
+        motor = self.motor
+        quitadas = [i for i in indices if motor.celdas[i] != 0]
+        for i in quitadas:
+            motor.quitar(i)
+            self.huecos.append(i)
+        otra = True
+        try:
+            otra = self._hay_otra(quitadas)
+        finally:
+            if otra:
+                self.reponer(quitadas)
+        return not otra
+
+    def es_necesaria(self, i):
+        """True si quitar la pista de la celda i deja al tablero con más de una solución. No lo modifica."""
+        motor = self.motor
+        motor.quitar(i)
+        self.huecos.append(i)
+        try:
+            return self._hay_otra((i,))
+        finally:
+            self.reponer((i,))
+
+    def reponer(self, indices):
+        """Vuelve a poner las pistas de la solución en las celdas vacías de indices (sigue siendo única)."""
+        motor = self.motor
+        for i in indices:
+            if motor.celdas[i] == 0:
+                self.huecos.remove(i)
+                motor.colocar(i, self.solucion[i])
+
+    def _hay_otra(self, indices):
+        # Busca una solución distinta de la conocida en alguna de las celdas indices (ya vacías)
+        motor = self.motor
+        for i in indices:
+            previo = motor.eliminar(i, 1 << self.solucion[i])
+            self.nodos = 0
+            try:
+                if self._buscar_otra():
+                    return True
+            finally:
+                motor.restaurar_eliminados(i, previo)
+        return False
+
+    def _buscar_otra(self):
+        # Búsqueda en profundidad por la celda con menos opciones, con una pila explícita;
+        # se detiene en la primera solución y deja el motor como estaba
+        motor, propagador, limites = self.motor, self.propagador, self.limites
+        digitos = motor.geometria.digitos
+        pila = []  # Por nivel: [celda, números, índice del próximo, marca del propagador]
+        try:
+            while True:
+                # Entramos a un nodo: se propaga (si hay propagador) y se elige la celda
+                marco = [-1, (), 0, None if propagador is None else propagador.marca()]
+                pila.append(marco)
+                if propagador is None or propagador.propagar(motor, motor):
+                    mejor = self._celda_para_ramificar()
+                    if mejor < 0:
+                        return True
+                    self.nodos += 1
+                    if self.max_nodos is not None and self.nodos > self.max_nodos:
+                        return True  # Sin probar la unicidad se trata como si hubiera otra solución
+                    marco[0], marco[1] = mejor, digitos[motor.opciones(mejor)]
+                # Próximo número del nivel de arriba; si se agotaron, se vuelve al anterior
+                while pila:
+                    marco = pila[-1]
+                    celda, numeros, k, marca = marco
+                    if k:
+                        motor.quitar(celda)
+                    if k < len(numeros):
+                        marco[2] = k + 1
+                        motor.colocar(celda, numeros[k])
+                        if limites is not None:
+                            limites.verificar()
+                        break
+                    pila.pop()
+                    if marca is not None:
+                        propagador.deshacer(motor, motor, marca)
+                else:
+                    return False
+        finally:
+            # Con otra solución (o si se agotan los limites) quedan niveles por deshacer
+            while pila:
+                celda, _, k, marca = pila.pop()
+                if k:
+                    motor.quitar(celda)
+                if marca is not None:
+                    propagador.deshacer(motor, motor, marca)
+
+    def _celda_para_ramificar(self):
+        # La celda vacía con menos opciones, o -1 si no queda ninguna
+        motor = self.motor
+        celdas = motor.celdas
+        cantidad = motor.geometria.cantidad
+        mejor, menor = -1, motor.geometria.n + 1
+        for i in self.huecos:
+            if celdas[i] == 0:
+                n = cantidad[motor.opciones(i)]
+                if n < menor:
+                    mejor, menor = i, n
+                    if n <= 1:
+                        break
+        return mejor
 
 # ========================
 # Validacion
@@ -139,43 +714,47 @@ def es_valido(tablero, fila, col, num):
         return False
     
     # Verificar columna
-    for i in range(9):
+    n = len(tablero)
+    for i in range(n):
         if tablero[i][col] == num:
             return False
     
-    # Verificar bloque de 3x3
-    # Obtener las coordenadas de inicio del bloque de 3x3
-    fila_inicio = (fila // 3) * 3  # Fila de inicio del bloque 3x3
-    col_inicio = (col // 3) * 3    # Columna de inicio del bloque 3x3
+    # Verificar bloque (3x3 en el tablero de 9x9)
+    # Obtener las coordenadas de inicio del bloque
+    lado = math.isqrt(n)
+    fila_inicio = (fila // lado) * lado  # Fila de inicio del bloque
+    col_inicio = (col // lado) * lado    # Columna de inicio del bloque
     
-    # Comprobar todas las celdas dentro del bloque 3x3
-    for i in range(fila_inicio, fila_inicio + 3):
-        for j in range(col_inicio, col_inicio + 3):
+    # Comprobar todas las celdas dentro del bloque
+    for i in range(fila_inicio, fila_inicio + lado):
+        for j in range(col_inicio, col_inicio + lado):
             if tablero[i][j] == num:
                 return False
     
     return True
 
 def es_valido_sudoku(tablero, validarCeros = True):
-    # Verificar que cada fila contiene números del 1 al 9 sin repeticiones
+    n = len(tablero)
+    lado = math.isqrt(n)
+    # Verificar que cada fila contiene números del 1 al n sin repeticiones
     for fila in tablero:
         if validarCeros and 0 in fila:
             return False
         if not es_valido_conjunto(fila):
             return False
     
-    # Verificar que cada columna contiene números del 1 al 9 sin repeticiones
-    for col in range(9):
-        columna = [tablero[fila][col] for fila in range(9)]
+    # Verificar que cada columna contiene números del 1 al n sin repeticiones
+    for col in range(n):
+        columna = [tablero[fila][col] for fila in range(n)]
         if not es_valido_conjunto(columna):
             return False
     
-    # Verificar que cada subcuadrante 3x3 contiene números del 1 al 9 sin repeticiones
-    for i in range(0, 9, 3):
-        for j in range(0, 9, 3):
+    # Verificar que cada bloque (3x3 en 9x9) contiene números del 1 al n sin repeticiones
+    for i in range(0, n, lado):
+        for j in range(0, n, lado):
             subcuadrante = []
-            for fila in range(i, i + 3):
-                for col in range(j, j + 3):
+            for fila in range(i, i + lado):
+                for col in range(j, j + lado):
                     subcuadrante.append(tablero[fila][col])
             if not es_valido_conjunto(subcuadrante):
                 return False
@@ -187,56 +766,202 @@ def es_valido_conjunto(celdas):
     celdas = [celda for celda in celdas if celda != 0]
     return len(celdas) == len(set(celdas))
 
+def validar_lote(tableros, validarCeros=True, tamano_bloque=65536):
+    """
+    Valida muchos tableros a la vez con NumPy (se importa recién acá).
+    tableros es un arreglo (N, n, n) de uint8 con valores de 0 a n (n = 9, 16, 25...).
+    Devuelve (validos, primera_unidad): un arreglo booleano de N elementos y, por tablero,
+    la primera unidad que falla en el mismo orden que es_valido_sudoku (en 9x9: 0-8 filas,
+    9-17 columnas, 18-26 bloques), o -1 si es válido. Con validarCeros, un cero hace
+    fallar su fila, igual que en es_valido_sudoku.
+    """
+    import numpy as np
+
+    tableros = np.asarray(tableros, dtype=np.uint8)
+    lado = math.isqrt(tableros.shape[1]) if tableros.ndim == 3 else 0
+    if tableros.ndim != 3 or tableros.shape[2] != tableros.shape[1] or lado * lado != tableros.shape[1]:
+        raise ValueError(f"Se esperaba un arreglo (N, n, n) con n cuadrado y llegó {tableros.shape}")
+    lado_tablero = tableros.shape[1]
+    if tableros.size and tableros.max() > lado_tablero:
+        raise ValueError(f"Los tableros sólo pueden tener valores de 0 a {lado_tablero}")
+    # Los bits de un tablero de 9x9 entran en uint16; los de 16x16 y 25x25 necesitan uint32
+    tipo = np.uint16 if lado_tablero < 16 else np.uint32
+    cantidad = tableros.shape[0]
+    primera_unidad = np.full(cantidad, -1, dtype=np.int16)
+    # Se procesa por bloques para acotar la memoria de los arreglos intermedios
+    for inicio in range(0, cantidad, tamano_bloque):
+        bloque = tableros[inicio:inicio + tamano_bloque]
+        n = bloque.shape[0]
+        cajas = bloque.reshape(n, lado, lado, lado, lado).transpose(0, 1, 3, 2, 4).reshape(n, lado_tablero, lado_tablero)
+        unidades = np.concatenate((bloque, bloque.transpose(0, 2, 1), cajas), axis=1)  # (n, 3n, n)
+        # Cada número como un bit (el 0 no aporta): hay repetidos si la suma difiere del OR
+        bits = np.where(unidades != 0, np.left_shift(tipo(1), unidades, dtype=tipo), tipo(0))
+        fallas = bits.sum(axis=2, dtype=tipo) != np.bitwise_or.reduce(bits, axis=2)
+        if validarCeros:
+            fallas[:, :lado_tablero] |= (bloque == 0).any(axis=2)
+        hay_falla = fallas.any(axis=1)
+        primera_unidad[inicio:inicio + n] = np.where(hay_falla, fallas.argmax(axis=1), -1)
+    return primera_unidad < 0, primera_unidad
+
+def tableros_a_arreglo(tableros):
+    """Convierte una secuencia de tableros (Tablero, listas o líneas) del mismo tamaño al arreglo (N, n, n) de validar_lote."""
+    import numpy as np
+
+    datos = bytearray()
+    n = 9
+    for tablero in tableros:
+        if isinstance(tablero, str):
+            tablero = Tablero.desde_linea(tablero)
+        elif not isinstance(tablero, Tablero):
+            tablero = Tablero.desde_lista(tablero)
+        datos += tablero.celdas
+        n = tablero.n
+    return np.frombuffer(bytes(datos), dtype=np.uint8).reshape(-1, n, n)
+
 def es_modificable(posicion, CELDAS_JUGABLES):
-    """Verifica si una posición está entre las celdas eliminadas y es modificable."""
+    """
+    Verifica si una posición está entre las celdas eliminadas y es modificable.
+    CELDAS_JUGABLES puede ser la lista de celdas jugables o una PartidaSudoku.
+    """
+    if isinstance(CELDAS_JUGABLES, PartidaSudoku):
+        return CELDAS_JUGABLES.es_editable(*posicion)
     return posicion in CELDAS_JUGABLES
 
 # ========================
 #  Resolución
 # ========================
 
+class EstadoBusqueda:
+    """Contadores y camino de solución de una búsqueda, en lugar de las variables globales."""
+    __slots__ = ("pasos_atras", "nodos_explorados", "solucion")
+
+    def __init__(self):
+        self.pasos_atras = 0
+        self.nodos_explorados = 0
+        self.solucion = {}
+
 # Resolver Sudoku usando backtracking puro
-def resolver_backtracking_puro(tablero):
-    global PASOS_ATRAS, NODOS_EXPLORADOS,SOLUCION# variable global
-    for fila in range(9):
-        for col in range(9):
-            if tablero[fila][col] == 0:   # Si la celda está vacía
-                for num in range(1, 10):  # Probar los números del 1 al 9                        
-                    if es_valido(tablero, fila, col, num):  # Si el número es válido
-                        tablero[fila][col] = num  # Colocamos el número
-                        SOLUCION[(fila,col)] = num
-                        NODOS_EXPLORADOS +=1
-                        if resolver_backtracking_puro(tablero):  # Llamada recursiva
-                            return True
-                        else: # si uno de los nodos dio falso en su resolucion, volvemos atras
-                            PASOS_ATRAS += 1
-                        tablero[fila][col] = 0  #  volvemos atras Deshacer (retroceder)
-                        del SOLUCION[(fila, col)]
-                return False  # Si no encontramos una solución válida, retrocedemos
-    return True  # Si hemos llenado todo el tablero correctamente
+# Sin estado, los contadores y el camino se suman a las variables globales como antes
+def resolver_backtracking_puro(tablero, estado=None, instrumentacion=None):
+    if estado is None:
+        estado = EstadoBusqueda()
+        resuelto = resolver_backtracking_puro(tablero, estado, instrumentacion)
+        _sincronizar_globales(estado)
+        return resuelto
+    return completar_busqueda(backtracking_iterativo(tablero, estado, instrumentacion))
+
+def backtracking_iterativo(tablero, estado, instr=None, rng=None):
+    """
+    Backtracking puro con una pila explícita en lugar de recursión. Recorre las celdas y los
+    números en el mismo orden que la versión recursiva, así que los contadores y el camino
+    coinciden. Es un generador: hace yield después de cada nodo y devuelve si resolvió.
+    Con rng, cada celda prueba los números en el orden de rng.sample (resolución aleatoria).
+    """
+    # Las celdas se llenan en orden, así que la próxima vacía es siempre vacias[len(pila)]
+    vacias = celdas_vacias_de(tablero)
+    n = len(tablero)
+    solucion = estado.solucion
+    pila = []  # Por nivel: [orden de los números, índice del próximo a probar]
+    entrar = True
+    while True:
+        if entrar:
+            if instr is not None:
+                instr.nodo(len(solucion))
+            if len(pila) == len(vacias):
+                return True  # Si hemos llenado todo el tablero correctamente
+            orden = rng.sample(range(1, n + 1), n) if rng is not None else range(1, n + 1)
+            pila.append([orden, 0])
+        else:
+            # El nivel de abajo no encontró solución: deshacemos la celda de este nivel
+            orden, k = pila[-1]
+            fila, col = vacias[len(pila) - 1]
+            estado.pasos_atras += 1
+            tablero[fila][col] = 0
+            del solucion[(fila, col)]
+            if instr is not None:
+                instr.retroceso(fila, col, orden[k - 1], len(solucion))
+        marco = pila[-1]
+        orden, k = marco
+        fila, col = vacias[len(pila) - 1]
+        while k < n:
+            num = orden[k]
+            k += 1
+            if instr is None:
+                valido = es_valido(tablero, fila, col, num)
+            else:
+                valido = instr.medir("es_valido", es_valido, tablero, fila, col, num)
+            if valido:
+                break
+        else:
+            # Ningún número sirve en esta celda: retrocedemos al nivel anterior
+            pila.pop()
+            if not pila:
+                return False
+            entrar = False
+            continue
+        marco[1] = k
+        tablero[fila][col] = num
+        solucion[(fila, col)] = num
+        estado.nodos_explorados += 1
+        if instr is not None:
+            instr.asignacion(fila, col, num, len(solucion))
+        entrar = True
+        yield
+
+def completar_busqueda(pasos, limites=None):
+    """
+    Ejecuta un generador de búsqueda hasta el final y devuelve su resultado.
+    Con limites se verifican en cada nodo; al agotarse se cierra el generador y se
+    propaga BusquedaInterrumpida.
+    """
+    try:
+        if limites is None:
+            while True:
+                next(pasos)
+        while True:
+            next(pasos)
+            limites.verificar()
+    except StopIteration as fin:
+        return fin.value
+    except BusquedaInterrumpida:
+        pasos.close()
+        raise
 
 
 #FUNCIONES BRANCH & BOUND
 
 # Resolver Sudoku usando Branch & Bound con cotas
-def resolver_sudoku_bb_cotas(tablero):
+def resolver_sudoku_bb_cotas(tablero, estado=None, instrumentacion=None):
     global PASOS_ATRAS, CELDAS_JUGABLES
-    PASOS_ATRAS = 0
-    CELDAS_JUGABLES = [(fila, col) for fila in range(9) for col in range(9) if tablero[fila][col] == 0]
+    if estado is None:
+        PASOS_ATRAS = 0
+        CELDAS_JUGABLES = celdas_vacias_de(tablero)
+        estado = EstadoBusqueda()
+        resuelto = resolver_sudoku_bb_cotas(tablero, estado, instrumentacion)
+        _sincronizar_globales(estado)
+        return resuelto
     cota_superior = float('inf')
-    cola_prioridad = crear_cola_prioridad(tablero)
-    return bb_resolver_cotas(tablero, cola_prioridad, cota_superior)
+    if instrumentacion is None:
+        cola_prioridad = crear_cola_prioridad(tablero)
+    else:
+        cola_prioridad = instrumentacion.medir("crear_cola_prioridad", crear_cola_prioridad, tablero, instrumentacion)
+    return bb_resolver_cotas(tablero, cola_prioridad, cota_superior, estado, instrumentacion)
 
 # Crear una cola de prioridad con las celdas más restringidas
-def crear_cola_prioridad(tablero):
+# En 16×16 y 25×25 puede que ninguna celda tenga 6 opciones o menos: entonces va la que tenga menos
+def crear_cola_prioridad(tablero, instrumentacion=None):
     cola_prioridad = []
-    celdas_vacias = [(fila, col) for fila in range(9) for col in range(9) if tablero[fila][col] == 0]
+    celdas_vacias = celdas_vacias_de(tablero)
+    menos_restringida = None
 
     for fila, col in celdas_vacias:
         if tablero[fila][col] != 0:
             continue 
 
-        opciones = obtener_opciones_validas(tablero, fila, col)
+        if instrumentacion is None:
+            opciones = obtener_opciones_validas(tablero, fila, col)
+        else:
+            opciones = instrumentacion.medir("obtener_opciones_validas", obtener_opciones_validas, tablero, fila, col)
 
         if not opciones:  # Si no hay opciones válidas, podar esta rama
             return []  # Detenemos y señalamos que no hay solución posible
@@ -248,10 +973,15 @@ def crear_cola_prioridad(tablero):
         elif (len(opciones) <= 6):
             vecinos_afectados = contar_vecinos_restringidos_directo(tablero, fila, col)
             heapq.heappush(cola_prioridad, (len(opciones), -vecinos_afectados, fila, col, opciones)) 
-        
+        elif menos_restringida is None or num_opciones < menos_restringida[0]:
+            menos_restringida = (num_opciones, fila, col, opciones)
+
+    if not cola_prioridad and menos_restringida is not None and len(tablero) > 9:
+        num_opciones, fila, col, opciones = menos_restringida
+        heapq.heappush(cola_prioridad, (num_opciones, -contar_vecinos_restringidos_directo(tablero, fila, col), fila, col, opciones))
     return cola_prioridad
 
-def calcular_cota_superior(tablero):
+def calcular_cota_superior(tablero, instrumentacion=None):
     """
     Calcula una cota superior basada en:
     - El número de celdas vacías
@@ -264,10 +994,13 @@ def calcular_cota_superior(tablero):
     # Calculamos el factor de ramificación máximo
     max_opciones = 0
     total_restricciones = 0
-    for i in range(9):
-        for j in range(9):
+    for i in range(len(tablero)):
+        for j in range(len(tablero)):
             if tablero[i][j] == 0:
-                opciones = len(obtener_opciones_validas(tablero, i, j))
+                if instrumentacion is None:
+                    opciones = len(obtener_opciones_validas(tablero, i, j))
+                else:
+                    opciones = len(instrumentacion.medir("obtener_opciones_validas", obtener_opciones_validas, tablero, i, j))
                 if opciones == 0:
                     return float('inf')  # No hay solución posible
                 max_opciones = max(max_opciones, opciones)
@@ -277,76 +1010,1883 @@ def calcular_cota_superior(tablero):
     return celdas_vacias * max_opciones + total_restricciones
 
 # Resolver utilizando Branch & Bound con cotas
-def bb_resolver_cotas(tablero, cola_prioridad, mejor_cota):
-    global PASOS_ATRAS, NODOS_EXPLORADOS,SOLUCION
+def bb_resolver_cotas(tablero, cola_prioridad, mejor_cota, estado, instrumentacion=None):
+    return completar_busqueda(bb_cotas_iterativo(tablero, cola_prioridad, mejor_cota, estado, instrumentacion))
 
-    # Contar celdas vacías
-    celdas_vacias = contar_celdas_vacias(tablero)
+def bb_cotas_iterativo(tablero, cola_prioridad, mejor_cota, estado, instr=None):
+    """
+    Branch & Bound con cotas usando una pila explícita. Cada marco guarda la celda elegida,
+    sus opciones, la próxima opción a probar y la cota con la que se podan sus hijos, así que
+    el orden de exploración es el mismo que el de la versión recursiva. Hace yield después
+    de cada nodo y devuelve si resolvió.
+    """
+    solucion = estado.solucion
+    pila = []  # Marcos [fila, col, opciones, índice de la próxima opción, cota_actual]
+    cola = cola_prioridad
+    while True:
+        # Entramos a un nodo con su cola de prioridad y la mejor cota del padre
+        if instr is not None:
+            instr.nodo(len(solucion))
+            instr.cola(len(cola))
+        # Si no hay celdas vacías, el tablero está completo
+        if contar_celdas_vacias(tablero) == 0:
+            return True
+        podado = True
+        # Si la cola está vacía pero aún hay celdas vacías, el tablero no tiene solución
+        if not cola:
+            if instr is not None:
+                instr.poda("cola_vacia", len(solucion))
+        else:
+            if instr is None:
+                cota_actual = calcular_cota_superior(tablero)
+            else:
+                cota_actual = instr.medir("calcular_cota_superior", calcular_cota_superior, tablero, instr)
+            # Si la cota actual es peor que la mejor conocida, podamos esta rama
+            if cota_actual >= mejor_cota:
+                if instr is not None:
+                    instr.poda("cota", len(solucion))
+            else:
+                # Extraer la celda más prometedora
+                _, _, fila, col, opciones = heapq.heappop(cola)
+                pila.append([fila, col, opciones, 0, cota_actual])
+                podado = False
 
-    # Si no hay celdas vacías, el tablero está completo
-    if celdas_vacias == 0:
-        return True  # No necesitamos recalcular la cota
+        while True:
+            if podado:
+                # El hijo falló: si no hay padre, no hay solución; si no, retrocedemos su celda
+                if not pila:
+                    return False
+                fila, col, opciones, k, _ = pila[-1]
+                tablero[fila][col] = 0
+                del solucion[(fila, col)]
+                estado.pasos_atras += 1
+                if instr is not None:
+                    instr.retroceso(fila, col, opciones[k - 1], len(solucion))
+            marco = pila[-1]
+            fila, col, opciones, k, cota_actual = marco
+            if k < len(opciones):
+                break
+            # Se agotaron las opciones de esta celda
+            pila.pop()
+            podado = True
 
-    # Si la cola está vacía pero aún hay celdas vacías, el tablero no tiene solución
-    if not cola_prioridad:
-        return False
+        num = opciones[k]
+        marco[3] = k + 1
+        tablero[fila][col] = num
+        solucion[(fila, col)] = num
+        estado.nodos_explorados += 1
+        if instr is not None:
+            instr.asignacion(fila, col, num, len(solucion))
+        # Actualizar la cola de prioridad
+        if instr is None:
+            cola = crear_cola_prioridad(tablero)
+        else:
+            cola = instr.medir("crear_cola_prioridad", crear_cola_prioridad, tablero, instr)
+        mejor_cota = cota_actual
+        yield
 
-    # Calculamos la cota superior para este estado
-    cota_actual = calcular_cota_superior(tablero)
 
-    # Si la cota actual es peor que la mejor conocida, podamos esta rama
-    if cota_actual >= mejor_cota:
-        return False
-    
-    # Extraer la celda más prometedora
-    _, _, fila, col, opciones = heapq.heappop(cola_prioridad)
+class BusquedaPausable:
+    """
+    Búsqueda iterativa que se ejecuta por tramos, para repartir el tiempo entre varios
+    tableros o dejar una resolución a medias y seguirla después. avanzar() devuelve True
+    cuando la búsqueda terminó; el resultado queda en resultado.
+    """
+    __slots__ = ("_pasos", "terminada", "resultado", "estado")
 
-    for num in opciones:
-        # Asignar el número a la celda
-        tablero[fila][col] = num
-        SOLUCION[(fila,col)] = num
-        NODOS_EXPLORADOS += 1 
+    def __init__(self, pasos, estado=None):
+        self._pasos = pasos
+        self.terminada = False
+        self.resultado = None
+        self.estado = estado
 
-        # Actualizar la cola de prioridad
-        nueva_cola = crear_cola_prioridad(tablero)
+    @classmethod
+    def backtracking(cls, tablero, estado=None, instrumentacion=None):
+        estado = estado if estado is not None else EstadoBusqueda()
+        return cls(backtracking_iterativo(tablero, estado, instrumentacion), estado)
 
-        if bb_resolver_cotas(tablero, nueva_cola, cota_actual):
-            return True
+    @classmethod
+    def branch_and_bound(cls, tablero, estado=None, instrumentacion=None):
+        estado = estado if estado is not None else EstadoBusqueda()
+        cola = crear_cola_prioridad(tablero)
+        return cls(bb_cotas_iterativo(tablero, cola, float('inf'), estado, instrumentacion), estado)
 
-        # Si no es solución, retroceder
-        tablero[fila][col] = 0
-        del SOLUCION[(fila, col)]
-        PASOS_ATRAS += 1
+    @classmethod
+    def backtracking_bitmask(cls, tablero, propagador=None, instrumentacion=None):
+        # Mismo recorrido que ejecutar_backtracking_bitmask; el estado es el motor
+        motor = MotorBitmask(tablero)
+        vacias = [i for i, num in enumerate(motor.celdas) if num == 0]
+        if propagador is None:
+            return cls(backtracking_bitmask_iterativo(motor, vacias, 0, instrumentacion), motor)
+        return cls(backtracking_propagado_iterativo(motor, propagador, vacias, 0, instrumentacion), motor)
 
-    return False
+    @classmethod
+    def branch_and_bound_bitmask(cls, tablero, propagador=None, instrumentacion=None):
+        # Mismo recorrido que ejecutar_bb_bitmask (incremental); el estado es el motor
+        estado = BBIncremental(tablero)
+        return cls(bb_incremental_iterativo(estado, float('inf'), propagador, instrumentacion), estado.motor)
+
+    @classmethod
+    def conteo(cls, tablero, limite=2):
+        return cls(conteo_iterativo(MotorBitmask(tablero), limite))
+
+    @classmethod
+    def aleatoria(cls, tablero, rng=random):
+        return cls(backtracking_iterativo(tablero, EstadoBusqueda(), rng=rng))
+
+    def avanzar(self, max_nodos=None, segundos=None):
+        """Sigue la búsqueda hasta terminar, explorar max_nodos nodos o pasar segundos."""
+        if self.terminada:
+            return True
+        limite = None if segundos is None else time.perf_counter() + segundos
+        nodos = 0
+        try:
+            while True:
+                next(self._pasos)
+                nodos += 1
+                if max_nodos is not None and nodos >= max_nodos:
+                    return False
+                if limite is not None and time.perf_counter() >= limite:
+                    return False
+        except StopIteration as fin:
+            self.terminada = True
+            self.resultado = fin.value
+            return True
+
+    def cancelar(self):
+        """Abandona la búsqueda. El conteo restaura el tablero; los solvers lo dejan a medias."""
+        self._pasos.close()
+        self.terminada = True
 
 
 def contar_vecinos_restringidos_directo(tablero, fila, col):
     vecinos_restringidos = 0
+    n = len(tablero)
     # Contar vecinos en fila y columna
-    vecinos_restringidos += sum(1 for i in range(9) if tablero[fila][i] == 0 and i != col)
-    vecinos_restringidos += sum(1 for i in range(9) if tablero[i][col] == 0 and i != fila)
-    # Contar vecinos en el bloque 3x3
-    fila_inicio, col_inicio = (fila // 3) * 3, (col // 3) * 3
+    vecinos_restringidos += sum(1 for i in range(n) if tablero[fila][i] == 0 and i != col)
+    vecinos_restringidos += sum(1 for i in range(n) if tablero[i][col] == 0 and i != fila)
+    # Contar vecinos en el bloque (3x3 en 9x9)
+    lado = math.isqrt(n)
+    fila_inicio, col_inicio = (fila // lado) * lado, (col // lado) * lado
     vecinos_restringidos += sum(
-        1 for i in range(fila_inicio, fila_inicio + 3) for j in range(col_inicio, col_inicio + 3)
+        1 for i in range(fila_inicio, fila_inicio + lado) for j in range(col_inicio, col_inicio + lado)
         if tablero[i][j] == 0 and i != fila and j != col
     )
     return vecinos_restringidos
 
+def celdas_vacias_de(tablero):
+    """Lista de (fila, col) de las celdas vacías, recorriendo por filas."""
+    n = len(tablero)
+    return [(fila, col) for fila in range(n) for col in range(n) if tablero[fila][col] == 0]
+
 # Contar celdas vacías en el tablero
 def contar_celdas_vacias(tablero):
     return sum(1 for fila in tablero for celda in fila if celda == 0)
 
 # Obtener lista de números válidos para una celda específica
 def obtener_opciones_validas(tablero, fila, col):
-    opciones = set(range(1, 10))
+    n = len(tablero)
+    lado = math.isqrt(n)
+    opciones = set(range(1, n + 1))
     opciones -= set(tablero[fila])
-    opciones -= {tablero[i][col] for i in range(9)}
-    fila_inicio, col_inicio = (fila // 3) * 3, (col // 3) * 3
-    opciones -= {tablero[i][j] for i in range(fila_inicio, fila_inicio + 3) for j in range(col_inicio, col_inicio + 3)}
+    opciones -= {tablero[i][col] for i in range(n)}
+    fila_inicio, col_inicio = (fila // lado) * lado, (col // lado) * lado
+    opciones -= {tablero[i][j] for i in range(fila_inicio, fila_inicio + lado) for j in range(col_inicio, col_inicio + lado)}
     return list(opciones)
 
+# ========================
+# Motor de máscaras de bits
+# ========================
+
+class _DigitosCalculados:
+    """Reemplaza a la tabla de dígitos por máscara cuando sería demasiado grande (n > 9)."""
+    __slots__ = ()
+
+    def __getitem__(self, mascara):
+        digitos = []
+        while mascara:
+            bajo = mascara & -mascara
+            digitos.append(bajo.bit_length() - 1)
+            mascara ^= bajo
+        return digitos
+
+
+class _CantidadesCalculadas:
+    """Reemplaza a la tabla de cantidad de dígitos por máscara cuando n > 9."""
+    __slots__ = ()
+
+    def __getitem__(self, mascara):
+        return mascara.bit_count()
+
+
+class Geometria:
+    """
+    Tablas de índices de un tablero de n×n con bloques de √n×√n (9: 3×3, 16: 4×4,
+    25: 5×5). Las celdas se indexan de 0 a n²-1 recorriendo el tablero por filas y el
+    bit k de una máscara representa al número k. Se crea una vez por tamaño con geometria(n).
+    """
+    __slots__ = ("n", "lado", "total", "fila_de", "columna_de", "caja_de", "vecinos", "unidades",
+                 "intersecciones", "todos", "digitos", "cantidad")
+
+    def __init__(self, n):
+        lado = math.isqrt(n)
+        if n < 1 or lado * lado != n:
+            raise ValueError(f"El lado del tablero tiene que ser un cuadrado (4, 9, 16, 25...), no {n}")
+        self.n, self.lado, self.total = n, lado, n * n
+        total = n * n
+        self.fila_de = tuple(i // n for i in range(total))
+        self.columna_de = tuple(i % n for i in range(total))
+        self.caja_de = tuple((i // (n * lado)) * lado + (i % n) // lado for i in range(total))
+        # Las 3n unidades (filas, columnas y bloques) como tuplas de índices
+        filas = tuple(tuple(f * n + c for c in range(n)) for f in range(n))
+        columnas = tuple(tuple(f * n + c for f in range(n)) for c in range(n))
+        cajas = tuple(tuple(i for i in range(total) if self.caja_de[i] == b) for b in range(n))
+        self.unidades = filas + columnas + cajas
+        # Los vecinos (misma fila, columna o bloque) de cada celda, en orden creciente
+        self.vecinos = tuple(
+            tuple(sorted(set(filas[self.fila_de[i]] + columnas[self.columna_de[i]] + cajas[self.caja_de[i]]) - {i}))
+            for i in range(total)
+        )
+        # Intersecciones fila/columna con bloque: (celdas en común, resto de la línea, resto del bloque)
+        intersecciones = []
+        for linea in filas + columnas:
+            en_linea = set(linea)
+            for bloque in cajas:
+                if en_linea.isdisjoint(bloque):
+                    continue
+                en_bloque = set(bloque)
+                intersecciones.append((tuple(i for i in linea if i in en_bloque),
+                                       tuple(i for i in linea if i not in en_bloque),
+                                       tuple(i for i in bloque if i not in en_linea)))
+        self.intersecciones = tuple(intersecciones)
+        self.todos = ((1 << n) - 1) << 1
+        # Dígitos (en orden creciente) y cantidad de dígitos de cada máscara posible
+        if n <= 9:
+            self.digitos = tuple(tuple(num for num in range(1, n + 1) if mascara >> num & 1) for mascara in range(2 << n))
+            self.cantidad = tuple(len(digitos) for digitos in self.digitos)
+        else:
+            self.digitos = _DigitosCalculados()
+            self.cantidad = _CantidadesCalculadas()
+
+
+_GEOMETRIAS = {}
+
+def geometria(n):
+    """Geometria del tablero de n×n (se construye la primera vez que se pide)."""
+    geo = _GEOMETRIAS.get(n)
+    if geo is None:
+        geo = _GEOMETRIAS[n] = Geometria(n)
+    return geo
+
+# Las tablas del tablero de 9x9 (celdas de 0 a 80 recorridas por filas)
+GEOMETRIA_9 = geometria(9)
+FILA_DE = GEOMETRIA_9.fila_de
+COLUMNA_DE = GEOMETRIA_9.columna_de
+CAJA_DE = GEOMETRIA_9.caja_de
+# Los 20 vecinos (misma fila, columna o bloque 3x3) de cada celda
+VECINOS = GEOMETRIA_9.vecinos
+# Las 27 unidades (9 filas, 9 columnas y 9 bloques) como tuplas de índices
+UNIDADES = GEOMETRIA_9.unidades
+
+TODOS_LOS_DIGITOS = GEOMETRIA_9.todos  # El bit n representa al número n (1 a 9)
+# Dígitos (en orden creciente) y cantidad de dígitos de cada máscara posible
+DIGITOS_MASCARA = GEOMETRIA_9.digitos
+CANTIDAD_OPCIONES = GEOMETRIA_9.cantidad
+
+
+class MotorBitmask:
+    """
+    Estado de restricciones del tablero con una máscara de bits por fila, columna y bloque.
+    Colocar o quitar un número actualiza las tres máscaras, así que las opciones de una
+    celda se obtienen sin recorrer el tablero. Los contadores y el camino de solución
+    quedan en el motor en lugar de en las variables globales.
+    Además, cada celda tiene una máscara de números descartados por la propagación.
+    El tamaño (9x9, 16x16, 25x25...) sale del tablero; las tablas están en geometria.
+    """
+    __slots__ = ("tablero", "plano", "geometria", "fila_de", "columna_de", "caja_de", "todos",
+                 "celdas", "filas", "columnas", "cajas", "eliminados", "vacias",
+                 "pasos_atras", "nodos_explorados", "solucion")
+
+    def __init__(self, tablero):
+        self.tablero = tablero
+        self.geometria = geo = geometria(len(tablero))
+        # Las tablas más usadas se guardan en el motor para no buscarlas en la geometría
+        self.fila_de, self.columna_de, self.caja_de, self.todos = geo.fila_de, geo.columna_de, geo.caja_de, geo.todos
+        # Con un Tablero compacto se lee y escribe directamente en su bytearray
+        self.plano = tablero.celdas if isinstance(tablero, Tablero) else None
+        if self.plano is not None:
+            self.celdas = list(self.plano)
+        else:
+            self.celdas = [tablero[geo.fila_de[i]][geo.columna_de[i]] for i in range(geo.total)]
+        self.filas = [0] * geo.n
+        self.columnas = [0] * geo.n
+        self.cajas = [0] * geo.n
+        self.eliminados = [0] * geo.total
+        self.vacias = 0
+        for i, num in enumerate(self.celdas):
+            if num == 0:
+                self.vacias += 1
+            else:
+                bit = 1 << num
+                self.filas[geo.fila_de[i]] |= bit
+                self.columnas[geo.columna_de[i]] |= bit
+                self.cajas[geo.caja_de[i]] |= bit
+        self.pasos_atras = 0
+        self.nodos_explorados = 0
+        self.solucion = {}
+
+    def opciones(self, i):
+        """Máscara con los números que se pueden colocar en la celda i."""
+        return self.todos & ~(self.filas[self.fila_de[i]] | self.columnas[self.columna_de[i]] | self.cajas[self.caja_de[i]] | self.eliminados[i])
+
+    def es_valido(self, fila, col, num):
+        """Equivalente a es_valido(tablero, fila, col, num) sin recorrer el tablero."""
+        return (self.filas[fila] | self.columnas[col] | self.cajas[self.caja_de[fila * self.geometria.n + col]]) >> num & 1 == 0
+
+    def colocar(self, i, num):
+        bit = 1 << num
+        fila = self.fila_de[i]
+        self.filas[fila] |= bit
+        self.columnas[self.columna_de[i]] |= bit
+        self.cajas[self.caja_de[i]] |= bit
+        self.celdas[i] = num
+        if self.plano is not None:
+            self.plano[i] = num
+        else:
+            self.tablero[fila][self.columna_de[i]] = num
+        self.vacias -= 1
+
+    def quitar(self, i):
+        bit = ~(1 << self.celdas[i])
+        fila = self.fila_de[i]
+        self.filas[fila] &= bit
+        self.columnas[self.columna_de[i]] &= bit
+        self.cajas[self.caja_de[i]] &= bit
+        self.celdas[i] = 0
+        if self.plano is not None:
+            self.plano[i] = 0
+        else:
+            self.tablero[fila][self.columna_de[i]] = 0
+        self.vacias += 1
+
+    def eliminar(self, i, mascara):
+        """Descarta los números de la máscara en la celda i y devuelve la máscara anterior."""
+        previo = self.eliminados[i]
+        self.eliminados[i] = previo | mascara
+        return previo
+
+    def restaurar_eliminados(self, i, previo):
+        self.eliminados[i] = previo
+
+    def vecinos_vacios(self, i):
+        """Equivalente a contar_vecinos_restringidos_directo para una celda vacía."""
+        celdas = self.celdas
+        return sum(1 for j in self.geometria.vecinos[i] if celdas[j] == 0)
+
+
+def _sincronizar_globales(estado, propagador=None):
+    """Suma los contadores de la búsqueda (y del propagador) a las variables globales que usa el juego."""
+    global PASOS_ATRAS, NODOS_EXPLORADOS
+    PASOS_ATRAS += estado.pasos_atras
+    NODOS_EXPLORADOS += estado.nodos_explorados
+    SOLUCION.update(estado.solucion)
+    if propagador is not None:
+        for tecnica in Propagador.TECNICAS:
+            colocaciones, eliminaciones = ESTADISTICAS_PROPAGACION.get(tecnica, (0, 0))
+            ESTADISTICAS_PROPAGACION[tecnica] = (colocaciones + propagador.colocaciones[tecnica],
+                                                 eliminaciones + propagador.eliminaciones[tecnica])
+
+# Backtracking puro sobre el motor: mismo orden de exploración que resolver_backtracking_puro
+# Con un propagador se propaga en cada nodo y se ramifica en la primera celda que siga vacía
+def resolver_backtracking_bitmask(tablero, propagador=None):
+    resuelto, motor = ejecutar_backtracking_bitmask(tablero, propagador)
+    _sincronizar_globales(motor, propagador)
+    return resuelto
+
+def ejecutar_backtracking_bitmask(tablero, propagador=None, instrumentacion=None):
+    motor = MotorBitmask(tablero)
+    vacias = [i for i, num in enumerate(motor.celdas) if num == 0]
+    if propagador is None:
+        return backtracking_bitmask(motor, vacias, 0, instrumentacion), motor
+    return backtracking_propagado(motor, propagador, vacias, 0, instrumentacion), motor
+
+def _opciones_medidas(motor, i, instr):
+    # En el motor de máscaras, motor.opciones hace el trabajo de obtener_opciones_validas
+    if instr is None:
+        return motor.opciones(i)
+    return instr.medir("obtener_opciones_validas", motor.opciones, i)
+
+def backtracking_propagado(motor, propagador, vacias, k, instr=None):
+    return completar_busqueda(backtracking_propagado_iterativo(motor, propagador, vacias, k, instr))
+
+def backtracking_propagado_iterativo(motor, propagador, vacias, k=0, instr=None):
+    """
+    Backtracking con propagación en cada nodo, con una pila explícita. Ramifica en la primera
+    celda de vacias (desde k) que siga vacía. Es un generador: hace yield después de cada
+    nodo y devuelve si resolvió.
+    """
+    celdas, solucion = motor.celdas, motor.solucion
+    digitos = motor.geometria.digitos
+    pila = []  # Marcos [celda, números, índice del próximo, marca del propagador, k]
+    while True:
+        # Entramos a un nodo: se propaga y se busca la próxima celda vacía
+        if instr is not None:
+            instr.nodo(len(solucion))
+        marca = propagador.marca()
+        if instr is None:
+            consistente = propagador.propagar(motor, motor)
+        else:
+            consistente = instr.medir("propagar", propagador.propagar, motor, motor)
+        podado = True
+        if not consistente:
+            if instr is not None:
+                instr.poda("contradiccion", len(solucion))
+            propagador.deshacer(motor, motor, marca)
+        else:
+            while k < len(vacias) and celdas[vacias[k]] != 0:
+                k += 1
+            if k == len(vacias):
+                return True
+            i = vacias[k]
+            pila.append([i, digitos[_opciones_medidas(motor, i, instr)], 0, marca, k])
+            podado = False
+
+        while True:
+            if podado:
+                # El hijo falló: si no hay padre, no hay solución; si no, retrocedemos su celda
+                if not pila:
+                    return False
+                i, numeros, j, _, _ = pila[-1]
+                motor.pasos_atras += 1
+                motor.quitar(i)
+                posicion = (motor.fila_de[i], motor.columna_de[i])
+                del solucion[posicion]
+                if instr is not None:
+                    instr.retroceso(posicion[0], posicion[1], numeros[j - 1], len(solucion))
+            marco = pila[-1]
+            i, numeros, j, marca, k = marco
+            if j < len(numeros):
+                break
+            # Se agotaron los números de esta celda: se deshace su propagación
+            propagador.deshacer(motor, motor, marca)
+            pila.pop()
+            podado = True
+
+        num = numeros[j]
+        marco[2] = j + 1
+        posicion = (motor.fila_de[i], motor.columna_de[i])
+        motor.colocar(i, num)
+        solucion[posicion] = num
+        motor.nodos_explorados += 1
+        if instr is not None:
+            instr.asignacion(posicion[0], posicion[1], num, len(solucion))
+        k += 1
+        yield
+
+def backtracking_bitmask(motor, vacias, k, instr=None):
+    return completar_busqueda(backtracking_bitmask_iterativo(motor, vacias, k, instr))
+
+def backtracking_bitmask_iterativo(motor, vacias, k=0, instr=None):
+    """
+    Backtracking puro sobre el motor con una pila explícita: mismo orden de exploración que
+    backtracking_iterativo. Es un generador: hace yield después de cada nodo y devuelve si resolvió.
+    """
+    # Las celdas se llenan en orden, así que la próxima vacía es siempre vacias[k]
+    solucion = motor.solucion
+    digitos = motor.geometria.digitos
+    pila = []  # Por nivel: [números posibles, índice del próximo a probar]
+    entrar = True
+    while True:
+        if entrar:
+            if instr is not None:
+                instr.nodo(k)
+            if k == len(vacias):
+                return True
+            pila.append([digitos[_opciones_medidas(motor, vacias[k], instr)], 0])
+        else:
+            # El nivel de abajo no encontró solución: deshacemos la celda de este nivel
+            numeros, j = pila[-1]
+            i = vacias[k]
+            motor.pasos_atras += 1
+            motor.quitar(i)
+            posicion = (motor.fila_de[i], motor.columna_de[i])
+            del solucion[posicion]
+            if instr is not None:
+                instr.retroceso(posicion[0], posicion[1], numeros[j - 1], k)
+        marco = pila[-1]
+        numeros, j = marco
+        if j == len(numeros):
+            # Ningún número sirve en esta celda: retrocedemos al nivel anterior
+            pila.pop()
+            if not pila:
+                return False
+            k -= 1
+            entrar = False
+            continue
+        num = numeros[j]
+        marco[1] = j + 1
+        i = vacias[k]
+        posicion = (motor.fila_de[i], motor.columna_de[i])
+        motor.colocar(i, num)
+        solucion[posicion] = num
+        motor.nodos_explorados += 1
+        if instr is not None:
+            instr.asignacion(posicion[0], posicion[1], num, k + 1)
+        k += 1
+        entrar = True
+        yield
+
+# Branch & Bound sobre el motor: mismas cotas y misma cola que resolver_sudoku_bb_cotas
+# Con incremental=True la cola y la cota se mantienen con BBIncremental en lugar de recalcularse en cada nodo.
+# La propagación (propagador) sólo se aplica en el modo incremental.
+def resolver_sudoku_bb_bitmask(tablero, incremental=True, propagador=None):
+    global CELDAS_JUGABLES
+    CELDAS_JUGABLES = celdas_vacias_de(tablero)
+    resuelto, motor = ejecutar_bb_bitmask(tablero, incremental, propagador)
+    _sincronizar_globales(motor, propagador)
+    return resuelto
+
+def ejecutar_bb_bitmask(tablero, incremental=True, propagador=None, instrumentacion=None):
+    if incremental or propagador is not None:
+        estado = BBIncremental(tablero)
+        return bb_resolver_incremental(estado, float('inf'), propagador, instrumentacion), estado.motor
+    motor = MotorBitmask(tablero)
+    return bb_resolver_bitmask(motor, crear_cola_prioridad_bitmask(motor), float('inf'), instrumentacion), motor
+
+def crear_cola_prioridad_bitmask(motor):
+    cola_prioridad = []
+    celdas = motor.celdas
+    geo = motor.geometria
+    fila_de, columna_de, digitos, cantidad = geo.fila_de, geo.columna_de, geo.digitos, geo.cantidad
+    menos_restringida, menor = -1, geo.n + 1
+    for i in range(geo.total):
+        if celdas[i] != 0:
+            continue
+        opciones = motor.opciones(i)
+        if not opciones:
+            return []
+        num_opciones = cantidad[opciones]
+        if num_opciones == 1:
+            heapq.heappush(cola_prioridad, (1, -1000, fila_de[i], columna_de[i], list(digitos[opciones])))
+            return cola_prioridad
+        elif num_opciones <= 6:
+            heapq.heappush(cola_prioridad, (num_opciones, -motor.vecinos_vacios(i), fila_de[i], columna_de[i], list(digitos[opciones])))
+        elif num_opciones < menor:
+            menos_restringida, menor = i, num_opciones
+    # Como crear_cola_prioridad: en 16×16 y 25×25 nunca se deja la cola vacía si hay celdas vacías
+    if not cola_prioridad and menos_restringida >= 0 and geo.n > 9:
+        i = menos_restringida
+        opciones = motor.opciones(i)
+        heapq.heappush(cola_prioridad, (menor, -motor.vecinos_vacios(i), fila_de[i], columna_de[i], list(digitos[opciones])))
+    return cola_prioridad
+
+def calcular_cota_superior_bitmask(motor):
+    if motor.vacias == 0:
+        return 0
+    max_opciones = 0
+    total_restricciones = 0
+    celdas = motor.celdas
+    cantidad = motor.geometria.cantidad
+    for i in range(len(celdas)):
+        if celdas[i] == 0:
+            opciones = cantidad[motor.opciones(i)]
+            if opciones == 0:
+                return float('inf')
+            max_opciones = max(max_opciones, opciones)
+            total_restricciones += motor.vecinos_vacios(i)
+    return motor.vacias * max_opciones + total_restricciones
+
+def bb_resolver_bitmask(motor, cola_prioridad, mejor_cota, instr=None):
+    if instr is not None:
+        instr.nodo(len(motor.solucion))
+        instr.cola(len(cola_prioridad))
+    if motor.vacias == 0:
+        return True
+    if not cola_prioridad:
+        if instr is not None:
+            instr.poda("cola_vacia", len(motor.solucion))
+        return False
+
+    if instr is None:
+        cota_actual = calcular_cota_superior_bitmask(motor)
+    else:
+        cota_actual = instr.medir("calcular_cota_superior", calcular_cota_superior_bitmask, motor)
+    if cota_actual >= mejor_cota:
+        if instr is not None:
+            instr.poda("cota", len(motor.solucion))
+        return False
+
+    _, _, fila, col, opciones = heapq.heappop(cola_prioridad)
+    i = fila * motor.geometria.n + col
+    for num in opciones:
+        motor.colocar(i, num)
+        motor.solucion[(fila, col)] = num
+        motor.nodos_explorados += 1
+        if instr is None:
+            nueva_cola = crear_cola_prioridad_bitmask(motor)
+        else:
+            instr.asignacion(fila, col, num, len(motor.solucion))
+            nueva_cola = instr.medir("crear_cola_prioridad", crear_cola_prioridad_bitmask, motor)
+
+        if bb_resolver_bitmask(motor, nueva_cola, cota_actual, instr):
+            return True
+
+        motor.quitar(i)
+        del motor.solucion[(fila, col)]
+        motor.pasos_atras += 1
+        if instr is not None:
+            instr.retroceso(fila, col, num, len(motor.solucion))
+
+    return False
+
+
+class BBIncremental:
+    """
+    Cola de prioridad y cota superior del Branch & Bound mantenidas por diferencias.
+    Al colocar un número sólo cambian sus vecinos (20 en 9x9): pierden un vecino vacío y,
+    si el número era una opción, una opción. Esos cambios se aplican (y se deshacen al
+    retroceder) sin volver a recorrer el tablero, y la cola usa borrado perezoso:
+    una entrada se descarta al llegar al tope si ya no coincide con la celda.
+    """
+    __slots__ = ("motor", "geometria", "num_opciones", "vecinos", "por_opciones", "total_restricciones", "cola", "deshacer")
+
+    def __init__(self, tablero):
+        self.motor = motor = MotorBitmask(tablero)
+        self.geometria = geo = motor.geometria
+        celdas = motor.celdas
+        self.num_opciones = [geo.cantidad[motor.opciones(i)] if celdas[i] == 0 else 0 for i in range(geo.total)]
+        # Los vecinos vacíos se llevan para todas las celdas, también las llenas
+        self.vecinos = [motor.vecinos_vacios(i) for i in range(geo.total)]
+        self.por_opciones = [0] * (geo.n + 1)  # Cantidad de celdas vacías con k opciones
+        self.total_restricciones = 0
+        for i in range(geo.total):
+            if celdas[i] == 0:
+                self.por_opciones[self.num_opciones[i]] += 1
+                self.total_restricciones += self.vecinos[i]
+        self.cola = []
+        self.deshacer = []  # Por cada colocación, los vecinos que perdieron una opción
+        self.reconstruir_cola()
+
+    def _clave(self, i):
+        n = self.num_opciones[i]
+        return (n, -1000 if n == 1 else -self.vecinos[i], self.geometria.fila_de[i], self.geometria.columna_de[i])
+
+    def _encolar(self, i):
+        if 1 <= self.num_opciones[i] <= 6:
+            heapq.heappush(self.cola, self._clave(i))
+
+    def reconstruir_cola(self):
+        celdas = self.motor.celdas
+        self.cola = [self._clave(i) for i in range(len(celdas)) if celdas[i] == 0 and 1 <= self.num_opciones[i] <= 6]
+        heapq.heapify(self.cola)
+
+    def mejor_celda(self):
+        """Devuelve la celda que sacaría crear_cola_prioridad, o None si la cola quedaría vacía."""
+        cola = self.cola
+        # Con muchas entradas viejas conviene reconstruirla desde cero
+        n = self.geometria.n
+        if len(cola) > 8 * n * n:
+            self.reconstruir_cola()
+            cola = self.cola
+        celdas = self.motor.celdas
+        while cola:
+            clave = cola[0]
+            i = clave[2] * n + clave[3]
+            if celdas[i] == 0 and clave == self._clave(i):
+                return i
+            heapq.heappop(cola)
+        # En 16×16 y 25×25, si ninguna celda tiene 6 opciones o menos va la que tenga menos
+        if n > 9 and self.motor.vacias and not self.por_opciones[0]:
+            return min((i for i in range(len(celdas)) if celdas[i] == 0), key=self._clave)
+        return None
+
+    def cota_superior(self):
+        """Mismo valor que calcular_cota_superior sobre el tablero actual."""
+        motor = self.motor
+        if motor.vacias == 0:
+            return 0
+        if self.por_opciones[0]:
+            return float('inf')
+        max_opciones = self.geometria.n
+        while not self.por_opciones[max_opciones]:
+            max_opciones -= 1
+        return motor.vacias * max_opciones + self.total_restricciones
+
+    def colocar(self, i, num):
+        motor = self.motor
+        celdas = motor.celdas
+        num_opciones = self.num_opciones
+        vecinos = self.vecinos
+        por_opciones = self.por_opciones
+        bit = 1 << num
+        afectados = []
+        por_opciones[num_opciones[i]] -= 1
+        self.total_restricciones -= 2 * vecinos[i]
+        for j in self.geometria.vecinos[i]:
+            vecinos[j] -= 1
+            if celdas[j] == 0:
+                if motor.opciones(j) & bit:
+                    por_opciones[num_opciones[j]] -= 1
+                    num_opciones[j] -= 1
+                    por_opciones[num_opciones[j]] += 1
+                    afectados.append(j)
+                self._encolar(j)
+        motor.colocar(i, num)
+        self.deshacer.append(afectados)
+
+    def eliminar(self, i, mascara):
+        motor = self.motor
+        previo = motor.eliminar(i, mascara)
+        self._recontar(i)
+        return previo
+
+    def restaurar_eliminados(self, i, previo):
+        self.motor.restaurar_eliminados(i, previo)
+        self._recontar(i)
+
+    def _recontar(self, i):
+        por_opciones = self.por_opciones
+        por_opciones[self.num_opciones[i]] -= 1
+        self.num_opciones[i] = self.geometria.cantidad[self.motor.opciones(i)]
+        por_opciones[self.num_opciones[i]] += 1
+        self._encolar(i)
+
+    def quitar(self, i):
+        motor = self.motor
+        celdas = motor.celdas
+        num_opciones = self.num_opciones
+        vecinos = self.vecinos
+        por_opciones = self.por_opciones
+        motor.quitar(i)
+        for j in self.deshacer.pop():
+            por_opciones[num_opciones[j]] -= 1
+            num_opciones[j] += 1
+            por_opciones[num_opciones[j]] += 1
+        for j in self.geometria.vecinos[i]:
+            vecinos[j] += 1
+            if celdas[j] == 0:
+                self._encolar(j)
+        num_opciones[i] = self.geometria.cantidad[motor.opciones(i)]
+        por_opciones[num_opciones[i]] += 1
+        self.total_restricciones += 2 * vecinos[i]
+        self._encolar(i)
+
+# Resolver utilizando Branch & Bound incremental: sin propagador explora los mismos nodos que bb_resolver_cotas
+def bb_resolver_incremental(estado, mejor_cota, propagador=None, instr=None):
+    return completar_busqueda(bb_incremental_iterativo(estado, mejor_cota, propagador, instr))
+
+def bb_incremental_iterativo(estado, mejor_cota, propagador=None, instr=None):
+    """
+    Branch & Bound incremental con una pila explícita. Cada marco guarda la celda elegida,
+    sus números, el próximo a probar, la marca del propagador y la cota con la que se
+    podan sus hijos, así que el orden es el mismo que bajando nodo por nodo.
+    Es un generador: hace yield después de cada nodo y devuelve si resolvió.
+    """
+    motor = estado.motor
+    solucion = motor.solucion
+    digitos = motor.geometria.digitos
+    pila = []  # Marcos [celda, números, índice del próximo, marca, cota_actual]
+    while True:
+        # Entramos a un nodo con la mejor cota del padre
+        if instr is not None:
+            instr.nodo(len(solucion))
+        marca = None
+        consistente = True
+        if propagador is not None:
+            marca = propagador.marca()
+            if instr is None:
+                consistente = propagador.propagar(estado, motor)
+            else:
+                consistente = instr.medir("propagar", propagador.propagar, estado, motor)
+                if not consistente:
+                    instr.poda("contradiccion", len(solucion))
+        podado = True
+        if consistente:
+            if motor.vacias == 0:
+                return True
+            rama = _bb_incremental_rama(estado, mejor_cota, instr)
+            if rama is not None:
+                i, cota_actual = rama
+                pila.append([i, digitos[_opciones_medidas(motor, i, instr)], 0, marca, cota_actual])
+                podado = False
+        if podado and marca is not None:
+            propagador.deshacer(estado, motor, marca)
+
+        while True:
+            if podado:
+                # El hijo falló: si no hay padre, no hay solución; si no, retrocedemos su celda
+                if not pila:
+                    return False
+                i, numeros, j, _, _ = pila[-1]
+                estado.quitar(i)
+                posicion = (motor.fila_de[i], motor.columna_de[i])
+                del solucion[posicion]
+                motor.pasos_atras += 1
+                if instr is not None:
+                    instr.retroceso(posicion[0], posicion[1], numeros[j - 1], len(solucion))
+            marco = pila[-1]
+            i, numeros, j, marca, cota_actual = marco
+            if j < len(numeros):
+                break
+            # Se agotaron los números de esta celda
+            pila.pop()
+            if marca is not None:
+                propagador.deshacer(estado, motor, marca)
+            podado = True
+
+        num = numeros[j]
+        marco[2] = j + 1
+        posicion = (motor.fila_de[i], motor.columna_de[i])
+        estado.colocar(i, num)
+        solucion[posicion] = num
+        motor.nodos_explorados += 1
+        if instr is not None:
+            instr.asignacion(posicion[0], posicion[1], num, len(solucion))
+        mejor_cota = cota_actual
+        yield
+
+def _bb_incremental_rama(estado, mejor_cota, instr):
+    # (celda, cota_actual) en la que ramificar, o None si el nodo se poda
+    motor = estado.motor
+    # crear_cola_prioridad devuelve una cola vacía si alguna celda se quedó sin opciones
+    if estado.por_opciones[0]:
+        if instr is not None:
+            instr.poda("sin_opciones", len(motor.solucion))
+        return None
+    if instr is None:
+        i = estado.mejor_celda()
+    else:
+        # mejor_celda y cota_superior reemplazan a crear_cola_prioridad y calcular_cota_superior
+        i = instr.medir("crear_cola_prioridad", estado.mejor_celda)
+        instr.cola(len(estado.cola))
+    if i is None:
+        if instr is not None:
+            instr.poda("cola_vacia", len(motor.solucion))
+        return None
+
+    if instr is None:
+        cota_actual = estado.cota_superior()
+    else:
+        cota_actual = instr.medir("calcular_cota_superior", estado.cota_superior)
+    if cota_actual >= mejor_cota:
+        if instr is not None:
+            instr.poda("cota", len(motor.solucion))
+        return None
+    return i, cota_actual
+
+# ========================
+# Instrumentación
+# ========================
+
+class Instrumentacion:
+    """
+    Observador opcional de una búsqueda. Los solvers reciben instrumentacion=None por
+    defecto y en ese caso sólo pagan una comparación con None por evento.
+
+    Eventos (cada uno con un callback opcional): nodo(profundidad),
+    asignacion(fila, col, num, profundidad), retroceso(fila, col, num, profundidad)
+    y poda(motivo, profundidad). La profundidad es la cantidad de celdas del camino actual.
+
+    Además acumula el tiempo (inclusivo, en ns) y las llamadas de cada fase medida con
+    medir(): obtener_opciones_validas, crear_cola_prioridad, calcular_cota_superior,
+    es_valido y propagar. En el motor de máscaras, las funciones equivalentes se miden
+    con el mismo nombre para poder comparar motores.
+    """
+
+    def __init__(self, al_nodo=None, al_asignar=None, al_retroceder=None, al_podar=None):
+        self.al_nodo = al_nodo
+        self.al_asignar = al_asignar
+        self.al_retroceder = al_retroceder
+        self.al_podar = al_podar
+        self.nodos = 0
+        self.asignaciones = 0
+        self.retrocesos = 0
+        self.podas = collections.Counter()
+        self.tiempos_ns = collections.Counter()
+        self.llamadas = collections.Counter()
+        self.profundidad_maxima = 0
+        self.cola_maxima = 0
+
+    def nodo(self, profundidad):
+        self.nodos += 1
+        if profundidad > self.profundidad_maxima:
+            self.profundidad_maxima = profundidad
+        if self.al_nodo is not None:
+            self.al_nodo(profundidad)
+
+    def asignacion(self, fila, col, num, profundidad):
+        self.asignaciones += 1
+        if profundidad > self.profundidad_maxima:
+            self.profundidad_maxima = profundidad
+        if self.al_asignar is not None:
+            self.al_asignar(fila, col, num, profundidad)
+
+    def retroceso(self, fila, col, num, profundidad):
+        self.retrocesos += 1
+        if self.al_retroceder is not None:
+            self.al_retroceder(fila, col, num, profundidad)
+
+    def poda(self, motivo, profundidad):
+        self.podas[motivo] += 1
+        if self.al_podar is not None:
+            self.al_podar(motivo, profundidad)
+
+    def cola(self, tamano):
+        if tamano > self.cola_maxima:
+            self.cola_maxima = tamano
+
+    def medir(self, fase, funcion, *args):
+        """Llama a funcion(*args) sumando su duración a la fase."""
+        inicio = time.perf_counter_ns()
+        try:
+            return funcion(*args)
+        finally:
+            self.tiempos_ns[fase] += time.perf_counter_ns() - inicio
+            self.llamadas[fase] += 1
+
+    def resumen(self):
+        return {
+            "nodos": self.nodos,
+            "asignaciones": self.asignaciones,
+            "retrocesos": self.retrocesos,
+            "podas": dict(self.podas),
+            "profundidad_maxima": self.profundidad_maxima,
+            "cola_maxima": self.cola_maxima,
+            "fases": {fase: {"llamadas": self.llamadas[fase], "tiempo_ns": self.tiempos_ns[fase]} for fase in self.tiempos_ns},
+        }
+
+class BusquedaInterrumpida(Exception):
+    """Se lanza desde la búsqueda cuando se agota alguno de sus Limites."""
+
+    def __init__(self, motivo):
+        super().__init__(f"Búsqueda interrumpida: {motivo}")
+        self.motivo = motivo
+
+
+class Limites:
+    """
+    Límites de una operación: tiempo en segundos (desde que se crea el objeto), cantidad
+    máxima de nodos y un token de cancelación (cualquier objeto con is_set(), como
+    threading.Event o multiprocessing.Event) que se puede activar desde otro hilo o proceso.
+
+    Los solvers lo reciben en lugar de una Instrumentacion (ver observar()) y lo verifican
+    en cada asignación; al agotarse lanzan BusquedaInterrumpida y los puntos de entrada
+    devuelven un resultado "agotado" con las estadísticas parciales (nodos, retrocesos).
+    Un Limites se usa para una sola operación.
+    """
+    __slots__ = ("limite_tiempo", "max_nodos", "cancelacion", "instrumentacion",
+                 "nodos", "retrocesos", "motivo", "_hasta_revision")
+
+    # El reloj y el token se consultan cada tantos nodos para que el costo sea despreciable
+    INTERVALO_REVISION = 16
+
+    def __init__(self, segundos=None, max_nodos=None, cancelacion=None):
+        self.limite_tiempo = None if segundos is None else time.perf_counter() + segundos
+        self.max_nodos = max_nodos
+        self.cancelacion = cancelacion
+        self.instrumentacion = None
+        self.nodos = 0
+        self.retrocesos = 0
+        self.motivo = None
+        self._hasta_revision = 0
+
+    def observar(self, instrumentacion=None):
+        """Devuelve el observador para pasar a los solvers, reenviando los eventos a instrumentacion."""
+        self.instrumentacion = instrumentacion
+        return self
+
+    def verificar(self):
+        self.nodos += 1
+        if self.max_nodos is not None and self.nodos > self.max_nodos:
+            self._interrumpir("nodos")
+        self._hasta_revision -= 1
+        if self._hasta_revision <= 0:
+            self._hasta_revision = self.INTERVALO_REVISION
+            self._revisar_reloj()
+
+    def revisar(self, nodos=0):
+        """Suma nodos explorados en otro lado (por ejemplo, en otros procesos) y revisa todos los límites ya."""
+        self.nodos += nodos
+        if self.max_nodos is not None and self.nodos > self.max_nodos:
+            self._interrumpir("nodos")
+        self._revisar_reloj()
+
+    def _revisar_reloj(self):
+        if self.cancelacion is not None and self.cancelacion.is_set():
+            self._interrumpir("cancelada")
+        if self.limite_tiempo is not None and time.perf_counter() >= self.limite_tiempo:
+            self._interrumpir("tiempo")
+
+    def _interrumpir(self, motivo):
+        self.motivo = motivo
+        raise BusquedaInterrumpida(motivo)
+
+    def estado_parcial(self):
+        """EstadoBusqueda con los contadores alcanzados antes de la interrupción."""
+        estado = EstadoBusqueda()
+        estado.nodos_explorados = self.nodos
+        estado.pasos_atras = self.retrocesos
+        return estado
+
+    # Misma interfaz que Instrumentacion
+    def nodo(self, profundidad):
+        if self.instrumentacion is not None:
+            self.instrumentacion.nodo(profundidad)
+
+    def asignacion(self, fila, col, num, profundidad):
+        self.verificar()
+        if self.instrumentacion is not None:
+            self.instrumentacion.asignacion(fila, col, num, profundidad)
+
+    def retroceso(self, fila, col, num, profundidad):
+        self.retrocesos += 1
+        if self.instrumentacion is not None:
+            self.instrumentacion.retroceso(fila, col, num, profundidad)
+
+    def poda(self, motivo, profundidad):
+        if self.instrumentacion is not None:
+            self.instrumentacion.poda(motivo, profundidad)
+
+    def cola(self, tamano):
+        if self.instrumentacion is not None:
+            self.instrumentacion.cola(tamano)
+
+    def medir(self, fase, funcion, *args):
+        if self.instrumentacion is None:
+            return funcion(*args)
+        return self.instrumentacion.medir(fase, funcion, *args)
+
+# ========================
+# Propagación de restricciones
+# ========================
+
+# Intersecciones fila/columna con bloque: (celdas en común, resto de la línea, resto del bloque)
+INTERSECCIONES = GEOMETRIA_9.intersecciones
+
+class Propagador:
+    """
+    Etapa de propagación que los solvers llaman en cada nodo antes de ramificar.
+    Cada técnica se puede activar o desactivar por separado. Las colocaciones y
+    descartes quedan en un rastro para deshacerlos al retroceder, y se cuentan por
+    técnica: cada colocación es un nodo que la búsqueda no tuvo que ramificar.
+    """
+    TECNICAS = ("singles_desnudos", "singles_ocultos", "bloqueo", "pares_desnudos", "triples_desnudos")
+
+    def __init__(self, singles_desnudos=True, singles_ocultos=True, bloqueo=True, pares_desnudos=True, triples_desnudos=True):
+        self.activas = {
+            "singles_desnudos": singles_desnudos,
+            "singles_ocultos": singles_ocultos,
+            "bloqueo": bloqueo,
+            "pares_desnudos": pares_desnudos,
+            "triples_desnudos": triples_desnudos,
+        }
+        self.colocaciones = dict.fromkeys(self.TECNICAS, 0)
+        self.eliminaciones = dict.fromkeys(self.TECNICAS, 0)
+        self.rastro = []
+
+    def marca(self):
+        return len(self.rastro)
+
+    def deshacer(self, estado, motor, marca):
+        """Deshace las colocaciones y descartes hechos desde la marca."""
+        rastro = self.rastro
+        while len(rastro) > marca:
+            i, previo = rastro.pop()
+            if previo is None:
+                estado.quitar(i)
+                del motor.solucion[(motor.fila_de[i], motor.columna_de[i])]
+            else:
+                estado.restaurar_eliminados(i, previo)
+
+    def _colocar(self, estado, motor, i, num, tecnica):
+        estado.colocar(i, num)
+        motor.solucion[(motor.fila_de[i], motor.columna_de[i])] = num
+        self.rastro.append((i, None))
+        self.colocaciones[tecnica] += 1
+
+    def _eliminar(self, estado, motor, i, mascara, tecnica):
+        mascara &= motor.opciones(i)
+        if not mascara:
+            return False
+        self.rastro.append((i, estado.eliminar(i, mascara)))
+        self.eliminaciones[tecnica] += motor.geometria.cantidad[mascara]
+        return True
+
+    def propagar(self, estado, motor):
+        """
+        Aplica las técnicas activas hasta que ninguna cambie el tablero.
+        estado es quien recibe las colocaciones (el motor o un BBIncremental).
+        Devuelve False si encuentra una contradicción.
+        """
+        activas = self.activas
+        while True:
+            resultado = self._singles_desnudos(estado, motor)
+            if resultado is None and activas["singles_ocultos"]:
+                resultado = self._singles_ocultos(estado, motor)
+            if resultado is None and activas["bloqueo"]:
+                resultado = self._bloqueo(estado, motor)
+            if resultado is None and activas["pares_desnudos"]:
+                resultado = self._subconjuntos_desnudos(estado, motor, 2, "pares_desnudos")
+            if resultado is None and activas["triples_desnudos"]:
+                resultado = self._subconjuntos_desnudos(estado, motor, 3, "triples_desnudos")
+            # Cada técnica devuelve None si no cambió nada, True si hubo cambios y False si hay contradicción
+            if resultado is False:
+                return False
+            if not resultado:
+                return True
+
+    def _singles_desnudos(self, estado, motor):
+        # Aunque la técnica esté apagada se revisa que ninguna celda se haya quedado sin opciones
+        colocar = self.activas["singles_desnudos"]
+        celdas = motor.celdas
+        cambio = None
+        for i in range(len(celdas)):
+            if celdas[i] == 0:
+                opciones = motor.opciones(i)
+                if not opciones:
+                    return False
+                if colocar and opciones & (opciones - 1) == 0:
+                    self._colocar(estado, motor, i, opciones.bit_length() - 1, "singles_desnudos")
+                    cambio = True
+        return cambio
+
+    def _singles_ocultos(self, estado, motor):
+        celdas = motor.celdas
+        for unidad in motor.geometria.unidades:
+            vistos = repetidos = colocados = 0
+            for i in unidad:
+                if celdas[i] == 0:
+                    opciones = motor.opciones(i)
+                    repetidos |= vistos & opciones
+                    vistos |= opciones
+                else:
+                    colocados |= 1 << celdas[i]
+            if (vistos | colocados) != motor.todos:
+                return False  # Algún número ya no tiene lugar en la unidad
+            unicos = vistos & ~repetidos
+            if unicos:
+                for i in unidad:
+                    if celdas[i] == 0 and motor.opciones(i) & unicos:
+                        num = (motor.opciones(i) & unicos).bit_length() - 1
+                        self._colocar(estado, motor, i, num, "singles_ocultos")
+                        return True
+        return None
+
+    def _bloqueo(self, estado, motor):
+        # Pares apuntadores (el número del bloque está sólo en una línea) y
+        # de reclamo (el número de la línea está sólo en un bloque)
+        celdas = motor.celdas
+        cambio = None
+
+        def union(indices):
+            mascara = 0
+            for i in indices:
+                if celdas[i] == 0:
+                    mascara |= motor.opciones(i)
+            return mascara
+
+        for comunes, resto_linea, resto_bloque in motor.geometria.intersecciones:
+            en_comun = union(comunes)
+            if not en_comun:
+                continue
+            apuntadores = en_comun & ~union(resto_bloque)
+            if apuntadores:
+                for i in resto_linea:
+                    if celdas[i] == 0 and self._eliminar(estado, motor, i, apuntadores, "bloqueo"):
+                        cambio = True
+            reclamo = en_comun & ~union(resto_linea)
+            if reclamo:
+                for i in resto_bloque:
+                    if celdas[i] == 0 and self._eliminar(estado, motor, i, reclamo, "bloqueo"):
+                        cambio = True
+            if cambio:
+                return True
+        return cambio
+
+    def _subconjuntos_desnudos(self, estado, motor, tamano, tecnica):
+        celdas = motor.celdas
+        cantidad = motor.geometria.cantidad
+        for unidad in motor.geometria.unidades:
+            candidatas = [i for i in unidad if celdas[i] == 0 and cantidad[motor.opciones(i)] <= tamano]
+            if len(candidatas) < tamano:
+                continue
+            for grupo in itertools.combinations(candidatas, tamano):
+                mascara = 0
+                for i in grupo:
+                    mascara |= motor.opciones(i)
+                if cantidad[mascara] != tamano:
+                    continue
+                cambio = False
+                for i in unidad:
+                    if celdas[i] == 0 and i not in grupo and self._eliminar(estado, motor, i, mascara, tecnica):
+                        cambio = True
+                if cambio:
+                    return True
+        return None
+
+# ========================
+# Dancing Links (Algoritmo X)
+# ========================
+
+class DancingLinks:
+    """
+    Algoritmo X de Knuth con enlaces danzantes sobre la matriz de cobertura exacta
+    del Sudoku: n³ filas (celda, número) y 4n² columnas (celda ocupada y número
+    presente en cada fila, columna y bloque); en 9x9, 729 filas y 324 columnas.
+    Siempre se ramifica en la columna con menos filas, así que el tiempo no se dispara
+    en los tableros patológicos. Cada objeto sirve para una sola búsqueda.
+    """
+    __slots__ = ("L", "R", "U", "D", "C", "S", "fila_de_nodo", "parcial", "valido", "geometria",
+                 "pasos_atras", "nodos_explorados", "solucion", "instrumentacion")
+
+    def __init__(self, tablero, instrumentacion=None):
+        self.instrumentacion = instrumentacion
+        self.geometria = geo = geometria(len(tablero))
+        n, total = geo.n, geo.total
+        # Nodo 0: raíz; nodos 1 a 4n²: cabeceras de columna; el resto: unos de la matriz
+        columnas = 4 * total
+        self.L = L = [c - 1 for c in range(columnas + 1)]
+        self.R = R = [c + 1 for c in range(columnas + 1)]
+        L[0], R[columnas] = columnas, 0
+        self.U = U = list(range(columnas + 1))
+        self.D = D = list(range(columnas + 1))
+        self.C = C = list(range(columnas + 1))
+        self.S = S = [0] * (columnas + 1)
+        self.fila_de_nodo = fila_de_nodo = [None] * (columnas + 1)
+        primeros = {}
+        for i in range(total):
+            for num in range(1, n + 1):
+                d = num - 1
+                restricciones = (1 + i, 1 + total + geo.fila_de[i] * n + d,
+                                 1 + 2 * total + geo.columna_de[i] * n + d, 1 + 3 * total + geo.caja_de[i] * n + d)
+                primero = len(C)
+                for k, c in enumerate(restricciones):
+                    nodo = len(C)
+                    C.append(c)
+                    fila_de_nodo.append((i, num))
+                    L.append(nodo - 1 if k else primero + 3)
+                    R.append(nodo + 1 if k < 3 else primero)
+                    U.append(U[c])
+                    D.append(c)
+                    D[U[c]] = nodo
+                    U[c] = nodo
+                    S[c] += 1
+                primeros[(i, num)] = primero
+        self.parcial = []
+        self.pasos_atras = 0
+        self.nodos_explorados = 0
+        self.solucion = {}
+        # Las pistas se eligen de antemano; si dos chocan el tablero no tiene solución
+        self.valido = True
+        cubiertas = set()
+        for fila in range(n):
+            for col in range(n):
+                num = tablero[fila][col]
+                if num != 0:
+                    nodo = primeros[(fila * n + col, num)]
+                    cols = [C[nodo + k] for k in range(4)]
+                    if any(c in cubiertas for c in cols):
+                        self.valido = False
+                        return
+                    for c in cols:
+                        cubiertas.add(c)
+                        self._cubrir(c)
+
+    def _cubrir(self, c):
+        L, R, U, D, C, S = self.L, self.R, self.U, self.D, self.C, self.S
+        R[L[c]] = R[c]
+        L[R[c]] = L[c]
+        i = D[c]
+        while i != c:
+            j = R[i]
+            while j != i:
+                U[D[j]] = U[j]
+                D[U[j]] = D[j]
+                S[C[j]] -= 1
+                j = R[j]
+            i = D[i]
+
+    def _descubrir(self, c):
+        L, R, U, D, C, S = self.L, self.R, self.U, self.D, self.C, self.S
+        i = U[c]
+        while i != c:
+            j = L[i]
+            while j != i:
+                S[C[j]] += 1
+                U[D[j]] = j
+                D[U[j]] = j
+                j = L[j]
+            i = U[i]
+        R[L[c]] = c
+        L[R[c]] = c
+
+    def soluciones(self):
+        """Generador de soluciones: cada una es un dict {(fila, col): num} en el orden en que se eligió."""
+        if self.valido:
+            yield from self._buscar()
+
+    def _buscar(self):
+        # Búsqueda en profundidad con una pila explícita de (columna elegida, fila que se prueba)
+        L, R, D, C, S = self.L, self.R, self.D, self.C, self.S
+        fila_de, columna_de = self.geometria.fila_de, self.geometria.columna_de
+        fila_de_nodo = self.fila_de_nodo
+        instr = self.instrumentacion
+        parcial = self.parcial
+        pila = []
+        while True:
+            # Entramos a un nodo
+            if instr is not None:
+                instr.nodo(len(parcial))
+            if R[0] == 0:
+                camino = {}
+                for nodo in parcial:
+                    i, num = fila_de_nodo[nodo]
+                    camino[(fila_de[i], columna_de[i])] = num
+                self.solucion = camino
+                yield camino
+            else:
+                # Columna con menos opciones
+                c = R[0]
+                mejor, menor = c, S[c]
+                while c != 0 and menor > 1:
+                    if S[c] < menor:
+                        mejor, menor = c, S[c]
+                    c = R[c]
+                if menor == 0:
+                    if instr is not None:
+                        instr.poda("columna_vacia", len(parcial))
+                else:
+                    self._cubrir(mejor)
+                    pila.append([mejor, mejor])
+
+            # Próxima fila del marco de arriba; si se agotaron, se vuelve al marco anterior
+            while pila:
+                marco = pila[-1]
+                mejor, r = marco
+                if r != mejor:
+                    j = L[r]
+                    while j != r:
+                        self._descubrir(C[j])
+                        j = L[j]
+                    parcial.pop()
+                    self.pasos_atras += 1
+                    if instr is not None:
+                        i, num = fila_de_nodo[r]
+                        instr.retroceso(fila_de[i], columna_de[i], num, len(parcial))
+                r = marco[1] = D[r]
+                if r != mejor:
+                    parcial.append(r)
+                    j = R[r]
+                    while j != r:
+                        self._cubrir(C[j])
+                        j = R[j]
+                    self.nodos_explorados += 1
+                    if instr is not None:
+                        i, num = fila_de_nodo[r]
+                        instr.asignacion(fila_de[i], columna_de[i], num, len(parcial))
+                    break
+                self._descubrir(mejor)
+                pila.pop()
+            else:
+                return
+
+
+# Resolver el tablero con Dancing Links (modo "primera solución")
+def resolver_dlx(tablero):
+    resuelto, dlx = ejecutar_dlx(tablero)
+    _sincronizar_globales(dlx)
+    return resuelto
+
+def ejecutar_dlx(tablero, instrumentacion=None):
+    dlx = DancingLinks(tablero, instrumentacion)
+    camino = next(dlx.soluciones(), None)
+    if camino is not None:
+        for (fila, col), num in camino.items():
+            tablero[fila][col] = num
+    return camino is not None, dlx
+
+def contar_soluciones_dlx(tablero, limite=None, limites=None):
+    """
+    Cuenta las soluciones del tablero, deteniéndose al llegar a limite (None: todas).
+    Devuelve None si se agotan los limites de la búsqueda.
+    """
+    observador = None if limites is None else limites.observar()
+    try:
+        return sum(1 for _ in itertools.islice(DancingLinks(tablero, observador).soluciones(), limite))
+    except BusquedaInterrumpida:
+        return None
+
+def enumerar_soluciones_dlx(tablero, limites=None):
+    """
+    Genera cada solución del tablero como un tablero completo nuevo (no modifica el original).
+    Si se agotan los limites se lanza BusquedaInterrumpida.
+    """
+    observador = None if limites is None else limites.observar()
+    for camino in DancingLinks(tablero, observador).soluciones():
+        solucion = copiar_tablero(tablero)
+        for (fila, col), num in camino.items():
+            solucion[fila][col] = num
+        yield solucion
+
+# ========================
+# Caché por forma canónica
+# ========================
+
+def forma_canonica(tablero):
+    """
+    Forma canónica de un tablero bajo las simetrías del Sudoku: trasponer, permutar bandas
+    y pilas, filas dentro de una banda, columnas dentro de una pila y renombrar los dígitos.
+    Es la menor (por filas, con los dígitos numerados por orden de aparición y el 0 primero)
+    de todas las versiones del tablero, así que dos tableros equivalentes dan la misma.
+    Devuelve (forma en bytes, transformación) para poder deshacerla con desde_canonica().
+    """
+    n = len(tablero)
+    lado = math.isqrt(n)
+    orientaciones = ([list(fila) for fila in tablero], [list(columna) for columna in zip(*tablero)])
+
+    # Primera fila: sus dígitos son distintos, así que renombrados solo importa dónde
+    # quedan los ceros, y lo menor es ponerlos lo más adelante posible
+    mejor, elegidas = None, []
+    for t, filas in enumerate(orientaciones):
+        for r in range(n):
+            patron = sorted((sum(1 for c in range(p * lado, (p + 1) * lado) if filas[r][c] == 0)
+                             for p in range(lado)), reverse=True)
+            if mejor is None or patron > mejor:
+                mejor, elegidas = patron, [(t, r)]
+            elif patron == mejor:
+                elegidas.append((t, r))
+    candidatos = []
+    for t, r in elegidas:
+        fila = orientaciones[t][r]
+        for columnas in _columnas_minimas(fila, lado):
+            renombre = {}
+            for c in columnas:
+                if fila[c]:
+                    renombre[fila[c]] = len(renombre) + 1
+            candidatos.append((t, (r,), columnas, renombre))
+
+    # Resto de las filas: se conservan solo las elecciones empatadas con la menor fila
+    for k in range(1, n):
+        mejor, siguientes, vistos = None, [], set()
+        for t, usadas, columnas, renombre in candidatos:
+            if k % lado == 0:
+                bandas = {u // lado for u in usadas}
+                opciones = [r for r in range(n) if r // lado not in bandas]
+            else:
+                banda = usadas[-1] // lado
+                opciones = [r for r in range(banda * lado, (banda + 1) * lado) if r not in usadas]
+            for r in opciones:
+                fila = orientaciones[t][r]
+                nuevos = {}
+                valores = []
+                for c in columnas:
+                    v = fila[c]
+                    if v:
+                        etiqueta = renombre.get(v) or nuevos.get(v)
+                        if etiqueta is None:
+                            etiqueta = nuevos[v] = len(renombre) + len(nuevos) + 1
+                        v = etiqueta
+                    valores.append(v)
+                if mejor is None or valores < mejor:
+                    mejor, siguientes, vistos = valores, [], set()
+                elif valores > mejor:
+                    continue
+                combinado = {**renombre, **nuevos} if nuevos else renombre
+                # Dos elecciones con las mismas filas usadas, columnas y renombre tienen el mismo futuro
+                clave = (t, frozenset(usadas) | {r}, columnas, tuple(sorted(combinado.items())))
+                if clave not in vistos:
+                    vistos.add(clave)
+                    siguientes.append((t, usadas + (r,), columnas, combinado))
+        candidatos = siguientes
+
+    t, filas, columnas, renombre = candidatos[0]
+    # Los dígitos que no aparecen reciben las etiquetas que sobran, en orden
+    faltantes = [d for d in range(1, n + 1) if d not in renombre]
+    libres = sorted(set(range(1, n + 1)) - set(renombre.values()))
+    renombre.update(zip(faltantes, libres))
+    transformacion = (bool(t), filas, columnas, tuple([0] + [renombre[d] for d in range(1, n + 1)]))
+    return aplicar_transformacion(tablero, transformacion), transformacion
+
+def _columnas_minimas(fila, lado):
+    """Órdenes de columnas que dejan los ceros de la fila lo más adelante posible."""
+    pilas_por_ceros = collections.defaultdict(list)
+    internos = []
+    for p in range(lado):
+        columnas = range(p * lado, (p + 1) * lado)
+        ceros = [c for c in columnas if fila[c] == 0]
+        llenas = [c for c in columnas if fila[c] != 0]
+        pilas_por_ceros[len(ceros)].append(p)
+        internos.append([a + b for a in itertools.permutations(ceros) for b in itertools.permutations(llenas)])
+    grupos = [list(itertools.permutations(pilas_por_ceros[z])) for z in sorted(pilas_por_ceros, reverse=True)]
+    for orden in itertools.product(*grupos):
+        pilas = [p for grupo in orden for p in grupo]
+        for partes in itertools.product(*(internos[p] for p in pilas)):
+            yield tuple(c for parte in partes for c in parte)
+
+def aplicar_transformacion(tablero, transformacion):
+    """Lleva un tablero (o su solución) a la orientación canónica; devuelve las n² celdas en bytes."""
+    traspuesta, filas, columnas, renombre = transformacion
+    if traspuesta:
+        tablero = list(zip(*tablero))
+    return bytes(renombre[tablero[r][c]] for r in filas for c in columnas)
+
+def transformacion_aleatoria(n=9, rng=random):
+    """Una transformación al azar, en el formato de aplicar_transformacion, que convierte un tablero válido en otro válido."""
+    lado = math.isqrt(n)
+    def orden():
+        # Bandas (o pilas) en orden aleatorio y, dentro de cada una, sus líneas también
+        return tuple(banda * lado + linea for banda in rng.sample(range(lado), lado)
+                     for linea in rng.sample(range(lado), lado))
+    renombre = (0,) + tuple(rng.sample(range(1, n + 1), n))
+    return rng.random() < 0.5, orden(), orden(), renombre
+
+def desde_canonica(celdas, transformacion):
+    """Deshace aplicar_transformacion: de las celdas canónicas a una lista de listas como el original."""
+    traspuesta, filas, columnas, renombre = transformacion
+    n = len(filas)
+    inverso = [0] * (n + 1)
+    for digito, etiqueta in enumerate(renombre):
+        inverso[etiqueta] = digito
+    tablero = crear_tablero_sudoku_vacio(n)
+    for i, r in enumerate(filas):
+        for j, c in enumerate(columnas):
+            tablero[r][c] = inverso[celdas[i * n + j]]
+    if traspuesta:
+        tablero = [list(columna) for columna in zip(*tablero)]
+    return tablero
+
+def _celdas_de(tablero):
+    """Las celdas de un tablero (lista de listas o Tablero) en bytes, por filas."""
+    if isinstance(tablero, Tablero):
+        return bytes(tablero.celdas)
+    return bytes(itertools.chain.from_iterable(tablero))
+
+
+class CacheSoluciones:
+    """
+    Caché LRU de tableros resueltos con clave en la forma canónica: un tablero que es otro
+    traspuesto, con filas o columnas permutadas o con los dígitos cambiados encuentra la
+    solución del primero, devuelta en su propia orientación. También se guarda la clave del
+    tablero tal cual, así que repetir el mismo tablero cuesta buscarlo en un dict.
+    Cada entrada guarda cuántas soluciones tiene (0, 1, 2 = más de una, o None si se sabe que
+    hay al menos una pero no se contaron) y una de ellas. Se limita por entradas y/o bytes.
+    La forma canónica solo se calcula en 9×9; en tableros más grandes se usa la clave directa.
+    Calcularla lleva de milisegundos a cientos de milisegundos (más que resolver), así que
+    no se calcula por adelantado: cada tablero guardado queda con su clave directa y un
+    invariante barato de calcular (cantidad de pistas por fila, columna, banda y pila y de
+    apariciones de cada dígito, que no cambian con las simetrías). Sólo cuando se busca un
+    tablero con el mismo invariante que alguno guardado se calculan las formas canónicas.
+    """
+    __slots__ = ("max_entradas", "max_bytes", "canonica", "entradas", "bytes_usados",
+                 "aciertos", "fallos", "desalojos", "invariantes", "pendientes", "_ultima")
+
+    def __init__(self, max_entradas=4096, max_bytes=None, canonica=True):
+        self.max_entradas = max_entradas
+        self.max_bytes = max_bytes
+        self.canonica = canonica
+        self.entradas = collections.OrderedDict()
+        self.bytes_usados = 0
+        self.aciertos = 0
+        self.fallos = 0
+        self.desalojos = 0
+        self.invariantes = collections.Counter()  # Invariante -> claves guardadas con ese invariante
+        self.pendientes = {}  # Invariante -> claves directas cuya forma canónica todavía no se calculó
+        self._ultima = None
+
+    def _usa_canonica(self, clave):
+        # Con menos de 17 pistas un 9×9 nunca tiene solución única y con todas no hay nada que
+        # resolver: ahí la búsqueda de la forma canónica cuesta más de lo que ahorra
+        return self.canonica and len(clave) == 81 and 0 < clave.count(0) <= 81 - 17
+
+    @staticmethod
+    def _invariante(clave):
+        # Igual para todos los tableros equivalentes (una forma canónica incluida)
+        ocupadas = [1 if celda else 0 for celda in clave]
+        filas = [sum(ocupadas[f * 9:f * 9 + 9]) for f in range(9)]
+        columnas = [sum(ocupadas[c::9]) for c in range(9)]
+        bandas = tuple(sorted(sum(filas[b * 3:b * 3 + 3]) for b in range(3)))
+        pilas = tuple(sorted(sum(columnas[p * 3:p * 3 + 3]) for p in range(3)))
+        lineas = (tuple(sorted(filas)), tuple(sorted(columnas)), bandas, pilas)
+        digitos = tuple(sorted(clave.count(num) for num in range(1, 10)))
+        return digitos, min(lineas, (lineas[1], lineas[0], lineas[3], lineas[2]))
+
+    def _claves(self, tablero):
+        # Clave directa, forma canónica y transformación; la última se reutiliza porque
+        # después de un fallo casi siempre viene guardar() con el mismo tablero
+        clave = _celdas_de(tablero)
+        if self._ultima is None or self._ultima[0] != clave:
+            forma, transformacion = forma_canonica(tablero)
+            self._ultima = (clave, forma, transformacion)
+        return self._ultima
+
+    def _canonizar_pendientes(self, invariante):
+        # Agrega la forma canónica de los tableros guardados con ese invariante que no la tenían
+        for clave in self.pendientes.pop(invariante, ()):
+            valor = self.entradas.get(clave)
+            if valor is None:
+                continue
+            forma, transformacion = forma_canonica([list(clave[f * 9:f * 9 + 9]) for f in range(9)])
+            if forma != clave:
+                soluciones, celdas = valor
+                if celdas is not None:
+                    celdas = aplicar_transformacion([celdas[f * 9:f * 9 + 9] for f in range(9)], transformacion)
+                self._insertar(forma, (soluciones, celdas))
+
+    def buscar(self, tablero):
+        """
+        Devuelve (soluciones, solución) si el tablero o uno equivalente está guardado, o None.
+        La solución es una lista de listas en la orientación y los dígitos del tablero pedido.
+        """
+        entradas = self.entradas
+        n = len(tablero)
+        clave = _celdas_de(tablero)
+        valor = entradas.get(clave)
+        if valor is not None:
+            entradas.move_to_end(clave)
+            self.aciertos += 1
+            soluciones, celdas = valor
+            if celdas is None:
+                return soluciones, None
+            return soluciones, [list(celdas[f * n:(f + 1) * n]) for f in range(n)]
+
+        # Sin ningún tablero guardado con el mismo invariante no hay equivalentes: no hace
+        # falta calcular la forma canónica
+        if not self._usa_canonica(clave):
+            self.fallos += 1
+            return None
+        invariante = self._invariante(clave)
+        if not self.invariantes[invariante]:
+            self.fallos += 1
+            return None
+        self._canonizar_pendientes(invariante)
+        _, forma, transformacion = self._claves(tablero)
+        valor = entradas.get(forma)
+        if valor is None:
+            self.fallos += 1
+            return None
+        entradas.move_to_end(forma)
+        self.aciertos += 1
+        soluciones, celdas = valor
+        solucion = None if celdas is None else desde_canonica(celdas, transformacion)
+        self._insertar(clave, (soluciones, None if solucion is None else _celdas_de(solucion)))
+        return soluciones, solucion
+
+    def guardar(self, tablero, soluciones, solucion=None):
+        """Guarda cuántas soluciones tiene el tablero y una de ellas (lista de listas, Tablero o None)."""
+        clave = _celdas_de(tablero)
+        self._insertar(clave, (soluciones, None if solucion is None else _celdas_de(solucion)))
+        if not self._usa_canonica(clave):
+            return
+        if self._ultima is not None and self._ultima[0] == clave:
+            # La forma canónica ya se calculó al buscarlo
+            _, forma, transformacion = self._ultima
+            if forma != clave:
+                celdas = None if solucion is None else aplicar_transformacion(solucion, transformacion)
+                self._insertar(forma, (soluciones, celdas))
+        else:
+            self.pendientes.setdefault(self._invariante(clave), set()).add(clave)
+
+    @staticmethod
+    def _tamano(clave, valor):
+        tamano = sys.getsizeof(clave) + sys.getsizeof(valor)
+        if valor[1] is not None:
+            tamano += sys.getsizeof(valor[1])
+        return tamano
+
+    def _insertar(self, clave, valor):
+        entradas = self.entradas
+        previo = entradas.pop(clave, None)
+        if previo is not None:
+            self.bytes_usados -= self._tamano(clave, previo)
+        elif self._usa_canonica(clave):
+            self.invariantes[self._invariante(clave)] += 1
+        entradas[clave] = valor
+        self.bytes_usados += self._tamano(clave, valor)
+        while entradas and ((self.max_entradas is not None and len(entradas) > self.max_entradas)
+                            or (self.max_bytes is not None and self.bytes_usados > self.max_bytes)):
+            vieja, valor_viejo = entradas.popitem(last=False)
+            self.bytes_usados -= self._tamano(vieja, valor_viejo)
+            self.desalojos += 1
+            if self._usa_canonica(vieja):
+                invariante = self._invariante(vieja)
+                self.invariantes[invariante] -= 1
+                if not self.invariantes[invariante]:
+                    del self.invariantes[invariante]
+                self.pendientes.get(invariante, set()).discard(vieja)
+
+    def limpiar(self):
+        """Vacía la caché y pone las estadísticas en cero."""
+        self.entradas.clear()
+        self.bytes_usados = 0
+        self.aciertos = self.fallos = self.desalojos = 0
+        self.invariantes.clear()
+        self.pendientes.clear()
+        self._ultima = None
+
+    def estadisticas(self):
+        consultas = self.aciertos + self.fallos
+        return {
+            "aciertos": self.aciertos,
+            "fallos": self.fallos,
+            "desalojos": self.desalojos,
+            "entradas": len(self.entradas),
+            "bytes": self.bytes_usados,
+            "tasa_aciertos": self.aciertos / consultas if consultas else 0.0,
+        }
+
+# Caché compartida por el juego (resolver_tablero_juego y eliminar_valores)
+CACHE_SOLUCIONES = CacheSoluciones()
+
+# ========================
+# Estado de la partida
+# ========================
+
+class PartidaSudoku:
+    """
+    Estado de una partida interactiva, sin variables globales (se pueden tener muchas a la
+    vez, por ejemplo una por sesión). Lleva cuántas veces aparece cada número en cada fila,
+    columna y bloque, así que cada jugada actualiza las repeticiones y los conflictos en O(1)
+    y saber si el tablero está resuelto también es O(1). Las celdas editables están en un
+    conjunto. Guarda el historial para deshacer y rehacer, y da pistas con la solución de
+    la caché (o la calcula una vez con DLX y la guarda).
+    """
+    __slots__ = ("tablero", "original", "n", "geometria", "editables", "conteos", "repetidos", "vacias",
+                 "historial", "rehechos", "cache", "_solucion")
+
+    def __init__(self, tablero, editables=None, solucion=None, cache=None):
+        self.tablero = tablero
+        self.original = copiar_tablero(tablero)
+        self.n = n = len(tablero)
+        self.geometria = geo = geometria(n)
+        self.editables = set(celdas_vacias_de(tablero) if editables is None else editables)
+        # conteos[unidad][num]: filas 0..n-1, columnas n..2n-1 y bloques 2n..3n-1, como geo.unidades
+        self.conteos = [[0] * (n + 1) for _ in range(3 * n)]
+        self.repetidos = 0  # Pares (unidad, número) con el número más de una vez
+        self.vacias = 0
+        for fila in range(n):
+            for col in range(n):
+                if tablero[fila][col] == 0:
+                    self.vacias += 1
+                else:
+                    self._sumar(fila, col, tablero[fila][col], 1)
+        self.historial = []  # (fila, col, valor anterior, valor nuevo)
+        self.rehechos = []
+        self.cache = cache
+        self._solucion = solucion
+
+    def _unidades(self, fila, col):
+        n = self.n
+        return fila, n + col, 2 * n + self.geometria.caja_de[fila * n + col]
+
+    def _sumar(self, fila, col, valor, delta):
+        # Actualiza los conteos de las tres unidades de la celda y la cantidad de repetidos
+        for unidad in self._unidades(fila, col):
+            conteos = self.conteos[unidad]
+            antes = conteos[valor]
+            conteos[valor] = antes + delta
+            if delta > 0 and antes == 1:
+                self.repetidos += 1
+            elif delta < 0 and antes == 2:
+                self.repetidos -= 1
+
+    def es_editable(self, fila, col):
+        return (fila, col) in self.editables
+
+    def conflictos(self, fila, col):
+        """Unidades ('fila', 'columna', 'bloque') donde el número de la celda se repite."""
+        valor = self.tablero[fila][col]
+        if valor == 0:
+            return []
+        return [nombre for nombre, unidad in zip(("fila", "columna", "bloque"), self._unidades(fila, col))
+                if self.conteos[unidad][valor] > 1]
+
+    def celdas_en_conflicto(self):
+        """Todas las celdas cuyo número se repite en alguna de sus unidades (para resaltarlas)."""
+        n, tablero = self.n, self.tablero
+        return {(fila, col) for fila in range(n) for col in range(n) if tablero[fila][col] and self.conflictos(fila, col)}
+
+    def jugar(self, fila, col, valor):
+        """
+        Pone valor (0 para borrar) en una celda editable y devuelve sus conflictos.
+        Lanza ValueError si la celda no es editable o el valor está fuera de rango.
+        """
+        if not (0 <= fila < self.n and 0 <= col < self.n and 0 <= valor <= self.n):
+            raise ValueError("Coordenadas o valor fuera de rango")
+        if (fila, col) not in self.editables:
+            raise ValueError("La celda es una pista original")
+        anterior = self.tablero[fila][col]
+        self._cambiar(fila, col, valor)
+        self.historial.append((fila, col, anterior, valor))
+        self.rehechos.clear()
+        return self.conflictos(fila, col)
+
+    def _cambiar(self, fila, col, valor):
+        anterior = self.tablero[fila][col]
+        if anterior:
+            self._sumar(fila, col, anterior, -1)
+        else:
+            self.vacias -= 1
+        if valor:
+            self._sumar(fila, col, valor, 1)
+        else:
+            self.vacias += 1
+        self.tablero[fila][col] = valor
+
+    def deshacer(self):
+        """Deshace la última jugada; devuelve la celda (fila, col) o None si no hay nada para deshacer."""
+        if not self.historial:
+            return None
+        fila, col, anterior, valor = self.historial.pop()
+        self._cambiar(fila, col, anterior)
+        self.rehechos.append((fila, col, anterior, valor))
+        return fila, col
+
+    def rehacer(self):
+        """Rehace la última jugada deshecha; devuelve la celda (fila, col) o None."""
+        if not self.rehechos:
+            return None
+        fila, col, anterior, valor = self.rehechos.pop()
+        self._cambiar(fila, col, valor)
+        self.historial.append((fila, col, anterior, valor))
+        return fila, col
+
+    def resuelto(self):
+        """True si el tablero está completo y sin repetidos (lo mismo que es_valido_sudoku, en O(1))."""
+        return self.vacias == 0 and self.repetidos == 0
+
+    def solucion(self):
+        """La solución del tablero original (lista de listas), o None si no tiene."""
+        if self._solucion is None:
+            guardado = None if self.cache is None else self.cache.buscar(self.original)
+            if guardado is not None and guardado[1] is not None:
+                self._solucion = guardado[1]
+            else:
+                self._solucion = next(enumerar_soluciones_dlx(self.original), None)
+                if self.cache is not None:
+                    self.cache.guardar(self.original, None if self._solucion else 0, self._solucion)
+        return self._solucion
+
+    def pista(self):
+        """
+        (fila, col, valor) para la próxima jugada: primero corrige una celda con un número
+        equivocado y, si no hay, llena la celda vacía con menos opciones. None si no hay qué sugerir.
+        """
+        solucion = self.solucion()
+        if solucion is None:
+            return None
+        tablero = self.tablero
+        mejor, menor = None, self.n + 1
+        for fila, col in sorted(self.editables):
+            valor = tablero[fila][col]
+            if valor and valor != solucion[fila][col]:
+                return fila, col, solucion[fila][col]
+            if valor == 0:
+                unidades = [self.conteos[unidad] for unidad in self._unidades(fila, col)]
+                opciones = sum(1 for num in range(1, self.n + 1) if not any(conteos[num] for conteos in unidades))
+                if opciones < menor:
+                    mejor, menor = (fila, col, solucion[fila][col]), opciones
+        return mejor
+
 # ========================
 # Funciones del Juego
 # ========================
@@ -373,59 +2913,174 @@ def seleccionar_algoritmo():
     print("\nSeleccione el algoritmo de resolución:")
     print("1 - Backtracking puro")
     print("2 - Branch & Bound")
+    print("3 - Dancing Links (Algoritmo X)")
     while True:
         try:
             algoritmo = int(input("Ingrese el número del algoritmo deseado: "))
-            if algoritmo in [1, 2]:
+            if algoritmo in [1, 2, 3]:
                 return algoritmo
             else:
                 print("Opción inválida, intente nuevamente.")
         except ValueError:
             print("Entrada no válida. Por favor, ingrese un número.")
 
-def seleccionar_dificultad():
-    """Solicita al jugador que seleccione la dificultad del juego."""
+def seleccionar_propagacion():
+    """Pregunta si se quiere propagar restricciones antes de ramificar y devuelve el Propagador (o None)."""
+    respuesta = input("¿Usar propagación de restricciones (singles, bloqueo, pares y triples)? (s/n): ").strip().lower()
+    return Propagador() if respuesta == 's' else None
+
+def seleccionar_tamano():
+    """Solicita al jugador el tamaño del tablero (9x9, 16x16 o 25x25)."""
+    while True:
+        try:
+            n = int(input("Seleccione el tamaño del tablero (9, 16 o 25): "))
+            if n in [9, 16, 25]:
+                return n
+            else:
+                print("Opción inválida, intente nuevamente.")
+        except ValueError:
+            print("Entrada no válida. Por favor, ingrese un número.")
+
+def seleccionar_nivel_dificultad():
+    """Solicita al jugador el nivel de dificultad (1: Fácil, 2: Normal, 3: Difícil)."""
     while True:
         try:
             dificultad = int(input("Seleccione dificultad (1: Fácil, 2: Normal, 3: Difícil): "))
             if dificultad in [1, 2, 3]:
-                return [random.randint(31, 41), random.randint(41, 51), random.randint(51, 63)][dificultad - 1]
+                return dificultad
             else:
                 print("Opción inválida, intente nuevamente.")
         except ValueError:
             print("Entrada no válida. Por favor, ingrese un número.")
 
+def seleccionar_dificultad(n=9):
+    """
+    Solicita al jugador que seleccione la dificultad del juego y devuelve cuántas celdas quitar.
+    Los modos de juego piden el nivel con seleccionar_nivel_dificultad (el banco se indexa por
+    nivel); esta función se mantiene para quien use el módulo como antes.
+    """
+    return celdas_para_dificultad(seleccionar_nivel_dificultad(), n=n)
+
+def seleccionar_banco(n):
+    """Si hay un banco de tableros de n×n, pregunta si sacar el tablero de ahí en lugar de generarlo."""
+    if not os.path.exists(ARCHIVO_BANCO):
+        return None
+    try:
+        banco = BancoTableros(ARCHIVO_BANCO)
+    except ValueError:
+        return None
+    if banco.n == n and len(banco):
+        usar = input("¿Sacar el tablero del banco para empezar al instante? (s/n): ").strip().lower()
+        if usar == 's':
+            return banco
+    banco.cerrar()
+    return None
+
+def tablero_desde_banco(banco, dificultad, rng=random):
+    """
+    Sortea un tablero del banco y, como eliminar_valores, deja sus celdas vacías en
+    CELDAS_JUGABLES y lo guarda en la caché con su solución.
+    Devuelve (tablero jugable, solución).
+    """
+    global CELDAS_JUGABLES
+    tablero, solucion, _, _ = banco.sortear(dificultad, rng)
+    CELDAS_JUGABLES = celdas_vacias_de(tablero)
+    CACHE_SOLUCIONES.guardar(tablero, 1, solucion)
+    return tablero, solucion
+
+def tablero_calificado(dificultad, n=9):
+    """
+    Genera con generar_tablero_calificado un tablero cuya calificación corresponde a la
+    dificultad y, como eliminar_valores, deja sus celdas vacías en CELDAS_JUGABLES y lo
+    guarda en la caché con su solución. Devuelve (tablero jugable, calificación).
+    """
+    global CELDAS_JUGABLES
+    tablero, solucion, CELDAS_JUGABLES, calificacion = generar_tablero_calificado(dificultad, n=n)
+    CACHE_SOLUCIONES.guardar(tablero, 1, solucion)
+    return tablero, calificacion
+
+def imprimir_calificacion(calificacion):
+    tecnica = calificacion.tecnica_maxima or "ninguna"
+    detalle = f", con búsqueda: {calificacion.nodos_explorados} nodos y {calificacion.pasos_atras} retrocesos" if calificacion.busqueda else ""
+    print(f"Calificación: {calificacion.puntaje} puntos (técnica más difícil: {tecnica}{detalle})")
+
+# Cantidad de celdas a eliminar según la dificultad (1: Fácil, 2: Normal, 3: Difícil)
+# Los rangos son para 9x9; en otros tamaños se escalan a la misma proporción de celdas
+RANGOS_DIFICULTAD = {1: (31, 41), 2: (41, 51), 3: (51, 63)}
+
+def celdas_para_dificultad(dificultad, rng=random, n=9):
+    minimo, maximo = RANGOS_DIFICULTAD[dificultad]
+    if n != 9:
+        minimo, maximo = minimo * n * n // 81, maximo * n * n // 81
+    return rng.randint(minimo, maximo)
+
 # Modo de juego: PC crea y resuelve
-def modo_pc_crea_y_resuelve(algoritmo):
-    inicio = time.time()  # Tiempo de inicio
-    tablero_completo = generar_tablero_completo()
-    celdas_a_eliminar = seleccionar_dificultad()
-    # Eliminar algunas celdas para permitir jugar según la dificultad respetando la Unicidad resolutiva
+# Segundos que el menú espera en 16×16 y 25×25 para quitar pistas y para resolver
+SEGUNDOS_TABLERO_GRANDE = 30
+
+def _limites_menu(n):
+    # En 9×9 todo termina en milisegundos y se sigue sin límites
+    return Limites(SEGUNDOS_TABLERO_GRANDE) if n > 9 else None
+
+def modo_pc_crea_y_resuelve(algoritmo, propagador=None, n=9, banco=None):
+    dificultad = seleccionar_nivel_dificultad()
     inicio = time.time()  # Tiempo de inicio
-    tablero_jugable = eliminar_valores(tablero_completo, celdas_a_eliminar)
+    calificacion = None
+    if banco is not None and banco.cantidad(dificultad):
+        # El tablero ya está generado: no hay que esperar la fase de unicidad
+        tablero_jugable, _ = tablero_desde_banco(banco, dificultad)
+    elif n == 9:
+        # Se generan candidatos hasta que la calificación corresponde a la dificultad
+        tablero_jugable, calificacion = tablero_calificado(dificultad)
+    else:
+        tablero_completo = generar_tablero_completo(n=n)
+        celdas_a_eliminar = celdas_para_dificultad(dificultad, n=n)
+        # Eliminar algunas celdas para permitir jugar según la dificultad respetando la Unicidad resolutiva
+        inicio = time.time()  # Tiempo de inicio
+        # Si se acaba el tiempo queda un tablero con más pistas, pero con solución única
+        tablero_jugable = eliminar_valores(tablero_completo, celdas_a_eliminar, _limites_menu(n))
     fin = time.time()  # Tiempo de fin
     print(f"\nTiempo en el que se creó el tablero: {fin - inicio:.4f} segundos")
-    imprimir_tablero(tablero_completo)
+    if calificacion is not None:
+        imprimir_calificacion(calificacion)
+    imprimir_tablero(tablero_jugable)
      # Medir el tiempo de resolución del tablero
     inicio = time.time()  # Tiempo de inicio
-    resolver_tablero_juego(tablero_jugable, algoritmo)
+    # Este modo muestra el trabajo del algoritmo, así que no toma la solución de la caché
+    resuelto = resolver_tablero_juego(tablero_jugable, algoritmo, propagador=propagador, limites=_limites_menu(n),
+                                      usar_cache=False)
     fin = time.time()  # Tiempo de fin
+    if resuelto is None:
+        print(f"\nEl algoritmo no terminó en {SEGUNDOS_TABLERO_GRANDE} segundos; pruebe con Dancing Links.")
+        return
 
     # Imprimir el tiempo que tardó en resolver el tablero
     print(f"\nTiempo para resolver el tablero: {fin - inicio:.4f} segundos con {PASOS_ATRAS} retrocesos en su resolución")
     print(f"\nSe han explorado {NODOS_EXPLORADOS} NODOS para llegar a la solucion")
+    if propagador is not None:
+        print("Propagación (celdas colocadas sin ramificar / opciones descartadas):")
+        for tecnica, (colocaciones, eliminaciones) in ESTADISTICAS_PROPAGACION.items():
+            print(f"  {tecnica}: {colocaciones} / {eliminaciones}")
     camino = " ---> ".join([f"({fila}, {col}): {valor}" for (fila, col), valor in SOLUCION.items()])
     print("Camino de solución:\n" + camino)
     imprimir_tablero(tablero_jugable)
 
 
 # Modo de juego: PC crea tablero, jugador resuelve
-def modo_pc_crea_jugador_resuelve(algoritmo):
-    tablero_completo = generar_tablero_completo()
-    celdas_a_eliminar = seleccionar_dificultad()
-    tablero_jugable = eliminar_valores(tablero_completo, celdas_a_eliminar)
-    tablero_jugable_PC = copy.deepcopy(tablero_jugable)
-    imprimir_tablero(tablero_jugable)
+def modo_pc_crea_jugador_resuelve(algoritmo, propagador=None, n=9, banco=None):
+    dificultad = seleccionar_nivel_dificultad()
+    if banco is not None and banco.cantidad(dificultad):
+        tablero_jugable, _ = tablero_desde_banco(banco, dificultad)
+    elif n == 9:
+        tablero_jugable, _ = tablero_calificado(dificultad)
+    else:
+        tablero_completo = generar_tablero_completo(n=n)
+        celdas_a_eliminar = celdas_para_dificultad(dificultad, n=n)
+        tablero_jugable = eliminar_valores(tablero_completo, celdas_a_eliminar, _limites_menu(n))
+    tablero_jugable_PC = copiar_tablero(tablero_jugable)
+    # Conteos por fila, columna y bloque: cada jugada se valida al instante
+    partida = PartidaSudoku(tablero_jugable, CELDAS_JUGABLES, cache=CACHE_SOLUCIONES)
+    imprimir_tablero(tablero_jugable, partida.editables)
     print("\nEs tu turno de resolver el tablero. ¡Buena suerte!")
 
     # Bandera para controlar la primera iteración
@@ -435,34 +3090,56 @@ def modo_pc_crea_jugador_resuelve(algoritmo):
     while True:
         # Solo pregunta si desea terminar después de la primera iteración
         if not primera_iteracion:
-            terminar = input("¿Deseas seguir ingresando números o dejar que la computadora complete el tablero? (ingresa 's' para seguir, 'entregar' para terminar, 'pc' para que la PC lo complete): ").strip().lower()
+            terminar = input("¿Deseas seguir ingresando números o dejar que la computadora complete el tablero? (ingresa 's' para seguir, 'deshacer', 'rehacer', 'pista', 'entregar' para terminar, 'pc' para que la PC lo complete): ").strip().lower()
             
             if terminar == 'entregar':
-                if es_valido_sudoku(tablero_jugable):
+                if partida.resuelto():
                     print("\n¡Felicidades! El tablero está completo y tiene solución.")
                 else:
                     print("\nEl tablero esta incompleto o es inválido :( .")
                 print("\nTablero finalizado por el jugador:")
-                imprimir_tablero(tablero_jugable)
+                imprimir_tablero(tablero_jugable, partida.editables, partida.celdas_en_conflicto())
                 break
+            elif terminar in ('deshacer', 'rehacer'):
+                celda = partida.deshacer() if terminar == 'deshacer' else partida.rehacer()
+                if celda is None:
+                    print(f"No hay jugadas para {terminar}.")
+                else:
+                    print("\nTablero actualizado:")
+                    imprimir_tablero(tablero_jugable, partida.editables, partida.celdas_en_conflicto())
+                continue
+            elif terminar == 'pista':
+                pista = partida.pista()
+                if pista is None:
+                    print("No hay pistas para dar.")
+                else:
+                    fila, columna, valor = pista
+                    print(f"Pista: en la fila {fila + 1}, columna {columna + 1} va un {valor}.")
+                continue
             elif terminar == 'pc':
                 print("\nLa computadora resolverá el tablero usando el algoritmo seleccionado...")
-                resolver_tablero_juego(tablero_jugable_PC, algoritmo)
+                if resolver_tablero_juego(tablero_jugable_PC, algoritmo, propagador=propagador,
+                                          limites=_limites_menu(n)) is None:
+                    print(f"El algoritmo no terminó en {SEGUNDOS_TABLERO_GRANDE} segundos; pruebe con Dancing Links.")
+                    continue
                 imprimir_tablero(tablero_jugable_PC)
+                estadisticas = CACHE_SOLUCIONES.estadisticas()
+                print(f"Caché de soluciones: {estadisticas['aciertos']} aciertos, {estadisticas['fallos']} fallos, "
+                      f"{estadisticas['desalojos']} desalojos")
                 break
 
         # Solicita la fila, columna y valor del usuario
         try:
-            fila = int(input("Ingresa la fila (1-9): ")) - 1
-            columna = int(input("Ingresa la columna (1-9): ")) - 1
-            valor = int(input("Ingresa el valor (1-9): "))
-            if not es_modificable((fila,columna), CELDAS_JUGABLES):
-                print("No podes alterar una celda Original!! Proba con otra")
-                continue
+            fila = int(input(f"Ingresa la fila (1-{n}): ")) - 1
+            columna = int(input(f"Ingresa la columna (1-{n}): ")) - 1
+            valor = int(input(f"Ingresa el valor (1-{n}): "))
             # Verifica que las coordenadas estén dentro de los límites
-            if not (0 <= fila < 9 and 0 <= columna < 9 and 1 <= valor <= 9):
+            if not (0 <= fila < n and 0 <= columna < n and 1 <= valor <= n):
                 print("Coordenadas o valor fuera de rango. Inténtalo de nuevo.")
                 continue
+            if not partida.es_editable(fila, columna):
+                print("No podes alterar una celda Original!! Proba con otra")
+                continue
 
             # Verifica si la celda ya tiene un valor
             if tablero_jugable[fila][columna] != 0:
@@ -471,10 +3148,12 @@ def modo_pc_crea_jugador_resuelve(algoritmo):
                     print("Ingresa otro número.")
                     continue
             
-            # Coloca el valor en el tablero
-            tablero_jugable[fila][columna] = valor
+            # Coloca el valor en el tablero y avisa si se repite
+            conflictos = partida.jugar(fila, columna, valor)
             print("\nTablero actualizado:")
-            imprimir_tablero(tablero_jugable)
+            imprimir_tablero(tablero_jugable, partida.editables, partida.celdas_en_conflicto())
+            if conflictos:
+                print(f"Atención: el {valor} se repite en: {', '.join(conflictos)}.")
 
             # Desactiva la bandera de la primera iteración después de la primera interacción
             primera_iteracion = False
@@ -521,23 +3200,24 @@ def generar_pruebas_rendimiento():
         tablero_original = generar_tablero_completo()
         # Prueba con diferentes números de celdas eliminadas
         for celdas_eliminadas in [20, 30, 40, 50, 60]:
-            tablero_prueba = copy.deepcopy(tablero_original)
+            tablero_prueba = copiar_tablero(tablero_original)
             tablero_test = eliminar_valores(tablero_prueba, celdas_eliminadas)
             
             # Medir tiempo backtracking
             global NODOS_EXPLORADOS
-            tablero_bt = copy.deepcopy(tablero_test)
-            inicio_bt = time.time()
+            NODOS_EXPLORADOS = 0
+            tablero_bt = copiar_tablero(tablero_test)
+            inicio_bt = time.perf_counter()
             resolver_backtracking_puro(tablero_bt)
-            tiempo_bt = time.time()
+            tiempo_bt = time.perf_counter()
             tiempos_backtracking.append((celdas_eliminadas, (tiempo_bt-inicio_bt), NODOS_EXPLORADOS))
 
             # Medir tiempo Branch & Bound
             NODOS_EXPLORADOS = 0
-            tablero_bb = copy.deepcopy(tablero_test)
-            inicio_bb = time.time()
+            tablero_bb = copiar_tablero(tablero_test)
+            inicio_bb = time.perf_counter()
             resolver_sudoku_bb_cotas(tablero_bb)
-            tiempo_bb = time.time()
+            tiempo_bb = time.perf_counter()
             tiempos_bb.append((celdas_eliminadas, (tiempo_bb - inicio_bb), NODOS_EXPLORADOS))
             
             print(f"\nPrueba con {celdas_eliminadas} celdas eliminadas:")
@@ -545,61 +3225,79 @@ def generar_pruebas_rendimiento():
             print(f"Branch & Bound: {(tiempo_bb - inicio_bb):.4f} segundos, Nodos explorados: {tiempos_bb[-1][2]}")
             print(tablero_prueba)
 
-    # Prueba de unicidad de solución
+    # Prueba de unicidad de solución: los 65 × 5 tableros se analizan en paralelo
     print("\nAnalizando unicidad de soluciones...")
+    resultados_unicidad.update(barrido_unicidad(range(81, 16, -1), 5))
     for pistas in range(81, 16, -1):  # De más pistas a menos
-        soluciones_unicas = 0
-        for _ in range(5):  # 5 tableros por cada cantidad de pistas
-            tablero_original = generar_tablero_completo()
-            tablero_prueba = copy.deepcopy(tablero_original)
-            celdas_a_eliminar = 81 - pistas
-            tablero_test = eliminar_valores(tablero_prueba, celdas_a_eliminar)
-            
-            if tiene_solucion_unica(tablero_test):
-                soluciones_unicas += 1
-        
-        resultados_unicidad[pistas] = soluciones_unicas / 5  # Proporción de soluciones únicas
         print(f"Pistas: {pistas}, Proporción de soluciones únicas: {resultados_unicidad[pistas]:.2f}")
-        
-        # Si encontramos el punto donde todas las soluciones son únicas, podemos parar
-        if resultados_unicidad[pistas] == 1.0 and resultados_unicidad.get(pistas - 1, 0) < 1.0:
-            print(f"\nUmbral de unicidad encontrado en aproximadamente {pistas} pistas")
+    # El umbral es la menor cantidad de pistas desde la que todas las mayores dieron 1.0
+    umbral = None
+    for pistas in range(81, 16, -1):
+        if resultados_unicidad[pistas] < 1.0:
             break
+        umbral = pistas
+    if umbral is not None:
+        print(f"\nUmbral de unicidad encontrado en aproximadamente {umbral} pistas")
 
     return tiempos_backtracking, tiempos_bb, resultados_unicidad
 
-def tiene_solucion_unica(tablero):
+def tiene_solucion_unica(tablero, limites=None):
     """
     Verifica si un tablero tiene solución única contando el número de soluciones posibles.
-    Retorna True si solo hay una solución, False en caso contrario.
+    Retorna True si solo hay una solución, False en caso contrario, y None si se agotan
+    los limites antes de saberlo.
+    Cuenta sobre un BBIncremental (celdas vacías y opciones por celda se actualizan al
+    colocar y quitar), ramificando en la celda más restringida y parando en la segunda
+    solución. Las pistas se validan una sola vez, al principio.
     """
-    soluciones = [0]  # Usamos una lista para poder modificarla en la función recursiva
-    
-    def contar_soluciones(tablero):
-        if soluciones[0] > 1:  # Si ya encontramos más de una solución, no seguimos buscando
-            return
-            
-        if es_valido_sudoku(tablero, True):
-            soluciones[0] += 1
-            return
-            
-        for i in range(9):
-            for j in range(9):
-                if tablero[i][j] == 0:
-                    for num in range(1, 10):
-                        if es_valido(tablero, i, j, num):
-                            tablero[i][j] = num
-                            contar_soluciones(tablero)
-                            tablero[i][j] = 0
-                    return
-    
-    tablero_copia = copy.deepcopy(tablero)
-    contar_soluciones(tablero_copia)
-    return soluciones[0] == 1
+    if not es_valido_sudoku(tablero, False):
+        return False
+    try:
+        # Sobre una copia: si se interrumpe, el tablero no queda a medio llenar
+        return explorar_subarbol(BBIncremental(copiar_tablero(tablero)), True, 2, limites=limites)[0] == 1
+    except BusquedaInterrumpida:
+        return None
+
+def _trabajo_unicidad(trabajo):
+    # Se ejecuta en los procesos del pool: vacía 81 - pistas celdas al azar de un tablero
+    # completo, sin cuidar la unicidad, y después analiza si la solución es única.
+    pistas, indice, semilla = trabajo
+    rng = random.Random(f"{semilla}:{pistas}:{indice}")
+    tablero = generar_tablero_completo(rng)
+    for posicion in rng.sample(range(81), 81 - pistas):
+        tablero[posicion // 9][posicion % 9] = 0
+    return pistas, tiene_solucion_unica(tablero)
+
+def barrido_unicidad(cantidades_pistas, tableros_por_cantidad=5, semilla=None, procesos=None):
+    """
+    Proporción de tableros con solución única para cada cantidad de pistas, generando
+    tableros_por_cantidad tableros de cada una (vaciando celdas al azar de un tablero
+    completo) y analizándolos en un pool de procesos.
+    Devuelve {pistas: proporción}.
+    """
+    if semilla is None:
+        semilla = random.randrange(2 ** 32)
+    trabajos = [(pistas, indice, semilla) for pistas in cantidades_pistas for indice in range(tableros_por_cantidad)]
+    unicas = dict.fromkeys(cantidades_pistas, 0)
+    procesos = procesos or os.cpu_count() or 1
+    if procesos == 1:
+        for pistas, unica in map(_trabajo_unicidad, trabajos):
+            unicas[pistas] += unica
+    else:
+        with multiprocessing.Pool(procesos) as pool:
+            for pistas, unica in pool.imap_unordered(_trabajo_unicidad, trabajos, chunksize=2):
+                unicas[pistas] += unica
+    return {pistas: unicas[pistas] / tableros_por_cantidad for pistas in unicas}
+
+# Directorio por defecto para los gráficos y las series de las pruebas
+DIRECTORIO_PRUEBAS = "resultados_pruebas"
 
-def analizar_resultados(tiempos_bt, tiempos_bb, resultados_unicidad):
+def analizar_resultados(tiempos_bt, tiempos_bb, resultados_unicidad, directorio=None, formatos=("png",), graficos=True):
     """
     Analiza y muestra los resultados de las pruebas, y genera gráficos.
+    Con un directorio guarda los gráficos en los formatos pedidos (png, svg, ...) y las
+    series crudas en CSV y JSON, en lugar de abrir ventanas. Sin directorio y sin pantalla
+    se guardan en DIRECTORIO_PRUEBAS. Con graficos=False no se importa matplotlib.
     """
     print("\nResultados del análisis:")
     
@@ -640,6 +3338,16 @@ def analizar_resultados(tiempos_bt, tiempos_bb, resultados_unicidad):
         print(f"Diferencia (BB - BT): {tiempo_bb - tiempo_bt:.4f} segundos")
         print(f"Mejora porcentual: {((tiempo_bt - tiempo_bb) / tiempo_bt * 100):.2f}%")
 
+    if graficos and directorio is None and not hay_pantalla():
+        # Las ventanas no se verían: se guarda todo como en el subcomando pruebas
+        directorio = DIRECTORIO_PRUEBAS
+        print(f"\nNo hay pantalla: los gráficos y las series se guardan en {directorio}")
+    if directorio is not None:
+        guardar_series(directorio, tiempos_bt, tiempos_bb, resultados_unicidad)
+    if not graficos:
+        return
+    plt = importar_pyplot()
+
     # Crear gráfico de barras para tiempos de ejecución
     plt.figure(figsize=(12, 6))
     plt.bar([c - 0.2 for c in celdas_eliminadas], tiempos_promedio_bt, width=0.4, label='Backtracking', alpha=0.6)
@@ -649,7 +3357,7 @@ def analizar_resultados(tiempos_bt, tiempos_bb, resultados_unicidad):
     plt.title('Comparación de Tiempos de Ejecución')
     plt.xticks(celdas_eliminadas)
     plt.legend()
-    plt.show()
+    mostrar_o_guardar(plt, directorio, "tiempos", formatos)
 
     # Crear gráfico de barras para nodos explorados
     plt.figure(figsize=(12, 6))
@@ -660,7 +3368,7 @@ def analizar_resultados(tiempos_bt, tiempos_bb, resultados_unicidad):
     plt.title('Comparación de Nodos Explorados')
     plt.xticks(celdas_eliminadas)
     plt.legend()
-    plt.show()
+    mostrar_o_guardar(plt, directorio, "nodos", formatos)
 
     # Crear gráfico de líneas para unicidad de soluciones
     plt.figure(figsize=(12, 6))
@@ -671,13 +3379,1239 @@ def analizar_resultados(tiempos_bt, tiempos_bb, resultados_unicidad):
     plt.ylabel('Proporción de Soluciones Únicas')
     plt.title('Unicidad de Soluciones por Número de Pistas')
     plt.grid(True)
-    plt.show()
+    mostrar_o_guardar(plt, directorio, "unicidad", formatos)
+
+def hay_pantalla():
+    """True si se pueden abrir ventanas: fuera de Windows y macOS hace falta DISPLAY o WAYLAND_DISPLAY."""
+    if sys.platform in ("win32", "darwin"):
+        return True
+    return bool(os.environ.get("DISPLAY") or os.environ.get("WAYLAND_DISPLAY"))
+
+def importar_pyplot():
+    """
+    Importa matplotlib sólo cuando hacen falta gráficos. Sin pantalla usa el backend Agg;
+    con pantalla deja el que elija matplotlib, aunque los gráficos vayan a un directorio.
+    """
+    import matplotlib
+    if not hay_pantalla():
+        matplotlib.use("Agg")
+    import matplotlib.pyplot as plt
+    return plt
+
+def mostrar_o_guardar(plt, directorio, nombre, formatos):
+    """Muestra la figura actual en una ventana o, con directorio, la guarda en cada formato y la cierra."""
+    if directorio is None:
+        plt.show()
+        return
+    for formato in formatos:
+        ruta = os.path.join(directorio, f"{nombre}.{formato}")
+        plt.savefig(ruta, format=formato, bbox_inches="tight")
+        print(f"Gráfico guardado en {ruta}")
+    plt.close()
+
+def guardar_series(directorio, tiempos_bt, tiempos_bb, resultados_unicidad):
+    """Guarda las series crudas de las pruebas en CSV (una tabla por serie) y en un único JSON."""
+    os.makedirs(directorio, exist_ok=True)
+    with open(os.path.join(directorio, "tiempos.csv"), "w", encoding="utf-8") as archivo:
+        archivo.write("algoritmo,celdas_eliminadas,tiempo_s,nodos\n")
+        for algoritmo, serie in (("backtracking", tiempos_bt), ("branch_and_bound", tiempos_bb)):
+            for celdas, tiempo, nodos in serie:
+                archivo.write(f"{algoritmo},{celdas},{tiempo:.6f},{nodos}\n")
+    with open(os.path.join(directorio, "unicidad.csv"), "w", encoding="utf-8") as archivo:
+        archivo.write("pistas,proporcion_unicas\n")
+        for pistas in sorted(resultados_unicidad):
+            archivo.write(f"{pistas},{resultados_unicidad[pistas]}\n")
+    series = {
+        "backtracking": [{"celdas_eliminadas": c, "tiempo_s": t, "nodos": n} for c, t, n in tiempos_bt],
+        "branch_and_bound": [{"celdas_eliminadas": c, "tiempo_s": t, "nodos": n} for c, t, n in tiempos_bb],
+        "unicidad": {str(pistas): proporcion for pistas, proporcion in sorted(resultados_unicidad.items())},
+    }
+    with open(os.path.join(directorio, "series.json"), "w", encoding="utf-8") as archivo:
+        json.dump(series, archivo, indent=2)
+    print(f"Series guardadas en {directorio}")
 
 # Modificar la función de ejecución de pruebas para incluir gráficos
-def ejecutar_pruebas_completas():
+def ejecutar_pruebas_completas(directorio=None, formatos=("png",), graficos=True):
     print("Iniciando pruebas completas...")
     tiempos_bt, tiempos_bb, resultados_unicidad = generar_pruebas_rendimiento()
-    analizar_resultados(tiempos_bt, tiempos_bb, resultados_unicidad)
+    analizar_resultados(tiempos_bt, tiempos_bb, resultados_unicidad, directorio, formatos, graficos)
+
+# ========================
+# Benchmark reproducible
+# ========================
+
+# Tableros difíciles conocidos (Arto Inkala, AI Escargot, Easter Monster, top95 y uno contra el backtracking)
+CORPUS_DIFICILES = (
+    "8..........36......7..9.2...5...7.......457.....1...3...1....68..85...1..9....4..",
+    "1....7.9..3..2...8..96..5....53..9...1..8...26....4...3......1..4......7..7...3..",
+    "1.......2.9.4...5...6...7...5.9.3.......7.......85..4.7.....6...3...9.8...2.....1",
+    "4.....8.5.3..........7......2.....6.....8.4......1.......6.3.7.5..2.....1.4......",
+    "52...6.........7.13...........4..8..6......5...........418.........3..2...87.....",
+    "6.....8.3.4.7.................5.4.7.3..2.....1.6.......2.....5.....8.6......1....",
+    "48.3............71.2.......7.5....6....2..8.............1.76...3.....4......5....",
+    "..............3.85..1.2.......5.7.....4...1...9.......5......73..2.1........4...9",
+)
+
+# Configuraciones medidas: nombre -> (algoritmo, motor, propagación, ¿corre el corpus difícil?)
+ALGORITMOS_BENCHMARK = {
+    "backtracking": (1, "bitmask", False, False),
+    "backtracking_propagacion": (1, "bitmask", True, True),
+    "bb": (2, "bitmask", False, True),
+    "bb_propagacion": (2, "bitmask", True, True),
+    "dlx": (3, "bitmask", False, True),
+    "backtracking_listas": (1, "listas", False, False),
+    "bb_listas": (2, "listas", False, False),
+}
+ALGORITMOS_BENCHMARK_POR_DEFECTO = ("backtracking", "backtracking_propagacion", "bb", "bb_propagacion", "dlx")
+
+def corpus_benchmark(puzzles_por_dificultad=20, semilla=2024):
+    """Corpus fijo: {nombre: [líneas de 81 caracteres]}. Con la misma semilla siempre es el mismo."""
+    corpus = {}
+    for dificultad, nombre in ((1, "facil"), (2, "normal"), (3, "dificil")):
+        corpus[nombre] = []
+        for indice in range(puzzles_por_dificultad):
+            rng = random.Random(f"benchmark:{semilla}:{dificultad}:{indice}")
+            tablero, _, _ = generar_tablero_jugable(dificultad, rng)
+            corpus[nombre].append(tablero_a_linea(tablero))
+    corpus["muy_dificiles"] = list(CORPUS_DIFICILES)
+    return corpus
+
+def percentil(valores_ordenados, p):
+    """Percentil por rango más cercano de una lista ya ordenada."""
+    if not valores_ordenados:
+        return 0
+    rango = max(1, -(-len(valores_ordenados) * p // 100))
+    return valores_ordenados[min(rango, len(valores_ordenados)) - 1]
+
+def medir_algoritmo(lineas, algoritmo, motor, propagacion, repeticiones=5, calentamiento=1):
+    """Mide cada tablero `repeticiones` veces (tras `calentamiento` corridas descartadas) con perf_counter_ns."""
+    tiempos = []
+    nodos_totales = 0
+    tiempo_total = 0
+    for linea in lineas:
+        original = Tablero.desde_linea(linea)
+        for corrida in range(calentamiento + repeticiones):
+            tablero = original.copia()
+            propagador = Propagador() if propagacion else None
+            inicio = time.perf_counter_ns()
+            _, estado = ejecutar_algoritmo(tablero, algoritmo, motor, propagador)
+            duracion = time.perf_counter_ns() - inicio
+            if corrida >= calentamiento:
+                tiempos.append(duracion)
+                nodos_totales += estado.nodos_explorados
+                tiempo_total += duracion
+    tiempos.sort()
+    return {
+        "muestras": len(tiempos),
+        "mediana_ns": percentil(tiempos, 50),
+        "p95_ns": percentil(tiempos, 95),
+        "p99_ns": percentil(tiempos, 99),
+        "nodos_promedio": nodos_totales / len(tiempos) if tiempos else 0,
+        "nodos_por_segundo": nodos_totales * 1e9 / tiempo_total if tiempo_total else 0,
+    }
+
+def ejecutar_benchmark(algoritmos=ALGORITMOS_BENCHMARK_POR_DEFECTO, puzzles_por_dificultad=20,
+                       repeticiones=5, calentamiento=1, semilla=2024):
+    """Corre cada algoritmo sobre cada corpus y devuelve los resultados listos para guardar en JSON."""
+    corpus = corpus_benchmark(puzzles_por_dificultad, semilla)
+    huella = hashlib.sha1("\n".join(l for lineas in corpus.values() for l in lineas).encode()).hexdigest()
+    resultados = {}
+    for nombre in algoritmos:
+        algoritmo, motor, propagacion, con_dificiles = ALGORITMOS_BENCHMARK[nombre]
+        resultados[nombre] = {}
+        for nombre_corpus, lineas in corpus.items():
+            if nombre_corpus == "muy_dificiles" and not con_dificiles:
+                continue
+            print(f"Midiendo {nombre} sobre {nombre_corpus}...", file=sys.stderr)
+            resultados[nombre][nombre_corpus] = medir_algoritmo(lineas, algoritmo, motor, propagacion, repeticiones, calentamiento)
+    return {
+        "meta": {
+            "semilla": semilla,
+            "puzzles_por_dificultad": puzzles_por_dificultad,
+            "repeticiones": repeticiones,
+            "calentamiento": calentamiento,
+            "huella_corpus": huella,
+            "python": platform.python_version(),
+            "plataforma": platform.platform(),
+        },
+        "resultados": resultados,
+    }
+
+def comparar_benchmark(actual, base, umbral=0.10):
+    """
+    Compara dos resultados de ejecutar_benchmark y devuelve la lista de regresiones:
+    latencias (mediana o p95) más de `umbral` por encima de la base, o cambios en los nodos.
+    """
+    regresiones = []
+    if actual["meta"]["huella_corpus"] != base["meta"]["huella_corpus"]:
+        regresiones.append("El corpus no coincide con el de la base: los resultados no son comparables")
+        return regresiones
+    for nombre, por_corpus in actual["resultados"].items():
+        for nombre_corpus, medida in por_corpus.items():
+            anterior = base["resultados"].get(nombre, {}).get(nombre_corpus)
+            if anterior is None:
+                continue
+            for metrica in ("mediana_ns", "p95_ns"):
+                if anterior[metrica] and medida[metrica] > anterior[metrica] * (1 + umbral):
+                    regresiones.append(f"{nombre}/{nombre_corpus}: {metrica} {anterior[metrica]} -> {medida[metrica]} "
+                                       f"(+{(medida[metrica] / anterior[metrica] - 1) * 100:.1f}%)")
+            if medida["nodos_promedio"] != anterior["nodos_promedio"]:
+                regresiones.append(f"{nombre}/{nombre_corpus}: nodos_promedio {anterior['nodos_promedio']} -> {medida['nodos_promedio']}")
+    return regresiones
+
+def comando_benchmark(args):
+    """Subcomando `benchmark` de la línea de comandos. Devuelve 1 si hay regresiones contra la base."""
+    resultado = ejecutar_benchmark(args.algoritmos, args.puzzles, args.repeticiones, args.calentamiento, args.semilla)
+    texto = json.dumps(resultado, indent=2, ensure_ascii=False)
+    if args.salida:
+        with open(args.salida, "w", encoding="utf-8") as salida:
+            salida.write(texto + "\n")
+    else:
+        print(texto)
+    for nombre, por_corpus in resultado["resultados"].items():
+        for nombre_corpus, medida in por_corpus.items():
+            print(f"{nombre:<26}{nombre_corpus:<14} mediana {medida['mediana_ns'] / 1e6:9.3f} ms  "
+                  f"p95 {medida['p95_ns'] / 1e6:9.3f} ms  p99 {medida['p99_ns'] / 1e6:9.3f} ms  "
+                  f"{medida['nodos_por_segundo']:12.0f} nodos/s", file=sys.stderr)
+    if args.base:
+        with open(args.base, encoding="utf-8") as archivo:
+            base = json.load(archivo)
+        regresiones = comparar_benchmark(resultado, base, args.umbral)
+        for regresion in regresiones:
+            print("REGRESIÓN: " + regresion, file=sys.stderr)
+        if regresiones:
+            return 1
+        print("Sin regresiones respecto de la base.", file=sys.stderr)
+    return 0
+
+# ========================
+# API de biblioteca
+# ========================
+
+@dataclasses.dataclass
+class ResultadoSolucion:
+    """Resultado de una llamada a resolver()."""
+    resuelto: bool
+    tablero: list          # Copia del tablero, completa si se resolvió
+    camino: dict           # {(fila, col): num} en el orden en que se colocaron
+    nodos_explorados: int
+    pasos_atras: int
+    tiempo: float          # Segundos
+    algoritmo: int
+    propagacion: dict = None  # Por técnica: (celdas colocadas, opciones descartadas)
+    interrumpido: str = None  # Motivo si se agotaron los Limites: "tiempo", "nodos" o "cancelada"
+
+def resolver(tablero, algoritmo=3, motor="bitmask", propagacion=False, instrumentacion=None, limites=None):
+    """
+    Resuelve una copia del tablero (lista de listas o línea de texto) y devuelve
+    un ResultadoSolucion. No usa variables globales, así que se puede llamar desde varios
+    hilos a la vez. propagacion puede ser True o un dict con las técnicas de Propagador.
+    instrumentacion es una Instrumentacion propia de esta llamada (o None).
+    Con limites, si se agotan se devuelve resuelto=False con interrumpido y los contadores
+    parciales: no se sabe si el tablero tiene solución.
+    """
+    entrada = tablero
+    tablero = linea_a_tablero(entrada) if isinstance(entrada, str) else copiar_tablero(entrada)
+    propagador = None
+    if propagacion:
+        propagador = Propagador(**propagacion) if isinstance(propagacion, dict) else Propagador()
+    interrumpido = None
+    inicio = time.perf_counter()
+    if limites is None:
+        resuelto, estado = ejecutar_algoritmo(tablero, algoritmo, motor, propagador, instrumentacion)
+    else:
+        try:
+            resuelto, estado = ejecutar_algoritmo(tablero, algoritmo, motor, propagador, limites.observar(instrumentacion))
+        except BusquedaInterrumpida as error:
+            resuelto, estado, interrumpido = False, limites.estado_parcial(), error.motivo
+            tablero = linea_a_tablero(entrada) if isinstance(entrada, str) else copiar_tablero(entrada)
+    tiempo = time.perf_counter() - inicio
+    estadisticas = None
+    if propagador is not None:
+        estadisticas = {t: (propagador.colocaciones[t], propagador.eliminaciones[t]) for t in Propagador.TECNICAS}
+    return ResultadoSolucion(resuelto, tablero, dict(estado.solucion), estado.nodos_explorados,
+                             estado.pasos_atras, tiempo, algoritmo, estadisticas, interrumpido)
+
+# ========================
+# Calificación de dificultad
+# ========================
+
+# Peso de cada técnica de Propagador, de la más fácil a la más difícil para una persona
+PESOS_TECNICAS = {"singles_desnudos": 1, "singles_ocultos": 2, "bloqueo": 3, "pares_desnudos": 4, "triples_desnudos": 5}
+# Lo que se suma si las técnicas no alcanzan y hay que probar números (más los nodos y retrocesos)
+PESO_BUSQUEDA = 5
+# Puntaje mínimo y máximo de cada dificultad (1: sólo singles desnudos, 2: singles ocultos
+# o bloqueo, 3: pares o triples desnudos o búsqueda)
+BANDAS_CALIFICACION = {1: (0, 1), 2: (2, 3), 3: (4, float('inf'))}
+
+@dataclasses.dataclass
+class Calificacion:
+    """Resultado de calificar(): qué hace falta para resolver un tablero y cuánto cuesta."""
+    puntaje: float
+    dificultad: int           # Según BANDAS_CALIFICACION
+    tecnica_maxima: str       # La técnica más difícil que se usó (None si no hizo falta ninguna)
+    propagacion: dict         # Por técnica: (celdas colocadas, opciones descartadas)
+    busqueda: bool            # Si las técnicas no alcanzaron para completar el tablero
+    nodos_explorados: int = 0
+    pasos_atras: int = 0
+
+def calificar(tablero):
+    """
+    Califica un tablero (con solución única) como lo resolvería una persona: aplica las
+    técnicas de Propagador empezando siempre por la más fácil que avance, y el puntaje es
+    el peso de la más difícil que hizo falta. Si con ellas no se completa, se resuelve con
+    ramificación y poda más propagación y se suman PESO_BUSQUEDA, los nodos y los retrocesos.
+    Lleva milisegundos en 9×9, así que se puede hacer con cada tablero generado.
+    """
+    motor = MotorBitmask(copiar_tablero(tablero))
+    propagador = Propagador()
+    propagador.propagar(motor, motor)
+    propagacion = {tecnica: (propagador.colocaciones[tecnica], propagador.eliminaciones[tecnica])
+                   for tecnica in Propagador.TECNICAS}
+    usadas = [tecnica for tecnica in Propagador.TECNICAS if any(propagacion[tecnica])]
+    tecnica_maxima = usadas[-1] if usadas else None
+    puntaje = PESOS_TECNICAS[tecnica_maxima] if tecnica_maxima else 0
+    nodos = pasos_atras = 0
+    busqueda = motor.vacias > 0
+    if busqueda:
+        _, estado = ejecutar_bb_bitmask(copiar_tablero(tablero), propagador=Propagador())
+        nodos, pasos_atras = estado.nodos_explorados, estado.pasos_atras
+        puntaje += PESO_BUSQUEDA + nodos + pasos_atras
+    dificultad = next(d for d, (_, maximo) in BANDAS_CALIFICACION.items() if puntaje <= maximo)
+    return Calificacion(puntaje, dificultad, tecnica_maxima, propagacion, busqueda, nodos, pasos_atras)
+
+def generar_tablero_calificado(dificultad, rng=random, limites=None, n=9, banda=None, max_intentos=None,
+                               simetria=None):
+    """
+    Genera tableros candidatos hasta que la calificación de uno cae en la banda de puntaje
+    (por defecto, la de la dificultad en BANDAS_CALIFICACION). Cada candidato se genera
+    quitando la cantidad de celdas de la dificultad, que es lo que más lo acerca a la banda.
+    Devuelve (tablero jugable, solución, celdas jugables, calificación), o None si se agotan
+    los limites o los max_intentos.
+    """
+    minimo, maximo = banda if banda is not None else BANDAS_CALIFICACION[dificultad]
+    intentos = 0
+    while max_intentos is None or intentos < max_intentos:
+        intentos += 1
+        generado = generar_tablero_jugable(dificultad, rng, limites, n, simetria)
+        if generado is None:
+            return None
+        calificacion = calificar(generado[0])
+        if minimo <= calificacion.puntaje <= maximo:
+            return generado + (calificacion,)
+        if limites is not None:
+            try:
+                limites.revisar()
+            except BusquedaInterrumpida:
+                return None
+    return None
+
+# ========================
+# Generación en lote
+# ========================
+
+def generar_tablero_jugable(dificultad, rng=random, limites=None, n=9, simetria=None, minimo=False):
+    """
+    Genera un tablero jugable de n×n sin usar variables globales.
+    Devuelve (tablero jugable, solución, celdas jugables), o None si se agotan los limites.
+    Con simetria, el patrón de pistas es simétrico; con minimo, se quitan pistas hasta
+    que el tablero es mínimo en lugar de la cantidad de la dificultad. Con los dos, el
+    tablero es mínimo por grupos: no se puede quitar ningún grupo simétrico, pero alguna
+    pista suelta de un grupo puede no ser necesaria (ver es_minimo).
+    """
+    solucion = generar_tablero_completo(rng, limites, n)
+    if solucion is None:
+        return None
+    tablero = copiar_tablero(solucion)
+    celdas_a_eliminar = n * n if minimo else celdas_para_dificultad(dificultad, rng, n)
+    celdas_jugables = quitar_pistas(tablero, celdas_a_eliminar, rng, limites, simetria=simetria)
+    if limites is not None and limites.motivo is not None:
+        return None
+    return tablero, solucion, celdas_jugables
+
+def _trabajo_generacion(trabajo):
+    # Se ejecuta en los procesos del pool: cada trabajo tiene su propio generador con semilla
+    indice, dificultad, semilla, segundos, n, calificado, simetria, minimo = trabajo
+    rng = random.Random(f"{semilla}:{indice}")
+    limites = None if segundos is None else Limites(segundos)
+    if calificado:
+        generado = generar_tablero_calificado(dificultad, rng, limites, n, simetria=simetria)
+    else:
+        generado = generar_tablero_jugable(dificultad, rng, limites, n, simetria, minimo)
+    if generado is None:
+        return indice, None, None
+    tablero, solucion = generado[:2]
+    return indice, tablero_a_linea(tablero), tablero_a_linea(solucion)
+
+def generar_lote(cantidad, dificultad, semilla=None, procesos=None, segundos=None, n=9, calificado=False,
+                 simetria=None, minimo=False):
+    """
+    Genera `cantidad` tableros de n×n de la dificultad pedida repartidos en un pool de procesos.
+    Es un generador: entrega (índice, tablero, solución) en formato de una línea a
+    medida que cada tablero termina, no en orden. El tablero i depende sólo de
+    (semilla, i), así que un lote con la misma semilla se puede reproducir.
+    Con segundos, cada tablero tiene ese tiempo máximo; si se agota, se entrega
+    (índice, None, None). Con calificado, la dificultad es la de calificar() y no
+    sólo la cantidad de celdas quitadas (ver generar_tablero_calificado). simetria y
+    minimo se pasan a generar_tablero_jugable; minimo no se combina con calificado.
+    """
+    if minimo and calificado:
+        raise ValueError("minimo y calificado no se pueden combinar")
+    if semilla is None:
+        semilla = random.randrange(2 ** 32)
+    trabajos = ((indice, dificultad, semilla, segundos, n, calificado, simetria, minimo) for indice in range(cantidad))
+    procesos = procesos or os.cpu_count() or 1
+    if procesos == 1:
+        yield from map(_trabajo_generacion, trabajos)
+        return
+    with multiprocessing.Pool(procesos) as pool:
+        yield from pool.imap_unordered(_trabajo_generacion, trabajos, chunksize=4)
+
+def comando_completos(args):
+    """Subcomando `completos` de la línea de comandos."""
+    rng = random.Random(args.semilla)
+    salida = open(args.salida, "w", encoding="utf-8") if args.salida else sys.stdout
+    try:
+        for tablero in generar_tableros_completos(args.cantidad, rng, args.tamano, args.variantes):
+            salida.write(tablero_a_linea(tablero) + "\n")
+    finally:
+        if salida is not sys.stdout:
+            salida.close()
+
+def comando_generar(args):
+    """Subcomando `generar` de la línea de comandos."""
+    salida = open(args.salida, "w", encoding="utf-8") if args.salida else sys.stdout
+    agotados = 0
+    try:
+        for _, tablero, solucion in generar_lote(args.cantidad, args.dificultad, args.semilla, args.procesos,
+                                                 args.tiempo_limite, args.tamano, args.calificado, args.simetria,
+                                                 args.minimo):
+            if tablero is None:
+                agotados += 1
+                continue
+            salida.write(f"{tablero} {solucion}\n" if args.con_solucion else tablero + "\n")
+            salida.flush()
+    finally:
+        if salida is not sys.stdout:
+            salida.close()
+    if agotados:
+        print(f"{agotados} tableros descartados por agotar el tiempo límite", file=sys.stderr)
+
+# ========================
+# Resolución en lote de archivos
+# ========================
+
+def leer_tableros(archivo):
+    """Genera (número de línea, línea) de un archivo de tableros de una línea, sin cargarlo entero."""
+    with open(archivo, encoding="utf-8") as entrada:
+        for numero, linea in enumerate(entrada, 1):
+            linea = linea.strip()
+            if linea and not linea.startswith("#"):
+                yield numero, linea.split()[0]
+
+def resolver_linea(linea, algoritmo, propagacion=False, segundos=None, max_nodos=None):
+    """
+    Resuelve un tablero en formato de una línea.
+    Devuelve (solución en una línea o None, tiempo en segundos, nodos, retrocesos,
+    motivo de interrupción o None). segundos y max_nodos limitan la búsqueda.
+    """
+    limites = None
+    if segundos is not None or max_nodos is not None:
+        limites = Limites(segundos, max_nodos)
+    resultado = resolver(linea, algoritmo, propagacion=propagacion, limites=limites)
+    solucion = tablero_a_linea(resultado.tablero) if resultado.resuelto else None
+    return solucion, resultado.tiempo, resultado.nodos_explorados, resultado.pasos_atras, resultado.interrumpido
+
+# Motivo que acompaña a una línea que no es un tablero (en lugar del de una interrupción)
+LINEA_INVALIDA = "invalido"
+
+def _trabajo_resolucion(bloque):
+    # Se ejecuta en los procesos del pool con un bloque de líneas consecutivas
+    algoritmo, propagacion, segundos, max_nodos, lineas = bloque
+    resultados = []
+    for numero, linea in lineas:
+        try:
+            resultados.append((numero, linea) + resolver_linea(linea, algoritmo, propagacion, segundos, max_nodos))
+        except ValueError:
+            resultados.append((numero, linea, None, 0.0, 0, 0, LINEA_INVALIDA))
+    return resultados
+
+def resolver_lote(lineas, algoritmo, procesos=None, propagacion=False, tamano_bloque=256,
+                  segundos=None, max_nodos=None):
+    """
+    Resuelve un iterable de (número de línea, tablero) y genera
+    (número de línea, tablero, solución, tiempo, nodos, retrocesos, interrumpido) en el
+    orden de entrada; interrumpido es LINEA_INVALIDA si la línea no es un tablero.
+    Las líneas se mandan al pool en bloques y sólo hay unos pocos bloques en vuelo a la
+    vez, así que la memoria no crece con el tamaño del archivo.
+    segundos y max_nodos limitan cada tablero, para que uno patológico no trabe un proceso.
+    """
+    procesos = procesos or os.cpu_count() or 1
+    bloques = ((algoritmo, propagacion, segundos, max_nodos, list(bloque))
+               for bloque in iter(lambda it=iter(lineas): list(itertools.islice(it, tamano_bloque)), []))
+    if procesos == 1:
+        for bloque in bloques:
+            yield from _trabajo_resolucion(bloque)
+        return
+    with multiprocessing.Pool(procesos) as pool:
+        pendientes = collections.deque()
+        for bloque in bloques:
+            pendientes.append(pool.apply_async(_trabajo_resolucion, (bloque,)))
+            if len(pendientes) >= 2 * procesos:
+                yield from pendientes.popleft().get()
+        while pendientes:
+            yield from pendientes.popleft().get()
+
+def comando_resolver(args):
+    """Subcomando `resolver` de la línea de comandos."""
+    salida = open(args.salida, "w", encoding="utf-8", newline="") if args.salida else sys.stdout
+    resueltos = agotados = invalidos = total = 0
+    inicio = time.perf_counter()
+    try:
+        # Con el módulo csv una línea inválida con comas o comillas no rompe las columnas
+        escritor = csv.writer(salida, lineterminator="\n")
+        escritor.writerow(("linea", "tablero", "solucion", "tiempo_s", "nodos", "retrocesos"))
+        if args.dividir:
+            resultados = resolver_lote_dividiendo(leer_tableros(args.archivo), args.procesos, args.tiempo_limite,
+                                                  args.max_nodos)
+        else:
+            resultados = resolver_lote(leer_tableros(args.archivo), args.algoritmo, args.procesos, args.propagacion,
+                                       args.bloque, args.tiempo_limite, args.max_nodos)
+        for numero, linea, solucion, tiempo, nodos, retrocesos, interrumpido in resultados:
+            total += 1
+            resueltos += solucion is not None
+            if interrumpido == LINEA_INVALIDA:
+                invalidos += 1
+                solucion = LINEA_INVALIDA
+            elif interrumpido is not None:
+                agotados += 1
+                solucion = f"agotado_{interrumpido}"
+            elif solucion is None:
+                solucion = "sin_solucion"
+            escritor.writerow((numero, linea, solucion, f"{tiempo:.6f}", nodos, retrocesos))
+    finally:
+        if salida is not sys.stdout:
+            salida.close()
+    resumen = f"{resueltos}/{total} tableros resueltos en {time.perf_counter() - inicio:.2f} segundos"
+    if agotados:
+        resumen += f" ({agotados} agotaron sus límites)"
+    if invalidos:
+        resumen += f" ({invalidos} líneas no son tableros)"
+    print(resumen, file=sys.stderr)
+
+# ========================
+# Búsqueda paralela de un tablero
+# ========================
+
+# Subárboles iniciales por proceso y nodos que explora cada tarea antes de devolver lo que le queda
+SUBARBOLES_POR_PROCESO = 4
+NODOS_POR_TAREA = 20000
+
+def _celda_mas_restringida(estado):
+    # La celda que elegiría crear_cola_prioridad; si la cola quedaría vacía (todas las celdas
+    # con más de 6 opciones) la de menos opciones, porque acá no se puede podar por eso
+    i = estado.mejor_celda()
+    if i is not None:
+        return i
+    celdas = estado.motor.celdas
+    return min((j for j in range(len(celdas)) if celdas[j] == 0), key=estado.num_opciones.__getitem__)
+
+def dividir_arbol(celdas, objetivo):
+    """
+    Reparte el árbol de búsqueda de un tablero (celdas en bytes): expande nivel por nivel la
+    celda más restringida de cada nodo hasta tener al menos `objetivo` subárboles.
+    Devuelve (subárboles en bytes, soluciones que aparecieron en el camino).
+    """
+    frontera = [bytes(celdas)]
+    soluciones = []
+    while frontera and len(frontera) < objetivo:
+        siguiente = []
+        for nodo in frontera:
+            estado = BBIncremental(Tablero(nodo))
+            if estado.por_opciones[0]:
+                continue
+            if estado.motor.vacias == 0:
+                soluciones.append(nodo)
+                continue
+            i = _celda_mas_restringida(estado)
+            hijo = bytearray(nodo)
+            for num in estado.geometria.digitos[estado.motor.opciones(i)]:
+                hijo[i] = num
+                siguiente.append(bytes(hijo))
+        frontera = siguiente
+    return frontera, soluciones
+
+def explorar_subarbol(estado, contar=False, limite=None, max_nodos=None, limites=None):
+    """
+    Búsqueda en profundidad con pila explícita sobre un BBIncremental, ramificando en la
+    celda más restringida. Termina en la primera solución (contando, al llegar a limite) o al
+    pasar max_nodos: entonces devuelve como pendientes (celdas en bytes) todas las ramas que
+    no llegó a probar, para que las tome otro proceso. El tablero queda como estaba.
+    Devuelve (soluciones, primera solución en bytes o None, pendientes, nodos, retrocesos).
+    """
+    motor = estado.motor
+    celdas = motor.celdas
+    digitos = estado.geometria.digitos
+    pila = []  # Por nivel: [celda, opciones, índice de la próxima opción]
+    soluciones = nodos = retrocesos = 0
+    primera = None
+    pendientes = []
+    while True:
+        nodos += 1
+        if limites is not None:
+            limites.verificar()
+        if not estado.por_opciones[0]:
+            if motor.vacias == 0:
+                soluciones += 1
+                if primera is None:
+                    primera = bytes(celdas)
+                if not contar or (limite is not None and soluciones >= limite):
+                    break
+            else:
+                i = _celda_mas_restringida(estado)
+                pila.append([i, digitos[motor.opciones(i)], 0])
+        # Próxima opción sin probar, retrocediendo lo que haga falta
+        while pila:
+            marco = pila[-1]
+            i, opciones, k = marco
+            if k:
+                estado.quitar(i)
+                retrocesos += 1
+            if k < len(opciones):
+                break
+            pila.pop()
+        else:
+            return soluciones, primera, pendientes, nodos, retrocesos
+        if max_nodos is not None and nodos >= max_nodos:
+            # Presupuesto agotado: se devuelven las opciones sin probar de cada nivel, de
+            # abajo hacia arriba, deshaciendo las colocaciones (la celda del tope ya está vacía)
+            for nivel in range(len(pila) - 1, -1, -1):
+                i, opciones, k = pila[nivel]
+                if nivel < len(pila) - 1:
+                    estado.quitar(i)
+                hijo = bytearray(celdas)
+                for num in opciones[k:]:
+                    hijo[i] = num
+                    pendientes.append(bytes(hijo))
+            return soluciones, primera, pendientes, nodos, retrocesos
+        marco[2] = k + 1
+        estado.colocar(i, opciones[k])
+    for i, _, k in reversed(pila):
+        if k:
+            estado.quitar(i)
+    return soluciones, primera, pendientes, nodos, retrocesos
+
+def _trabajo_subarbol(trabajo):
+    # Se ejecuta en los procesos del pool con un subárbol y su presupuesto de nodos
+    celdas, contar, limite, max_nodos = trabajo
+    return explorar_subarbol(BBIncremental(Tablero(celdas)), contar, limite, max_nodos)
+
+def buscar_en_paralelo(tablero, contar=False, limite=None, procesos=None, nodos_por_tarea=NODOS_POR_TAREA,
+                       limites=None):
+    """
+    Resuelve (o cuenta soluciones de) un solo tablero repartiendo su árbol entre procesos.
+    Los primeros niveles se dividen por los valores de la celda más restringida y los
+    subárboles van a una cola común del pool. Una tarea que pasa nodos_por_tarea devuelve las
+    ramas que le quedan a la cola, así que un proceso libre le saca trabajo a uno con un
+    subárbol grande. Al aparecer la solución (o llegar a limite contando) se terminan los
+    procesos que seguían buscando. Si se agotan los limites se lanza BusquedaInterrumpida.
+    Devuelve (soluciones, primera solución en bytes o None, nodos, retrocesos).
+    """
+    tablero = linea_a_tablero(tablero) if isinstance(tablero, str) else tablero
+    # Con pistas repetidas el motor no ve la contradicción y recorrería el árbol entero
+    if not es_valido_sudoku(tablero, False):
+        return 0, None, 0, 0
+    celdas = _celdas_de(tablero)
+    procesos = procesos or os.cpu_count() or 1
+    subarboles, halladas = dividir_arbol(celdas, SUBARBOLES_POR_PROCESO * procesos)
+    soluciones = len(halladas)
+    primera = halladas[0] if halladas else None
+    nodos = retrocesos = 0
+
+    def terminado():
+        return soluciones and (not contar or (limite is not None and soluciones >= limite))
+
+    def restante():
+        # Cada tarea cuenta sólo lo que falta para el límite, no el límite entero
+        return None if limite is None else max(limite - soluciones, 1)
+
+    def resultado_final():
+        return (soluciones if limite is None else min(soluciones, limite)), primera, nodos, retrocesos
+
+    if procesos == 1:
+        for subarbol in subarboles:
+            if terminado():
+                break
+            cantidad, solucion, _, nodos_subarbol, retrocesos_subarbol = explorar_subarbol(
+                BBIncremental(Tablero(subarbol)), contar, restante(), None, limites)
+            soluciones += cantidad
+            primera = primera or solucion
+            nodos += nodos_subarbol
+            retrocesos += retrocesos_subarbol
+        return resultado_final()
+
+    terminados = queue.Queue()
+    # Al salir del with, Pool.terminate() corta a los procesos que siguen con otros subárboles
+    with multiprocessing.Pool(procesos) as pool:
+        en_cola = 0
+        for subarbol in subarboles:
+            pool.apply_async(_trabajo_subarbol, ((subarbol, contar, restante(), nodos_por_tarea),),
+                             callback=terminados.put, error_callback=terminados.put)
+            en_cola += 1
+        while en_cola and not terminado():
+            try:
+                resultado = terminados.get(timeout=0.05)
+            except queue.Empty:
+                if limites is not None:
+                    limites.revisar()
+                continue
+            en_cola -= 1
+            if isinstance(resultado, BaseException):
+                raise resultado
+            cantidad, solucion, pendientes, nodos_tarea, retrocesos_tarea = resultado
+            soluciones += cantidad
+            primera = primera or solucion
+            nodos += nodos_tarea
+            retrocesos += retrocesos_tarea
+            if limites is not None:
+                limites.revisar(nodos_tarea)
+            if terminado():
+                break
+            for subarbol in pendientes:
+                pool.apply_async(_trabajo_subarbol, ((subarbol, contar, restante(), nodos_por_tarea),),
+                                 callback=terminados.put, error_callback=terminados.put)
+                en_cola += 1
+    return resultado_final()
+
+def resolver_paralelo(tablero, procesos=None, nodos_por_tarea=NODOS_POR_TAREA, limites=None):
+    """
+    Como resolver() pero repartiendo la búsqueda de un tablero difícil entre procesos
+    (ver buscar_en_paralelo). Ramifica como el Branch & Bound, así que se informa como
+    algoritmo 2; el camino son las celdas completadas, por filas.
+    """
+    entrada = linea_a_tablero(tablero) if isinstance(tablero, str) else copiar_tablero(tablero)
+    inicio = time.perf_counter()
+    interrumpido = None
+    try:
+        _, solucion, nodos, retrocesos = buscar_en_paralelo(entrada, False, None, procesos, nodos_por_tarea, limites)
+    except BusquedaInterrumpida as error:
+        solucion, nodos, retrocesos, interrumpido = None, limites.nodos, 0, error.motivo
+    tiempo = time.perf_counter() - inicio
+    camino = {}
+    if solucion is not None:
+        n = len(entrada)
+        for fila, col in celdas_vacias_de(entrada):
+            entrada[fila][col] = camino[(fila, col)] = solucion[fila * n + col]
+    return ResultadoSolucion(solucion is not None, entrada, camino, nodos, retrocesos, tiempo, 2,
+                             interrumpido=interrumpido)
+
+def resolver_lote_dividiendo(lineas, procesos=None, segundos=None, max_nodos=None):
+    """
+    Como resolver_lote, pero de a un tablero por vez con todos los procesos en su árbol:
+    conviene para pocos tableros muy difíciles.
+    """
+    for numero, linea in lineas:
+        limites = None
+        if segundos is not None or max_nodos is not None:
+            limites = Limites(segundos, max_nodos)
+        try:
+            resultado = resolver_paralelo(linea, procesos, limites=limites)
+        except ValueError:
+            yield numero, linea, None, 0.0, 0, 0, LINEA_INVALIDA
+            continue
+        solucion = tablero_a_linea(resultado.tablero) if resultado.resuelto else None
+        yield (numero, linea, solucion, resultado.tiempo, resultado.nodos_explorados, resultado.pasos_atras,
+               resultado.interrumpido)
+
+def contar_soluciones_paralelo(tablero, limite=None, procesos=None, nodos_por_tarea=NODOS_POR_TAREA, limites=None):
+    """
+    Cuenta las soluciones de un tablero (hasta limite, si se da) sumando las de cada subárbol
+    en paralelo; con limite nunca devuelve más que limite. Devuelve None si se agotan los limites.
+    """
+    try:
+        return buscar_en_paralelo(tablero, True, limite, procesos, nodos_por_tarea, limites)[0]
+    except BusquedaInterrumpida:
+        return None
+
+# ========================
+# Banco de tableros
+# ========================
+
+# Archivo binario con tableros ya generados: una cabecera y después registros de tamaño fijo
+# ordenados por dificultad, así que sortear uno de una dificultad es elegir un índice al azar.
+# Cabecera: firma, versión, n, celdas empaquetadas (dos por byte si n < 16), tamaño de registro,
+# cantidad total y (primer índice, cantidad) para cada dificultad.
+# Registro: tablero, solución, dificultad (1 byte) y cantidad de pistas (2 bytes).
+ARCHIVO_BANCO = "banco_sudoku.bin"
+FIRMA_BANCO = b"SDKB"
+VERSION_BANCO = 1
+DIFICULTADES_BANCO = (1, 2, 3)
+CABECERA_BANCO = struct.Struct("<4sBBBxII" + "II" * len(DIFICULTADES_BANCO))
+
+def _bytes_por_tablero(n):
+    total = n * n
+    return (total + 1) // 2 if n < 16 else total
+
+def _empaquetar_celdas(celdas, n):
+    """Celdas (bytes) a su forma en el banco: dos por byte (4 bits cada una) si n < 16."""
+    if n >= 16:
+        return bytes(celdas)
+    if len(celdas) % 2:
+        celdas = bytes(celdas) + b"\0"
+    return bytes((alta << 4) | baja for alta, baja in zip(celdas[::2], celdas[1::2]))
+
+def _desempaquetar_celdas(datos, n):
+    if n >= 16:
+        return bytes(datos)
+    celdas = bytearray(2 * len(datos))
+    celdas[::2] = bytes(b >> 4 for b in datos)
+    celdas[1::2] = bytes(b & 0x0F for b in datos)
+    return bytes(celdas[:n * n])
+
+def _estructura_registro(n):
+    tamano = _bytes_por_tablero(n)
+    return struct.Struct(f"<{tamano}s{tamano}sBH")
+
+def construir_banco(archivo, cantidad, dificultades=DIFICULTADES_BANCO, semilla=None, procesos=None,
+                    segundos=None, n=9, calificado=False):
+    """
+    Llena un banco de tableros de n×n fuera de línea: `cantidad` tableros de cada dificultad,
+    generados en paralelo con generar_lote (misma semilla, mismo banco). El archivo se
+    escribe al final de una vez, así que un banco a medio construir nunca queda a la vista.
+    Devuelve {dificultad: tableros guardados} (los que agotan `segundos` se descartan).
+    """
+    registro = _estructura_registro(n)
+    bloques = {}
+    for dificultad in dificultades:
+        semilla_dificultad = None if semilla is None else f"{semilla}/{dificultad}"
+        generados = sorted((indice, tablero, solucion) for indice, tablero, solucion
+                           in generar_lote(cantidad, dificultad, semilla_dificultad, procesos, segundos, n, calificado)
+                           if tablero is not None)
+        bloque = bytearray()
+        for _, linea, linea_solucion in generados:
+            tablero = Tablero.desde_linea(linea).celdas
+            solucion = Tablero.desde_linea(linea_solucion).celdas
+            bloque += registro.pack(_empaquetar_celdas(tablero, n), _empaquetar_celdas(solucion, n),
+                                    dificultad, n * n - tablero.count(0))
+        bloques[dificultad] = (bloque, len(generados))
+
+    rangos, inicio = [], 0
+    for dificultad in DIFICULTADES_BANCO:
+        guardados = bloques.get(dificultad, (b"", 0))[1]
+        rangos += [inicio, guardados]
+        inicio += guardados
+    temporal = f"{archivo}.tmp"
+    with open(temporal, "wb") as salida:
+        salida.write(CABECERA_BANCO.pack(FIRMA_BANCO, VERSION_BANCO, n, int(n < 16), registro.size, inicio, *rangos))
+        for dificultad in DIFICULTADES_BANCO:
+            if dificultad in bloques:
+                salida.write(bloques[dificultad][0])
+    os.replace(temporal, archivo)
+    return {dificultad: bloques[dificultad][1] for dificultad in bloques}
+
+
+class BancoTableros:
+    """
+    Lector de un banco de tableros: mapea el archivo en memoria (mmap) y decodifica sólo el
+    registro pedido, así que abrirlo no carga el banco y sortear un tablero es O(1).
+    Se usa como context manager o se cierra con cerrar().
+    """
+
+    def __init__(self, archivo):
+        self._archivo = open(archivo, "rb")
+        try:
+            self._mapa = mmap.mmap(self._archivo.fileno(), 0, access=mmap.ACCESS_READ)
+            if len(self._mapa) < CABECERA_BANCO.size:
+                raise ValueError(f"{archivo} no es un banco de tableros")
+            firma, version, n, _, tamano_registro, cantidad, *rangos = CABECERA_BANCO.unpack_from(self._mapa)
+            if firma != FIRMA_BANCO or version != VERSION_BANCO:
+                raise ValueError(f"{archivo} no es un banco de tableros (versión {VERSION_BANCO})")
+            self._registro = _estructura_registro(n)
+            if tamano_registro != self._registro.size or len(self._mapa) < CABECERA_BANCO.size + cantidad * tamano_registro:
+                raise ValueError(f"{archivo} está truncado o dañado")
+        except BaseException:
+            self.cerrar()
+            raise
+        self.n = n
+        self._cantidad = cantidad
+        self._rangos = {dificultad: (rangos[2 * k], rangos[2 * k + 1])
+                        for k, dificultad in enumerate(DIFICULTADES_BANCO)}
+
+    def __len__(self):
+        return self._cantidad
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *_):
+        self.cerrar()
+
+    def cerrar(self):
+        mapa = getattr(self, "_mapa", None)
+        if mapa is not None:
+            mapa.close()
+            self._mapa = None
+        self._archivo.close()
+
+    def cantidad(self, dificultad):
+        """Cantidad de tableros de esa dificultad en el banco."""
+        return self._rangos.get(dificultad, (0, 0))[1]
+
+    def registro(self, indice):
+        """Devuelve (tablero, solución, dificultad, pistas) del registro indice, con listas de listas."""
+        if not 0 <= indice < self._cantidad:
+            raise IndexError(f"El banco tiene {self._cantidad} tableros")
+        desplazamiento = CABECERA_BANCO.size + indice * self._registro.size
+        tablero, solucion, dificultad, pistas = self._registro.unpack_from(self._mapa, desplazamiento)
+        n = self.n
+        return (Tablero(_desempaquetar_celdas(tablero, n)).a_lista(),
+                Tablero(_desempaquetar_celdas(solucion, n)).a_lista(), dificultad, pistas)
+
+    def sortear(self, dificultad=None, rng=random):
+        """Un registro al azar, de la dificultad pedida o de cualquiera."""
+        inicio, cantidad = (0, self._cantidad) if dificultad is None else self._rangos.get(dificultad, (0, 0))
+        if not cantidad:
+            raise ValueError(f"El banco no tiene tableros de dificultad {dificultad}")
+        return self.registro(inicio + rng.randrange(cantidad))
+
+def comando_banco(args):
+    """Subcomando `banco` de la línea de comandos."""
+    inicio = time.perf_counter()
+    guardados = construir_banco(args.archivo, args.cantidad, args.dificultades, args.semilla, args.procesos,
+                                args.tiempo_limite, args.tamano, args.calificado)
+    detalle = ", ".join(f"dificultad {dificultad}: {cantidad}" for dificultad, cantidad in guardados.items())
+    print(f"Banco {args.archivo} ({args.tamano}×{args.tamano}) construido en "
+          f"{time.perf_counter() - inicio:.2f} segundos ({detalle})", file=sys.stderr)
+
+# ========================
+# Servicio HTTP/JSON
+# ========================
+
+class ErrorServicio(Exception):
+    """Error de una petición al servicio, con el código HTTP que le corresponde."""
+
+    def __init__(self, estado, mensaje):
+        super().__init__(mensaje)
+        self.estado = estado
+
+
+def _trabajo_servicio(peticiones):
+    # Se ejecuta en los procesos del pool: atiende un lote de (tipo, datos) y devuelve
+    # una respuesta por petición, en el mismo orden; un error no afecta al resto del lote
+    respuestas = []
+    for tipo, datos in peticiones:
+        try:
+            respuestas.append(_atender_peticion(tipo, datos))
+        except (ValueError, TypeError, KeyError) as error:
+            respuestas.append({"error": str(error)})
+    return respuestas
+
+def _atender_peticion(tipo, datos):
+    # El vencimiento es una hora absoluta: lo que la petición esperó en la cola ya cuenta
+    segundos = datos["vencimiento"] - time.time()
+    if segundos <= 0:
+        return {"interrumpido": "tiempo"}
+    if tipo == "resolver":
+        algoritmo = int(datos.get("algoritmo", 3))
+        if algoritmo not in (1, 2, 3):
+            raise ValueError(f"Algoritmo inválido: {algoritmo}")
+        max_nodos = datos.get("max_nodos")
+        solucion, tiempo, nodos, retrocesos, interrumpido = resolver_linea(
+            datos["tablero"], algoritmo, bool(datos.get("propagacion", False)), segundos,
+            None if max_nodos is None else int(max_nodos))
+        return {"resuelto": solucion is not None, "solucion": solucion, "tiempo": tiempo,
+                "nodos": nodos, "retrocesos": retrocesos, "interrumpido": interrumpido}
+    dificultad = int(datos.get("dificultad", 2))
+    n = int(datos.get("tamano", 9))
+    if dificultad not in RANGOS_DIFICULTAD or n not in (9, 16, 25):
+        raise ValueError("La dificultad va de 1 a 3 y el tamaño es 9, 16 o 25")
+    limites = Limites(segundos)
+    generar = generar_tablero_calificado if datos.get("calificado") else generar_tablero_jugable
+    generado = generar(dificultad, random.Random(datos.get("semilla")), limites, n)
+    if generado is None:
+        return {"interrumpido": limites.motivo}
+    respuesta = {"tablero": tablero_a_linea(generado[0]), "solucion": tablero_a_linea(generado[1])}
+    if datos.get("calificado"):
+        respuesta["puntaje"] = generado[3].puntaje
+        respuesta["tecnica_maxima"] = generado[3].tecnica_maxima
+    return respuesta
+
+def _linea_de_peticion(tablero):
+    # Un tablero en JSON puede venir como línea de texto o como lista de listas
+    if isinstance(tablero, str):
+        return tablero
+    if isinstance(tablero, list) and all(isinstance(fila, list) for fila in tablero):
+        return tablero_a_linea(tablero)
+    raise ErrorServicio(400, "El tablero tiene que ser una línea de texto o una lista de listas")
+
+
+class MetricasServicio:
+    """Latencias por ruta (sobre las últimas VENTANA peticiones), respuestas por código, lotes y cola."""
+    VENTANA = 1024
+
+    def __init__(self):
+        self.latencias = collections.defaultdict(lambda: collections.deque(maxlen=self.VENTANA))
+        self.respuestas = collections.Counter()
+        self.lotes = 0
+        self.peticiones_en_lotes = 0
+        self.profundidad_maxima = 0
+
+    def registrar(self, ruta, estado, segundos):
+        self.latencias[ruta].append(segundos)
+        self.respuestas[estado] += 1
+
+    def lote(self, tamano):
+        self.lotes += 1
+        self.peticiones_en_lotes += tamano
+
+    def profundidad(self, profundidad):
+        if profundidad > self.profundidad_maxima:
+            self.profundidad_maxima = profundidad
+
+    def resumen(self, profundidad, lotes_en_vuelo):
+        latencias = {}
+        for ruta, valores in self.latencias.items():
+            ordenados = sorted(valores)
+            latencias[ruta] = {
+                "cantidad": len(ordenados),
+                "p50_ms": percentil(ordenados, 50) * 1000,
+                "p95_ms": percentil(ordenados, 95) * 1000,
+                "p99_ms": percentil(ordenados, 99) * 1000,
+                "max_ms": ordenados[-1] * 1000 if ordenados else 0,
+            }
+        return {
+            "latencias": latencias,
+            "respuestas": {str(estado): cantidad for estado, cantidad in sorted(self.respuestas.items())},
+            "cola": {"profundidad": profundidad, "profundidad_maxima": self.profundidad_maxima},
+            "lotes": {"enviados": self.lotes, "en_vuelo": lotes_en_vuelo,
+                      "tamano_medio": self.peticiones_en_lotes / self.lotes if self.lotes else 0.0},
+        }
+
+
+class ServicioSudoku:
+    """
+    Servicio HTTP/JSON local sobre asyncio para poner los solvers detrás de un backend:
+
+        POST /resolver  {"tablero": "...", "algoritmo": 3, "propagacion": false, "max_nodos": null}
+        POST /generar   {"dificultad": 2, "tamano": 9, "semilla": null, "calificado": false}
+        POST /validar   {"tablero": "...", "completo": true}
+        GET  /metricas  latencias por ruta, profundidad de la cola y lotes
+        GET  /salud
+
+    Resolver y generar pasan por una cola acotada. Un despachador arma lotes de hasta
+    tamano_lote peticiones y los manda a un pool de procesos, con a lo sumo un lote en
+    vuelo por proceso. Con la cola llena se responde 503 (contrapresión). Cada petición
+    tiene un tiempo límite ("tiempo_limite", acotado por el del servicio): se responde 504
+    al vencer y la búsqueda en el proceso se corta con Limites. Validar es barato y se
+    responde sin pasar por el pool.
+    """
+    TAMANO_MAXIMO_CUERPO = 1 << 16
+
+    def __init__(self, procesos=None, tamano_cola=1024, tamano_lote=32, espera_lote=0.002, tiempo_limite=10.0):
+        self.procesos = procesos or os.cpu_count() or 1
+        self.tamano_cola = tamano_cola
+        self.tamano_lote = tamano_lote
+        self.espera_lote = espera_lote
+        self.tiempo_limite = tiempo_limite
+        self.metricas = MetricasServicio()
+        self._cola = None
+        self._pool = None
+        self._lugares = None
+        self._en_vuelo = 0
+        self._despachador = None
+        self._servidor = None
+
+    async def iniciar(self, host="127.0.0.1", puerto=8080):
+        """Abre el pool y el puerto. Devuelve (host, puerto) reales (puerto=0 elige uno libre)."""
+        self._cola = asyncio.Queue(self.tamano_cola)
+        self._lugares = asyncio.Semaphore(self.procesos)
+        # Con fork, un proceso creado con conexiones abiertas hereda sus sockets y esas
+        # conexiones no se cierran hasta que el proceso termina: se usa spawn, y los procesos
+        # se crean ya para que la primera petición no espere el arranque
+        self._pool = concurrent.futures.ProcessPoolExecutor(self.procesos, multiprocessing.get_context("spawn"))
+        loop = asyncio.get_running_loop()
+        await asyncio.gather(*(loop.run_in_executor(self._pool, _trabajo_servicio, []) for _ in range(self.procesos)))
+        self._despachador = asyncio.ensure_future(self._despachar())
+        self._servidor = await asyncio.start_server(self._atender_conexion, host, puerto)
+        return self._servidor.sockets[0].getsockname()[:2]
+
+    async def detener(self):
+        self._servidor.close()
+        await self._servidor.wait_closed()
+        self._despachador.cancel()
+        try:
+            await self._despachador
+        except asyncio.CancelledError:
+            pass
+        self._pool.shutdown(wait=False, cancel_futures=True)
+
+    async def servir(self, host="127.0.0.1", puerto=8080):
+        """Atiende hasta que se cancele la tarea (Ctrl+C con asyncio.run)."""
+        host, puerto = await self.iniciar(host, puerto)
+        print(f"Servicio de Sudoku en http://{host}:{puerto} con {self.procesos} procesos", file=sys.stderr)
+        try:
+            await self._servidor.serve_forever()
+        finally:
+            await self.detener()
+
+    # --- Cola y lotes ---
+
+    async def _despachar(self):
+        loop = asyncio.get_running_loop()
+        cola = self._cola
+        while True:
+            # Primero un proceso libre: mientras todos trabajan, la cola junta el próximo lote
+            await self._lugares.acquire()
+            lote = [await cola.get()]
+            if cola.qsize() < self.tamano_lote - 1 and self.espera_lote:
+                await asyncio.sleep(self.espera_lote)
+            while len(lote) < self.tamano_lote and not cola.empty():
+                lote.append(cola.get_nowait())
+            # Las peticiones que vencieron mientras esperaban no se mandan
+            lote = [peticion for peticion in lote if not peticion[2].done()]
+            if not lote:
+                self._lugares.release()
+                continue
+            self.metricas.lote(len(lote))
+            self._en_vuelo += 1
+            tarea = loop.run_in_executor(self._pool, _trabajo_servicio, [(tipo, datos) for tipo, datos, _ in lote])
+            tarea.add_done_callback(functools.partial(self._entregar, lote))
+
+    def _entregar(self, lote, tarea):
+        self._en_vuelo -= 1
+        self._lugares.release()
+        if tarea.cancelled():
+            return
+        error = tarea.exception()
+        for indice, (_, _, futuro) in enumerate(lote):
+            if futuro.done():
+                continue
+            if error is not None:
+                futuro.set_exception(ErrorServicio(500, f"Falló el proceso: {error}"))
+            else:
+                futuro.set_result(tarea.result()[indice])
+
+    async def _encolar(self, tipo, datos):
+        tiempo = self.tiempo_limite
+        if datos.get("tiempo_limite") is not None:
+            tiempo = min(tiempo, datos["tiempo_limite"])  # Ya validado en _responder
+        datos["vencimiento"] = time.time() + tiempo
+        futuro = asyncio.get_running_loop().create_future()
+        try:
+            self._cola.put_nowait((tipo, datos, futuro))
+        except asyncio.QueueFull:
+            raise ErrorServicio(503, "Cola llena, reintente más tarde")
+        self.metricas.profundidad(self._cola.qsize())
+        try:
+            respuesta = await asyncio.wait_for(futuro, tiempo)
+        except asyncio.TimeoutError:
+            raise ErrorServicio(504, f"Se agotó el tiempo límite de {tiempo} segundos")
+        if "error" in respuesta:
+            raise ErrorServicio(400, respuesta["error"])
+        if respuesta.get("interrumpido") and tipo == "generar":
+            raise ErrorServicio(504, f"Se agotó el tiempo límite de {tiempo} segundos")
+        return respuesta
+
+    # --- HTTP ---
+
+    async def _responder(self, metodo, ruta, cuerpo):
+        if ruta == "/salud" and metodo == "GET":
+            return {"estado": "ok"}
+        if ruta == "/metricas" and metodo == "GET":
+            return self.metricas.resumen(self._cola.qsize(), self._en_vuelo)
+        if ruta not in ("/resolver", "/generar", "/validar"):
+            raise ErrorServicio(404, f"No existe {ruta}")
+        if metodo != "POST":
+            raise ErrorServicio(405, f"{ruta} sólo acepta POST")
+        try:
+            datos = json.loads(cuerpo or b"{}")
+        except ValueError:
+            raise ErrorServicio(400, "El cuerpo no es JSON válido")
+        if not isinstance(datos, dict):
+            raise ErrorServicio(400, "El cuerpo tiene que ser un objeto JSON")
+        if datos.get("tiempo_limite") is not None:
+            try:
+                tiempo_limite = float(datos["tiempo_limite"])
+            except (TypeError, ValueError):
+                raise ErrorServicio(400, "tiempo_limite tiene que ser un número")
+            if not tiempo_limite >= 0:  # También descarta NaN
+                raise ErrorServicio(400, "tiempo_limite no puede ser negativo")
+            datos["tiempo_limite"] = tiempo_limite
+        if ruta == "/validar":
+            try:
+                tablero = linea_a_tablero(_linea_de_peticion(datos.get("tablero")))
+            except ValueError as error:
+                raise ErrorServicio(400, str(error))
+            return {"valido": es_valido_sudoku(tablero, bool(datos.get("completo", True)))}
+        if ruta == "/resolver":
+            if "tablero" not in datos:
+                raise ErrorServicio(400, "Falta el tablero")
+            datos["tablero"] = _linea_de_peticion(datos["tablero"])
+            return await self._encolar("resolver", datos)
+        return await self._encolar("generar", datos)
+
+    async def _atender_conexion(self, lector, escritor):
+        try:
+            while True:
+                try:
+                    encabezado = await lector.readuntil(b"\r\n\r\n")
+                except (asyncio.IncompleteReadError, asyncio.LimitOverrunError, ConnectionError):
+                    break
+                lineas = encabezado.decode("latin-1").split("\r\n")
+                partes = lineas[0].split()
+                cabeceras = {}
+                for linea in lineas[1:]:
+                    nombre, _, valor = linea.partition(":")
+                    cabeceras[nombre.strip().lower()] = valor.strip()
+                inicio = time.perf_counter()
+                ruta = "?"
+                mantener = False
+                try:
+                    if len(partes) != 3:
+                        raise ErrorServicio(400, "Línea de petición inválida")
+                    metodo, ruta, version = partes
+                    ruta = ruta.split("?", 1)[0]
+                    mantener = version == "HTTP/1.1" and cabeceras.get("connection", "").lower() != "close"
+                    try:
+                        largo = int(cabeceras.get("content-length", 0))
+                    except ValueError:
+                        raise ErrorServicio(400, "Content-Length inválido")
+                    if largo > self.TAMANO_MAXIMO_CUERPO:
+                        mantener = False
+                        raise ErrorServicio(413, "Cuerpo demasiado grande")
+                    cuerpo = await lector.readexactly(largo) if largo > 0 else b""
+                    estado, respuesta = 200, await self._responder(metodo, ruta, cuerpo)
+                except ErrorServicio as error:
+                    estado, respuesta = error.estado, {"error": str(error)}
+                # Las rutas desconocidas van juntas para que las métricas no crezcan sin límite
+                self.metricas.registrar(ruta if ruta in _RUTAS_SERVICIO else "otras", estado,
+                                        time.perf_counter() - inicio)
+                datos = json.dumps(respuesta, ensure_ascii=False).encode("utf-8")
+                extra = "Retry-After: 1\r\n" if estado == 503 else ""
+                escritor.write((f"HTTP/1.1 {estado} {_RAZONES_HTTP.get(estado, '')}\r\n"
+                                f"Content-Type: application/json; charset=utf-8\r\n"
+                                f"Content-Length: {len(datos)}\r\n{extra}"
+                                f"Connection: {'keep-alive' if mantener else 'close'}\r\n\r\n").encode("latin-1") + datos)
+                await escritor.drain()
+                if not mantener:
+                    break
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            escritor.close()
+
+_RUTAS_SERVICIO = ("/resolver", "/generar", "/validar", "/metricas", "/salud")
+_RAZONES_HTTP = {200: "OK", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed",
+                 413: "Payload Too Large", 500: "Internal Server Error", 503: "Service Unavailable",
+                 504: "Gateway Timeout"}
+
+def comando_servir(args):
+    """Subcomando `servir` de la línea de comandos."""
+    servicio = ServicioSudoku(args.procesos, args.cola, args.lote, args.espera_lote, args.tiempo_limite)
+    try:
+        asyncio.run(servicio.servir(args.host, args.puerto))
+    except KeyboardInterrupt:
+        pass
 
 # ========================
 # Programa Principal
@@ -689,23 +4623,130 @@ NODOS_EXPLORADOS= 0
 DISTINTAS_SOLUCIONES=0
 CELDAS_JUGABLES=[]
 SOLUCION = {}
+ESTADISTICAS_PROPAGACION = {}  # Por técnica: (celdas colocadas, opciones descartadas)
+
+
+def menu_interactivo():
+    print("\n<-- B I E N V E N I D O -->")
+    print("Haz empezado el juego del SUDOKU")
+    modo_juego = seleccionar_modo()
+    if modo_juego in [1,2]:
+        tamano = seleccionar_tamano()
+        banco = seleccionar_banco(tamano)
+        algoritmo_resolucion = seleccionar_algoritmo()
+        propagador = seleccionar_propagacion()
+        if tamano > 9 and algoritmo_resolucion != 3 and propagador is None:
+            # Sin propagación, backtracking y B&B no terminan en tableros grandes
+            print("En 16x16 y 25x25 los algoritmos 1 y 2 necesitan propagación: se activa.")
+            propagador = Propagador()
+
+    # Ejecutar el modo de juego seleccionado
+    if modo_juego == 1:
+        modo_pc_crea_y_resuelve(algoritmo_resolucion, propagador, tamano, banco)
+    elif modo_juego == 2:
+        modo_pc_crea_jugador_resuelve(algoritmo_resolucion, propagador, tamano, banco)
+    elif modo_juego == 3:
+        modo_jugador_crea_pc_valida()
+    elif modo_juego == 4:
+        ejecutar_pruebas_completas()
+    else:
+        print("Modo de juego no válido.")
+
+def main(argv=None):
+    """Punto de entrada: sin argumentos abre el menú interactivo, con un subcomando lo ejecuta."""
+    parser = argparse.ArgumentParser(description="Juego, generador y solucionador de Sudoku.")
+    subcomandos = parser.add_subparsers(dest="comando")
 
+    generar = subcomandos.add_parser("generar", help="Genera tableros en lote usando todos los núcleos")
+    generar.add_argument("--cantidad", type=int, default=1, help="Cantidad de tableros a generar")
+    generar.add_argument("--dificultad", type=int, choices=[1, 2, 3], default=2, help="1: Fácil, 2: Normal, 3: Difícil")
+    generar.add_argument("--tamano", type=int, choices=[9, 16, 25], default=9, help="Lado del tablero (9, 16 o 25)")
+    generar.add_argument("--semilla", type=int, default=None, help="Semilla base para poder reproducir el lote")
+    generar.add_argument("--procesos", type=int, default=None, help="Cantidad de procesos (por defecto, uno por núcleo)")
+    generar.add_argument("--salida", default=None, help="Archivo de salida (por defecto, la salida estándar)")
+    generar.add_argument("--con-solucion", action="store_true", help="Agrega la solución a continuación de cada tablero")
+    generar.add_argument("--tiempo-limite", type=float, default=None, help="Segundos máximos por tablero; los que se pasan se descartan")
+    generar.add_argument("--calificado", action="store_true",
+                         help="Genera candidatos hasta que la calificación (técnicas y búsqueda) cae en la banda de la dificultad")
+    generar.add_argument("--simetria", choices=sorted(SIMETRIAS), default=None, help="Patrón de pistas simétrico")
+    generar.add_argument("--minimo", action="store_true",
+                         help="Quita pistas hasta que todas son necesarias (ignora la cantidad de la dificultad); con "
+                              "--simetria, hasta que no se puede quitar ningún grupo simétrico")
+
+    completos = subcomandos.add_parser("completos", help="Genera tableros completos (soluciones), uno por línea")
+    completos.add_argument("--cantidad", type=int, default=1, help="Cantidad de tableros")
+    completos.add_argument("--tamano", type=int, choices=[9, 16, 25], default=9, help="Lado del tablero (9, 16 o 25)")
+    completos.add_argument("--semilla", type=int, default=None, help="Semilla para poder reproducir los tableros")
+    completos.add_argument("--variantes", type=int, default=1,
+                           help="Tableros por llenado: el resto son transformaciones del primero (más rápido)")
+    completos.add_argument("--salida", default=None, help="Archivo de salida (por defecto, la salida estándar)")
+
+    resolver = subcomandos.add_parser("resolver", help="Resuelve un archivo de tableros de 81, 256 o 625 caracteres ('0' o '.' vacías)")
+    resolver.add_argument("archivo", help="Archivo con un tablero por línea")
+    resolver.add_argument("--algoritmo", type=int, choices=[1, 2, 3], default=3, help="1: Backtracking, 2: Branch & Bound, 3: Dancing Links")
+    resolver.add_argument("--propagacion", action="store_true", help="Propagar restricciones en cada nodo (algoritmos 1 y 2)")
+    resolver.add_argument("--procesos", type=int, default=None, help="Cantidad de procesos (por defecto, uno por núcleo)")
+    resolver.add_argument("--bloque", type=int, default=256, help="Tableros que se mandan juntos a cada proceso")
+    resolver.add_argument("--tiempo-limite", type=float, default=None, help="Segundos máximos por tablero")
+    resolver.add_argument("--max-nodos", type=int, default=None, help="Nodos máximos por tablero")
+    resolver.add_argument("--dividir", action="store_true",
+                          help="Repartir el árbol de cada tablero entre los procesos (para pocos tableros muy difíciles; ignora --algoritmo)")
+    resolver.add_argument("--salida", default=None, help="Archivo CSV de salida (por defecto, la salida estándar)")
+
+    benchmark = subcomandos.add_parser("benchmark", help="Benchmark reproducible de los algoritmos con salida JSON")
+    benchmark.add_argument("--algoritmos", nargs="+", choices=sorted(ALGORITMOS_BENCHMARK), default=list(ALGORITMOS_BENCHMARK_POR_DEFECTO))
+    benchmark.add_argument("--puzzles", type=int, default=20, help="Tableros por dificultad en el corpus")
+    benchmark.add_argument("--repeticiones", type=int, default=5, help="Corridas medidas por tablero")
+    benchmark.add_argument("--calentamiento", type=int, default=1, help="Corridas descartadas antes de medir")
+    benchmark.add_argument("--semilla", type=int, default=2024, help="Semilla del corpus")
+    benchmark.add_argument("--salida", default=None, help="Archivo JSON de resultados (por defecto, la salida estándar)")
+    benchmark.add_argument("--base", default=None, help="JSON de una corrida anterior contra el cual comparar")
+    benchmark.add_argument("--umbral", type=float, default=0.10, help="Aumento relativo de latencia que cuenta como regresión")
+
+    banco = subcomandos.add_parser("banco", help="Construye un banco binario de tableros para empezar partidas al instante")
+    banco.add_argument("archivo", nargs="?", default=ARCHIVO_BANCO, help=f"Archivo del banco (por defecto, {ARCHIVO_BANCO})")
+    banco.add_argument("--cantidad", type=int, default=100, help="Tableros por dificultad")
+    banco.add_argument("--dificultades", type=int, nargs="+", choices=[1, 2, 3], default=[1, 2, 3])
+    banco.add_argument("--tamano", type=int, choices=[9, 16, 25], default=9, help="Lado del tablero (9, 16 o 25)")
+    banco.add_argument("--semilla", type=int, default=None, help="Semilla base para poder reproducir el banco")
+    banco.add_argument("--procesos", type=int, default=None, help="Cantidad de procesos (por defecto, uno por núcleo)")
+    banco.add_argument("--tiempo-limite", type=float, default=None, help="Segundos máximos por tablero; los que se pasan se descartan")
+    banco.add_argument("--calificado", action="store_true", help="Dificultad según la calificación de cada tablero")
+
+    servir = subcomandos.add_parser("servir", help="Servicio HTTP/JSON local para resolver, generar y validar")
+    servir.add_argument("--host", default="127.0.0.1", help="Dirección donde escuchar")
+    servir.add_argument("--puerto", type=int, default=8080, help="Puerto donde escuchar")
+    servir.add_argument("--procesos", type=int, default=None, help="Cantidad de procesos (por defecto, uno por núcleo)")
+    servir.add_argument("--cola", type=int, default=1024, help="Peticiones en espera antes de responder 503")
+    servir.add_argument("--lote", type=int, default=32, help="Peticiones que se mandan juntas a cada proceso")
+    servir.add_argument("--espera-lote", type=float, default=0.002, help="Segundos que se espera para llenar un lote")
+    servir.add_argument("--tiempo-limite", type=float, default=10.0, help="Segundos máximos por petición")
+
+    pruebas = subcomandos.add_parser("pruebas", help="Pruebas de rendimiento (modo 4) sin pantalla, guardando gráficos y series")
+    pruebas.add_argument("--directorio", default=DIRECTORIO_PRUEBAS, help="Directorio donde guardar gráficos, CSV y JSON")
+    pruebas.add_argument("--formatos", nargs="+", default=["png"], help="Formatos de los gráficos (png, svg, pdf...)")
+    pruebas.add_argument("--sin-graficos", action="store_true", help="Guardar sólo las series, sin importar matplotlib")
+
+    args = parser.parse_args(argv)
+    if args.comando == "generar" and args.minimo and args.calificado:
+        generar.error("--minimo y --calificado no se pueden combinar: un tablero mínimo no se elige por su calificación")
+    if args.comando == "generar":
+        comando_generar(args)
+    elif args.comando == "completos":
+        comando_completos(args)
+    elif args.comando == "resolver":
+        comando_resolver(args)
+    elif args.comando == "benchmark":
+        sys.exit(comando_benchmark(args))
+    elif args.comando == "banco":
+        comando_banco(args)
+    elif args.comando == "servir":
+        comando_servir(args)
+    elif args.comando == "pruebas":
+        ejecutar_pruebas_completas(args.directorio, args.formatos, not args.sin_graficos)
+    else:
+        menu_interactivo()
 
 # INICIO ----------------------------------------------->
-print("\n<-- B I E N V E N I D O -->")
-print("Haz empezado el juego del SUDOKU")
-modo_juego = seleccionar_modo()
-if modo_juego in [1,2]:
-    algoritmo_resolucion = seleccionar_algoritmo()
-
-# Ejecutar el modo de juego seleccionado
-if modo_juego == 1:
-    modo_pc_crea_y_resuelve(algoritmo_resolucion)
-elif modo_juego == 2:
-    modo_pc_crea_jugador_resuelve(algoritmo_resolucion)
-elif modo_juego == 3:
-    modo_jugador_crea_pc_valida()
-elif modo_juego == 4:
-    ejecutar_pruebas_completas()
-else:
-    print("Modo de juego no válido.")
\ No newline at end of file
+if __name__ == "__main__":
+    main()
\ No newline at end of file
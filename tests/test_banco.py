@@ -0,0 +1,60 @@
+import pytest
+
+import Sudoku as S
+
+
+def _revisar_registro(registro, n):
+    tablero, solucion, dificultad, pistas = registro
+    assert len(tablero) == len(solucion) == n
+    assert S.es_valido_sudoku(solucion)
+    assert pistas == sum(1 for fila in tablero for num in fila if num)
+    assert all(num in (0, solucion[f][c]) for f, fila in enumerate(tablero) for c, num in enumerate(fila))
+    assert dificultad in S.DIFICULTADES_BANCO
+
+
+def test_escribir_y_leer_banco(tmp_path):
+    archivo = tmp_path / "banco.bin"
+    guardados = S.construir_banco(str(archivo), 3, semilla=7, procesos=1)
+    assert guardados == {1: 3, 2: 3, 3: 3}
+    with S.BancoTableros(str(archivo)) as banco:
+        assert len(banco) == 9 and banco.n == 9
+        for dificultad in S.DIFICULTADES_BANCO:
+            assert banco.cantidad(dificultad) == 3
+            assert banco.sortear(dificultad)[2] == dificultad
+        for indice in range(len(banco)):
+            _revisar_registro(banco.registro(indice), 9)
+        with pytest.raises(IndexError):
+            banco.registro(9)
+
+
+def test_misma_semilla_mismo_banco(tmp_path):
+    primero, segundo = tmp_path / "a.bin", tmp_path / "b.bin"
+    S.construir_banco(str(primero), 2, dificultades=[2], semilla=3, procesos=1)
+    S.construir_banco(str(segundo), 2, dificultades=[2], semilla=3, procesos=1)
+    assert primero.read_bytes() == segundo.read_bytes()
+    with S.BancoTableros(str(primero)) as banco:
+        assert banco.cantidad(1) == 0
+        with pytest.raises(ValueError):
+            banco.sortear(1)
+
+
+def test_banco_de_16x16_sin_empaquetar(tmp_path):
+    archivo = tmp_path / "banco16.bin"
+    S.construir_banco(str(archivo), 1, dificultades=[1], semilla=1, procesos=1, n=16)
+    with S.BancoTableros(str(archivo)) as banco:
+        assert banco.n == 16
+        _revisar_registro(banco.registro(0), 16)
+
+
+def test_archivo_que_no_es_banco(tmp_path):
+    archivo = tmp_path / "otro.bin"
+    archivo.write_bytes(b"esto no es un banco de tableros")
+    with pytest.raises(ValueError):
+        S.BancoTableros(str(archivo))
+
+
+def test_seleccionar_dificultad_devuelve_celdas_a_quitar(monkeypatch, capsys):
+    respuestas = iter(["x", "5", "3"])
+    monkeypatch.setattr("builtins.input", lambda _: next(respuestas))
+    assert 51 <= S.seleccionar_dificultad() <= 63
+    assert "no válida" in capsys.readouterr().out
@@ -0,0 +1,60 @@
+import copy
+
+import pytest
+
+import Sudoku as S
+
+
+@pytest.fixture(scope="module")
+def resultado():
+    return S.ejecutar_benchmark(("dlx", "bb"), puzzles_por_dificultad=2, repeticiones=1, calentamiento=0)
+
+
+def test_percentil():
+    valores = list(range(1, 101))
+    assert S.percentil(valores, 50) == 50
+    assert S.percentil(valores, 95) == 95
+    assert S.percentil([7], 99) == 7
+    assert S.percentil([], 50) == 0
+
+
+def test_el_corpus_depende_de_la_semilla():
+    assert S.corpus_benchmark(2, semilla=1) == S.corpus_benchmark(2, semilla=1)
+    assert S.corpus_benchmark(2, semilla=1) != S.corpus_benchmark(2, semilla=2)
+
+
+def test_resultado_del_benchmark(resultado):
+    medidas = resultado["resultados"]
+    assert set(medidas) == {"dlx", "bb"}
+    assert set(medidas["dlx"]) == {"facil", "normal", "dificil", "muy_dificiles"}
+    assert medidas["dlx"]["facil"]["muestras"] == 2
+    assert medidas["dlx"]["muy_dificiles"]["muestras"] == len(S.CORPUS_DIFICILES)
+    assert S.comparar_benchmark(resultado, resultado) == []
+
+
+def test_comparar_detecta_regresiones(resultado):
+    actual = copy.deepcopy(resultado)
+    medida = actual["resultados"]["bb"]["normal"]
+    base = resultado["resultados"]["bb"]["normal"]
+    medida["mediana_ns"] = base["mediana_ns"] * 1.05 + 1
+    assert S.comparar_benchmark(actual, resultado) == []
+    medida["mediana_ns"] = base["mediana_ns"] * 1.5 + 1
+    medida["nodos_promedio"] = base["nodos_promedio"] + 1
+    regresiones = S.comparar_benchmark(actual, resultado)
+    assert len(regresiones) == 2
+    assert regresiones[0].startswith("bb/normal: mediana_ns")
+    assert regresiones[1].startswith("bb/normal: nodos_promedio")
+    # Con un umbral más alto la latencia deja de contar, los nodos no
+    assert len(S.comparar_benchmark(actual, resultado, umbral=1.0)) == 1
+
+
+def test_comparar_con_otro_corpus(resultado):
+    otro = copy.deepcopy(resultado)
+    otro["meta"]["huella_corpus"] = "0" * 40
+    assert len(S.comparar_benchmark(resultado, otro)) == 1
+
+
+def test_algoritmos_que_faltan_en_la_base_se_ignoran(resultado):
+    base = copy.deepcopy(resultado)
+    del base["resultados"]["bb"]
+    assert S.comparar_benchmark(resultado, base) == []
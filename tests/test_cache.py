@@ -0,0 +1,63 @@
+import Sudoku as S
+
+LINEA = "....465...459..2.......29.1....8...9953...812....956..6.8....2.49...3....3.61.79."
+
+
+def _equivalente(tablero):
+    # Traspuesto y con los dígitos cambiados: la misma forma canónica
+    cambio = [0, 3, 1, 2, 9, 8, 7, 6, 5, 4]
+    return [[cambio[tablero[col][fila]] for col in range(9)] for fila in range(9)]
+
+
+def _solucion(tablero):
+    return S.resolver(tablero, 3).tablero
+
+
+def test_guardar_y_buscar_el_mismo_tablero():
+    cache = S.CacheSoluciones()
+    tablero = S.linea_a_tablero(LINEA)
+    solucion = _solucion(tablero)
+    assert cache.buscar(tablero) is None
+    cache.guardar(tablero, 1, solucion)
+    assert cache.buscar(tablero) == (1, solucion)
+    assert cache.estadisticas()["aciertos"] == 1
+
+
+def test_tablero_equivalente_recibe_la_solucion_en_su_orientacion():
+    cache = S.CacheSoluciones()
+    tablero = S.linea_a_tablero(LINEA)
+    cache.guardar(tablero, 1, _solucion(tablero))
+    otro = _equivalente(tablero)
+    soluciones, solucion = cache.buscar(otro)
+    assert soluciones == 1
+    assert solucion == _solucion(otro)
+
+
+def test_la_forma_canonica_se_calcula_solo_con_el_mismo_invariante():
+    cache = S.CacheSoluciones()
+    tablero = S.linea_a_tablero(LINEA)
+    cache.guardar(tablero, 1, _solucion(tablero))
+    assert cache.pendientes
+    # Otro tablero sin relación: falla sin canonizar lo pendiente
+    distinto = S.linea_a_tablero("..1.26..535479.8622.8.5.719...6..28.84723.65.6....749..894...265.2.68134..6..2..8")
+    assert cache.buscar(distinto) is None
+    assert cache.pendientes
+    assert cache.buscar(_equivalente(tablero)) is not None
+    assert not any(cache.pendientes.values())
+
+
+def test_sin_solucion_se_guarda_como_cero():
+    cache = S.CacheSoluciones()
+    tablero = S.linea_a_tablero("1" + "." * 8 + "1" + "." * 71)
+    cache.guardar(tablero, 0)
+    assert cache.buscar(tablero) == (0, None)
+
+
+def test_desaloja_la_entrada_menos_usada():
+    cache = S.CacheSoluciones(max_entradas=2, canonica=False)
+    tableros = [S.linea_a_tablero(str(d) + "." * 80) for d in (1, 2, 3)]
+    for tablero in tableros:
+        cache.guardar(tablero, 2)
+    assert cache.buscar(tableros[0]) is None
+    assert cache.buscar(tableros[2]) == (2, None)
+    assert cache.estadisticas()["desalojos"] == 1
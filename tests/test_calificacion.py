@@ -0,0 +1,57 @@
+import random
+
+import pytest
+
+import Sudoku as S
+
+DIFICIL = "800000000003600000070090200050007000000045700000100030001000068008500010090000400"
+
+
+@pytest.mark.parametrize("linea, tecnica, puntaje, dificultad", [
+    ("..1.26..535479.8622.8.5.719...6..28.84723.65.6....749..894...265.2.68134..6..2..8", "singles_desnudos", 1, 1),
+    ("......7.....91...2...2.3.61.1...6.24..84.....7.......9....68.938.1.3.....3..9.2..", "singles_ocultos", 2, 2),
+    ("....465...459..2.......29.1....8...9953...812....956..6.8....2.49...3....3.61.79.", "bloqueo", 3, 2),
+    ("....5.....1...4...2.4.8.9.....13.7..129....4..7......696....8.....7.....4.....693", "pares_desnudos", 4, 3),
+    ("....71......2..1..5.16.............4..7.19..28..3.5.67.8.....2.16....58.3..5.....", "triples_desnudos", 5, 3),
+])
+def test_la_tecnica_mas_dificil_define_la_banda(linea, tecnica, puntaje, dificultad):
+    calificacion = S.calificar(S.linea_a_tablero(linea))
+    assert calificacion.tecnica_maxima == tecnica
+    assert calificacion.puntaje == puntaje == S.PESOS_TECNICAS[tecnica]
+    assert calificacion.dificultad == dificultad
+    assert not calificacion.busqueda
+    assert calificacion.nodos_explorados == calificacion.pasos_atras == 0
+
+
+def test_tablero_que_necesita_busqueda():
+    calificacion = S.calificar(S.linea_a_tablero(DIFICIL))
+    assert calificacion.busqueda and calificacion.dificultad == 3
+    maximo = S.PESOS_TECNICAS[calificacion.tecnica_maxima] if calificacion.tecnica_maxima else 0
+    assert calificacion.puntaje == (maximo + S.PESO_BUSQUEDA + calificacion.nodos_explorados
+                                    + calificacion.pasos_atras)
+
+
+def test_tablero_completo():
+    solucion = S.resolver(DIFICIL).tablero
+    calificacion = S.calificar(solucion)
+    assert (calificacion.puntaje, calificacion.dificultad, calificacion.tecnica_maxima) == (0, 1, None)
+
+
+def test_calificar_no_modifica_el_tablero():
+    tablero = S.linea_a_tablero(DIFICIL)
+    S.calificar(tablero)
+    assert tablero == S.linea_a_tablero(DIFICIL)
+
+
+@pytest.mark.parametrize("dificultad", [1, 2, 3])
+def test_generar_tablero_calificado_cae_en_su_banda(dificultad):
+    tablero, solucion, _, calificacion = S.generar_tablero_calificado(dificultad, random.Random(dificultad))
+    minimo, maximo = S.BANDAS_CALIFICACION[dificultad]
+    assert minimo <= calificacion.puntaje <= maximo
+    assert calificacion.dificultad == dificultad
+    assert S.calificar(tablero) == calificacion
+    assert S.resolver(tablero).tablero == solucion
+
+
+def test_banda_imposible_agota_los_intentos():
+    assert S.generar_tablero_calificado(1, random.Random(1), banda=(-2, -1), max_intentos=3) is None
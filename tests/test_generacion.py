@@ -0,0 +1,119 @@
+import random
+
+import pytest
+
+import Sudoku as S
+
+
+def test_verificador_de_unicidad_coincide_con_el_conteo():
+    rng = random.Random(5)
+    tablero = S.generar_tablero_completo(rng)
+    verificador = S.VerificadorUnicidad.desde_tablero(tablero)
+    orden = list(range(81))
+    rng.shuffle(orden)
+    rechazadas = 0
+    for i in orden:
+        fila, col = divmod(i, 9)
+        prueba = S.copiar_tablero(tablero)
+        prueba[fila][col] = 0
+        esperado = S.contar_soluciones(prueba) == 1
+        assert verificador.es_necesaria(i) == (not esperado)
+        assert verificador.quitar_si_unica(i) == esperado
+        rechazadas += not esperado
+        # El motor escribe en el tablero: siempre queda con solución única
+        assert tablero == prueba if esperado else tablero[fila][col] != 0
+        assert S.contar_soluciones(tablero) == 1
+    assert rechazadas > 0
+
+
+def test_verificador_sin_solucion_unica():
+    assert S.VerificadorUnicidad.desde_tablero(S.linea_a_tablero("1" + "." * 80)) is None
+    assert S.VerificadorUnicidad.desde_tablero(S.linea_a_tablero("11" + "." * 79)) is None
+
+
+def _a_tablero(celdas, n):
+    return [list(celdas[fila * n:fila * n + n]) for fila in range(n)]
+
+
+@pytest.mark.parametrize("n", [9, 16, 25])
+def test_llenado_rapido_con_semilla(n):
+    celdas = S.llenar_tablero_rapido(random.Random(4), n)
+    assert len(celdas) == n * n
+    assert S.es_valido_sudoku(_a_tablero(celdas, n))
+    # La misma semilla da el mismo tablero y otra semilla uno distinto
+    assert S.llenar_tablero_rapido(random.Random(4), n) == celdas
+    assert S.llenar_tablero_rapido(random.Random(5), n) != celdas
+
+
+def test_llenado_rapido_con_limites_agotados():
+    with pytest.raises(S.BusquedaInterrumpida):
+        S.llenar_tablero_rapido(random.Random(1), 16, S.Limites(segundos=0))
+
+
+def test_tableros_completos_con_variantes():
+    tableros = S.generar_tableros_completos(7, random.Random(2), variantes=3)
+    assert len(tableros) == 7
+    assert all(S.es_valido_sudoku(tablero) for tablero in tableros)
+    assert len({S.tablero_a_linea(tablero) for tablero in tableros}) == 7
+    assert S.generar_tableros_completos(7, random.Random(2), variantes=3) == tableros
+
+
+def test_comando_completos_con_semilla(tmp_path):
+    salidas = [tmp_path / "a.txt", tmp_path / "b.txt"]
+    for salida in salidas:
+        S.main(["completos", "--cantidad", "3", "--semilla", "8", "--tamano", "16", "--salida", str(salida)])
+    lineas = salidas[0].read_text(encoding="utf-8").split()
+    assert len(lineas) == 3 and salidas[1].read_text(encoding="utf-8").split() == lineas
+    assert all(S.es_valido_sudoku(S.linea_a_tablero(linea)) for linea in lineas)
+
+
+def _pistas(tablero):
+    return sum(1 for fila in tablero for num in fila if num)
+
+
+def test_minimizar_pistas_deja_un_tablero_minimo():
+    solucion = S.generar_tablero_completo(random.Random(3))
+    tablero = S.copiar_tablero(solucion)
+    jugables = S.minimizar_pistas(tablero, random.Random(3))
+    assert sorted(jugables) == [(f, c) for f in range(9) for c in range(9) if tablero[f][c] == 0]
+    assert S.es_minimo(tablero) is True
+    assert S.resolver(tablero).tablero == solucion
+    # Las rondas extra parten de la misma primera pasada y se quedan con la mejor
+    con_rondas = S.copiar_tablero(solucion)
+    S.minimizar_pistas(con_rondas, random.Random(3), rondas=5)
+    assert S.es_minimo(con_rondas) is True
+    assert _pistas(con_rondas) <= _pistas(tablero)
+
+
+def test_es_minimo():
+    tablero, _, _ = S.generar_tablero_jugable(1, random.Random(6))
+    assert S.es_minimo(tablero) is False
+    assert S.es_minimo(S.linea_a_tablero("1" + "." * 80)) is None
+    assert S.minimizar_pistas(S.linea_a_tablero("1" + "." * 80)) is None
+
+
+@pytest.mark.parametrize("simetria", sorted(S.SIMETRIAS))
+def test_generacion_simetrica(simetria):
+    tablero, solucion, _ = S.generar_tablero_jugable(2, random.Random(9), simetria=simetria)
+    for fila in range(9):
+        for col in range(9):
+            for f, c in S.SIMETRIAS[simetria](fila, col, 9):
+                assert (tablero[fila][col] == 0) == (tablero[f][c] == 0)
+    assert S.contar_soluciones(tablero) == 1
+    assert S.resolver(tablero).tablero == solucion
+
+
+@pytest.mark.parametrize("simetria", ["rotacional", "diagonal"])
+def test_minimo_por_grupos_simetricos(simetria):
+    tablero, _, _ = S.generar_tablero_jugable(2, random.Random(2), simetria=simetria, minimo=True)
+    pistas = [(f, c) for f in range(9) for c in range(9) if tablero[f][c]]
+    for grupo in S.grupos_de_simetria(pistas, simetria, 9):
+        prueba = S.copiar_tablero(tablero)
+        for f, c in grupo:
+            prueba[f][c] = 0
+        assert S.contar_soluciones(prueba) == 2
+
+
+def test_minimo_no_se_combina_con_calificado():
+    with pytest.raises(ValueError):
+        list(S.generar_lote(1, 2, semilla=1, procesos=1, calificado=True, minimo=True))
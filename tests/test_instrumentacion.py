@@ -0,0 +1,55 @@
+import pytest
+
+import Sudoku as S
+
+LINEA = "....465...459..2.......29.1....8...9953...812....956..6.8....2.49...3....3.61.79."
+DIFICIL = "800000000003600000070090200050007000000045700000100030001000068008500010090000400"
+
+
+@pytest.mark.parametrize("algoritmo, motor", [(1, "listas"), (1, "bitmask"), (2, "listas"), (2, "bitmask"), (3, "bitmask")])
+def test_contadores_coinciden_con_el_resultado(algoritmo, motor):
+    eventos = {"nodo": 0, "asignar": 0, "retroceder": 0, "podar": 0}
+
+    def contar(evento):
+        def callback(*args):
+            eventos[evento] += 1
+        return callback
+
+    instrumentacion = S.Instrumentacion(contar("nodo"), contar("asignar"), contar("retroceder"), contar("podar"))
+    resultado = S.resolver(LINEA, algoritmo, motor, instrumentacion=instrumentacion)
+    resumen = instrumentacion.resumen()
+    assert resultado.resuelto
+    assert resumen["asignaciones"] == resultado.nodos_explorados == eventos["asignar"]
+    assert resumen["retrocesos"] == resultado.pasos_atras == eventos["retroceder"]
+    # Un nodo por asignación más la raíz
+    assert resumen["nodos"] == eventos["nodo"] == resultado.nodos_explorados + 1
+    assert sum(resumen["podas"].values()) == eventos["podar"]
+    assert resumen["profundidad_maxima"] == len(resultado.camino)
+
+
+def test_los_dos_motores_miden_las_mismas_fases():
+    fases = {}
+    for motor in ("listas", "bitmask"):
+        instrumentacion = S.Instrumentacion()
+        S.resolver(LINEA, 2, motor, instrumentacion=instrumentacion)
+        fases[motor] = instrumentacion.resumen()["fases"]
+        assert all(f["llamadas"] > 0 and f["tiempo_ns"] >= 0 for f in fases[motor].values())
+    assert set(fases["listas"]) == set(fases["bitmask"]) == {"obtener_opciones_validas", "crear_cola_prioridad",
+                                                            "calcular_cota_superior"}
+
+
+def test_fase_de_propagacion():
+    instrumentacion = S.Instrumentacion()
+    resultado = S.resolver(DIFICIL, 2, "bitmask", propagacion=True, instrumentacion=instrumentacion)
+    fases = instrumentacion.resumen()["fases"]
+    assert resultado.resuelto
+    assert fases["propagar"]["llamadas"] >= instrumentacion.nodos > 0
+
+
+def test_medir_cuenta_aunque_la_funcion_falle():
+    instrumentacion = S.Instrumentacion()
+    assert instrumentacion.medir("suma", sum, [1, 2]) == 3
+    with pytest.raises(ZeroDivisionError):
+        instrumentacion.medir("division", divmod, 1, 0)
+    assert instrumentacion.resumen()["fases"].keys() == {"suma", "division"}
+    assert instrumentacion.llamadas["division"] == 1
@@ -0,0 +1,68 @@
+import threading
+
+import pytest
+
+import Sudoku as S
+
+DIFICIL = "800000000003600000070090200050007000000045700000100030001000068008500010090000400"
+
+
+def test_limite_de_nodos():
+    limites = S.Limites(max_nodos=3)
+    for _ in range(3):
+        limites.verificar()
+    with pytest.raises(S.BusquedaInterrumpida) as error:
+        limites.verificar()
+    assert error.value.motivo == limites.motivo == "nodos"
+
+
+def test_revisar_suma_nodos_de_afuera():
+    limites = S.Limites(max_nodos=100)
+    limites.revisar(60)
+    with pytest.raises(S.BusquedaInterrumpida):
+        limites.revisar(41)
+    assert limites.nodos == 101 and limites.motivo == "nodos"
+
+
+def test_limite_de_tiempo():
+    limites = S.Limites(segundos=0)
+    with pytest.raises(S.BusquedaInterrumpida):
+        limites.verificar()
+    assert limites.motivo == "tiempo"
+
+
+def test_cancelacion():
+    evento = threading.Event()
+    limites = S.Limites(cancelacion=evento)
+    limites.revisar()
+    evento.set()
+    with pytest.raises(S.BusquedaInterrumpida):
+        limites.revisar()
+    assert limites.motivo == "cancelada"
+
+
+@pytest.mark.parametrize("algoritmo, motor", [(1, "listas"), (1, "bitmask"), (2, "listas"), (2, "bitmask"), (3, "bitmask")])
+def test_resolver_agotado_devuelve_el_tablero_original(algoritmo, motor):
+    resultado = S.resolver(DIFICIL, algoritmo, motor, limites=S.Limites(max_nodos=10))
+    assert not resultado.resuelto
+    assert resultado.interrumpido == "nodos"
+    assert resultado.nodos_explorados == 11
+    assert resultado.tablero == S.linea_a_tablero(DIFICIL)
+
+
+def test_cancelar_desde_otro_hilo():
+    evento = threading.Event()
+    temporizador = threading.Timer(0.05, evento.set)
+    temporizador.start()
+    try:
+        # Sin propagación, el backtracking de listas tarda mucho más que eso en este tablero
+        resultado = S.resolver(DIFICIL, 1, "listas", limites=S.Limites(cancelacion=evento))
+    finally:
+        temporizador.cancel()
+    assert resultado.interrumpido == "cancelada"
+    assert resultado.nodos_explorados > 0
+
+
+def test_generacion_con_limites_agotados():
+    assert S.generar_tablero_completo(limites=S.Limites(segundos=0)) is None
+    assert S.resolver(DIFICIL, 2, limites=S.Limites(segundos=0)).interrumpido == "tiempo"
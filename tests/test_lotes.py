@@ -0,0 +1,56 @@
+import csv
+
+import pytest
+
+import Sudoku as S
+
+UNICO = "....465...459..2.......29.1....8...9953...812....956..6.8....2.49...3....3.61.79."
+DIFICIL = "800000000003600000070090200050007000000045700000100030001000068008500010090000400"
+REPETIDAS = "11" + "." * 79
+INVALIDA = '12,3"x'
+
+
+@pytest.fixture
+def archivo(tmp_path):
+    ruta = tmp_path / "tableros.txt"
+    ruta.write_text("\n".join(["# comentario", UNICO, "", REPETIDAS, INVALIDA, DIFICIL]) + "\n", encoding="utf-8")
+    return ruta
+
+
+def _resolver_archivo(archivo, *opciones):
+    salida = archivo.with_name("salida.csv")
+    S.main(["resolver", str(archivo), "--salida", str(salida)] + list(opciones))
+    with open(salida, encoding="utf-8", newline="") as entrada:
+        return {int(fila["linea"]): fila for fila in csv.DictReader(entrada)}
+
+
+def test_resolver_archivo_a_csv(archivo, capsys):
+    filas = _resolver_archivo(archivo, "--procesos", "1")
+    assert sorted(filas) == [2, 4, 5, 6]
+    assert filas[2]["solucion"] == S.tablero_a_linea(S.resolver(UNICO).tablero)
+    assert filas[4]["solucion"] == "sin_solucion"
+    # La línea inválida conserva sus comas y comillas en una sola columna
+    assert filas[5]["tablero"] == INVALIDA
+    assert filas[5]["solucion"] == S.LINEA_INVALIDA
+    assert filas[6]["solucion"] == S.tablero_a_linea(S.resolver(DIFICIL).tablero)
+    assert "2/4 tableros resueltos" in capsys.readouterr().err
+
+
+def test_tableros_que_agotan_sus_limites(archivo, capsys):
+    filas = _resolver_archivo(archivo, "--procesos", "1", "--algoritmo", "1", "--max-nodos", "50")
+    assert filas[6]["solucion"] == "agotado_nodos"
+    assert filas[5]["solucion"] == S.LINEA_INVALIDA
+    assert "(1 líneas no son tableros)" in capsys.readouterr().err
+
+
+def test_lote_en_varios_procesos_mantiene_el_orden():
+    lineas = list(enumerate([UNICO, INVALIDA, DIFICIL] * 5, 1))
+    resultados = list(S.resolver_lote(lineas, 3, procesos=2, tamano_bloque=2))
+    assert [r[:2] for r in resultados] == lineas
+    assert [r[6] for r in resultados[:3]] == [None, S.LINEA_INVALIDA, None]
+
+
+def test_dividir_da_las_mismas_soluciones(archivo):
+    normal = _resolver_archivo(archivo, "--procesos", "1")
+    dividido = _resolver_archivo(archivo, "--procesos", "2", "--dividir")
+    assert {k: v["solucion"] for k, v in dividido.items()} == {k: v["solucion"] for k, v in normal.items()}
@@ -0,0 +1,141 @@
+import random
+
+import pytest
+
+import Sudoku as S
+
+# Tableros con solución única generados con generar_tablero_jugable (dificultades 1, 2 y 3)
+TABLEROS = [
+    "..1.26..535479.8622.8.5.719...6..28.84723.65.6....749..894...265.2.68134..6..2..8",
+    "....465...459..2.......29.1....8...9953...812....956..6.8....2.49...3....3.61.79.",
+    "......7.....91...2...2.3.61.1...6.24..84.....7.......9....68.938.1.3.....3..9.2..",
+]
+DIFICIL = "800000000003600000070090200050007000000045700000100030001000068008500010090000400"
+SIN_SOLUCION = "1" + "." * 8 + "1" + "." * 71  # Dos 1 en la primera columna
+
+
+def _respeta_pistas(linea, tablero):
+    return all(c in ".0" or int(c) == tablero[i // 9][i % 9] for i, c in enumerate(linea))
+
+
+@pytest.mark.parametrize("linea", TABLEROS)
+@pytest.mark.parametrize("algoritmo", [1, 2])
+def test_motor_de_listas_y_de_mascaras_exploran_igual(linea, algoritmo):
+    listas = S.resolver(linea, algoritmo, "listas")
+    mascaras = S.resolver(linea, algoritmo, "bitmask")
+    assert listas.resuelto and mascaras.resuelto
+    assert listas.nodos_explorados == mascaras.nodos_explorados
+    assert listas.pasos_atras == mascaras.pasos_atras
+    assert list(listas.camino.items()) == list(mascaras.camino.items())
+
+
+@pytest.mark.parametrize("linea", TABLEROS)
+def test_bb_incremental_explora_igual_que_recalculando(linea):
+    recalculado, motor = S.ejecutar_bb_bitmask(S.linea_a_tablero(linea), incremental=False)
+    incremental, estado = S.ejecutar_bb_bitmask(S.linea_a_tablero(linea), incremental=True)
+    assert recalculado and incremental
+    assert motor.nodos_explorados == estado.nodos_explorados
+    assert motor.pasos_atras == estado.pasos_atras
+    assert list(motor.solucion.items()) == list(estado.solucion.items())
+
+
+@pytest.mark.parametrize("linea", TABLEROS + [DIFICIL])
+@pytest.mark.parametrize("algoritmo", [1, 2])
+def test_la_propagacion_no_cambia_la_solucion(linea, algoritmo):
+    propagado = S.resolver(linea, algoritmo, "bitmask", propagacion=True)
+    assert propagado.resuelto and S.es_valido_sudoku(propagado.tablero)
+    assert _respeta_pistas(linea, propagado.tablero)
+    assert propagado.tablero == S.resolver(linea, 2, "bitmask").tablero
+
+
+@pytest.mark.parametrize("linea", TABLEROS + [DIFICIL])
+def test_dlx_y_propagacion_dan_la_misma_solucion(linea):
+    dlx = S.resolver(linea, 3)
+    assert dlx.resuelto and S.es_valido_sudoku(dlx.tablero)
+    assert _respeta_pistas(linea, dlx.tablero)
+    assert S.contar_soluciones_dlx(S.linea_a_tablero(linea)) == 1
+    for algoritmo in (1, 2):
+        assert S.resolver(linea, algoritmo, "bitmask", propagacion=True).tablero == dlx.tablero
+
+
+def test_tablero_sin_solucion():
+    assert S.contar_soluciones_dlx(S.linea_a_tablero(SIN_SOLUCION)) == 0
+    assert not S.resolver(SIN_SOLUCION, 3).resuelto
+    assert not S.resolver(SIN_SOLUCION, 2, "bitmask", propagacion=True).resuelto
+
+
+def test_conteo_se_detiene_en_dos():
+    assert S.contar_soluciones(S.linea_a_tablero(TABLEROS[2])) == 1
+    # Con una sola pista hay muchísimas soluciones: se deja de contar en la segunda
+    assert S.contar_soluciones(S.linea_a_tablero("1" + "." * 80)) == 2
+    assert S.contar_soluciones_dlx(S.linea_a_tablero("1" + "." * 80), 7) == 7
+
+
+def test_conteo_pausable_restaura_el_tablero():
+    tablero = S.linea_a_tablero("1" + "." * 80)
+    original = [fila[:] for fila in tablero]
+    busqueda = S.BusquedaPausable.conteo(tablero, limite=5)
+    while not busqueda.avanzar(max_nodos=10):
+        pass
+    assert busqueda.resultado == 5
+    assert tablero == original
+
+
+@pytest.mark.parametrize("fabrica, algoritmo, motor", [
+    (S.BusquedaPausable.backtracking, 1, "listas"),
+    (S.BusquedaPausable.branch_and_bound, 2, "listas"),
+    (S.BusquedaPausable.backtracking_bitmask, 1, "bitmask"),
+    (S.BusquedaPausable.branch_and_bound_bitmask, 2, "bitmask"),
+])
+def test_busqueda_pausable_reanuda_donde_quedo(fabrica, algoritmo, motor):
+    tablero = S.linea_a_tablero(TABLEROS[1])
+    busqueda = fabrica(tablero)
+    tramos = 1
+    while not busqueda.avanzar(max_nodos=10):
+        tramos += 1
+    completa = S.resolver(TABLEROS[1], algoritmo, motor)
+    assert busqueda.resultado and tramos > 1
+    assert busqueda.estado.nodos_explorados == completa.nodos_explorados
+    assert tablero == completa.tablero
+
+
+def test_tablero_grande_con_propagacion():
+    generado = S.generar_tablero_jugable(2, random.Random(1), n=16)
+    tablero, solucion, _ = generado
+    resultado = S.resolver(tablero, 2, "bitmask", propagacion=True)
+    assert resultado.resuelto
+    assert resultado.tablero == solucion
+
+
+@pytest.mark.parametrize("linea", ["1", "1234" * 4, "." * 80])
+def test_linea_con_un_lado_no_soportado(linea):
+    # 1×1 y 4×4 son cuadrados perfectos, pero sólo se juega en 9×9, 16×16 y 25×25
+    with pytest.raises(ValueError):
+        S.linea_a_tablero(linea)
+    with pytest.raises(ValueError):
+        S.resolver(linea)
+
+
+def test_linea_de_16x16():
+    assert len(S.linea_a_tablero("G" + "." * 255)) == 16
+
+
+def test_tiene_solucion_unica():
+    assert S.tiene_solucion_unica(S.linea_a_tablero(TABLEROS[0]))
+    assert S.tiene_solucion_unica(S.linea_a_tablero("1" + "." * 80)) is False
+    agotados = S.Limites(max_nodos=5)
+    assert S.tiene_solucion_unica(S.linea_a_tablero(DIFICIL), agotados) is None
+
+
+def test_barrido_de_unicidad_con_semilla():
+    barrido = S.barrido_unicidad([81, 17], 4, semilla=1, procesos=1)
+    # Con todas las pistas siempre es única; vaciando 64 celdas al azar, casi nunca
+    assert barrido == {81: 1.0, 17: 0.0}
+    assert S.barrido_unicidad([40], 4, semilla=1, procesos=1) == S.barrido_unicidad([40], 4, semilla=1, procesos=2)
+
+
+def test_motor_desconocido():
+    with pytest.raises(ValueError):
+        S.resolver(TABLEROS[0], 1, "lista")
+    with pytest.raises(ValueError):
+        S.ejecutar_algoritmo(S.linea_a_tablero(TABLEROS[0]), 3, "dlx")
@@ -0,0 +1,28 @@
+import pytest
+
+import Sudoku as S
+
+UNICO = "......7.....91...2...2.3.61.1...6.24..84.....7.......9....68.938.1.3.....3..9.2.."
+# Con una sola pista, las soluciones se cuentan por millones
+CASI_VACIO = "1" + "." * 80
+
+
+@pytest.mark.parametrize("limite", [1, 2, 10, 50])
+def test_el_conteo_en_paralelo_respeta_el_limite(limite):
+    assert S.contar_soluciones_paralelo(CASI_VACIO, limite, procesos=2, nodos_por_tarea=50) == limite
+
+
+def test_conteo_en_paralelo_de_un_tablero_unico():
+    assert S.contar_soluciones_paralelo(UNICO, 10, procesos=2) == 1
+
+
+def test_resolver_en_paralelo():
+    soluciones, primera, _, _ = S.buscar_en_paralelo(UNICO, procesos=2)
+    assert soluciones >= 1
+    assert S.Tablero(primera).a_lista() == S.resolver(UNICO, 3).tablero
+
+
+def test_pistas_repetidas_no_tienen_solucion():
+    # Dos 1 en la primera fila: sin revisar las pistas, el árbol se recorría entero
+    assert S.contar_soluciones_paralelo("11" + "." * 79, 5, procesos=2) == 0
+    assert not S.resolver_paralelo("11" + "." * 79, procesos=2).resuelto
@@ -0,0 +1,58 @@
+import pytest
+
+import Sudoku as S
+
+LINEA = "..1.26..535479.8622.8.5.719...6..28.84723.65.6....749..894...265.2.68134..6..2..8"
+
+
+@pytest.fixture
+def partida():
+    return S.PartidaSudoku(S.linea_a_tablero(LINEA))
+
+
+def test_jugar_deshacer_y_rehacer(partida):
+    vacias = partida.vacias
+    assert partida.jugar(0, 0, 7) is not None
+    assert partida.tablero[0][0] == 7 and partida.vacias == vacias - 1
+    assert partida.deshacer() == (0, 0)
+    assert partida.tablero[0][0] == 0 and partida.vacias == vacias
+    assert partida.rehacer() == (0, 0)
+    assert partida.tablero[0][0] == 7
+    assert partida.rehacer() is None
+
+
+def test_jugar_despues_de_deshacer_borra_lo_rehecho(partida):
+    partida.jugar(0, 0, 7)
+    partida.deshacer()
+    partida.jugar(0, 1, 7)
+    assert partida.rehacer() is None
+    assert partida.deshacer() == (0, 1)
+    assert partida.deshacer() is None
+
+
+def test_los_conflictos_se_deshacen(partida):
+    # El 5 ya está en la fila 0
+    assert partida.jugar(0, 0, 5)
+    assert (0, 0) in partida.celdas_en_conflicto()
+    partida.deshacer()
+    assert not partida.celdas_en_conflicto()
+
+
+def test_las_pistas_no_se_editan(partida):
+    with pytest.raises(ValueError):
+        partida.jugar(0, 2, 4)
+    with pytest.raises(ValueError):
+        partida.jugar(0, 0, 10)
+
+
+def test_completar_con_pistas_resuelve(partida):
+    while (pista := partida.pista()) is not None:
+        partida.jugar(*pista)
+    assert partida.resuelto()
+    assert partida.tablero == S.resolver(LINEA, 3).tablero
+
+
+def test_es_modificable(partida):
+    jugables = S.celdas_vacias_de(S.linea_a_tablero(LINEA))
+    assert S.es_modificable((0, 0), jugables) and S.es_modificable((0, 0), partida)
+    assert not S.es_modificable((0, 2), jugables) and not S.es_modificable((0, 2), partida)
@@ -0,0 +1,112 @@
+import asyncio
+import http.client
+import json
+import socket
+import threading
+
+import pytest
+
+import Sudoku as S
+
+LINEA = "....465...459..2.......29.1....8...9953...812....956..6.8....2.49...3....3.61.79."
+DIFICIL = "800000000003600000070090200050007000000045700000100030001000068008500010090000400"
+
+
+@pytest.fixture(scope="module")
+def servicio():
+    # El servicio corre en su propio loop, en otro hilo; las pruebas le hablan por HTTP
+    loop = asyncio.new_event_loop()
+    hilo = threading.Thread(target=loop.run_forever, daemon=True)
+    hilo.start()
+    servicio = S.ServicioSudoku(procesos=1, tiempo_limite=30.0)
+    host, puerto = asyncio.run_coroutine_threadsafe(servicio.iniciar(puerto=0), loop).result(60)
+    yield servicio, host, puerto
+    asyncio.run_coroutine_threadsafe(servicio.detener(), loop).result(60)
+    loop.call_soon_threadsafe(loop.stop)
+    hilo.join()
+
+
+def _pedir(servicio, metodo, ruta, datos=None, cuerpo=None):
+    _, host, puerto = servicio
+    if datos is not None:
+        cuerpo = json.dumps(datos)
+    conexion = http.client.HTTPConnection(host, puerto, timeout=60)
+    try:
+        conexion.request(metodo, ruta, cuerpo, {"Content-Type": "application/json"})
+        respuesta = conexion.getresponse()
+        return respuesta.status, json.loads(respuesta.read())
+    finally:
+        conexion.close()
+
+
+def test_salud(servicio):
+    assert _pedir(servicio, "GET", "/salud") == (200, {"estado": "ok"})
+
+
+def test_validar(servicio):
+    solucion = S.tablero_a_linea(S.resolver(LINEA).tablero)
+    assert _pedir(servicio, "POST", "/validar", {"tablero": solucion}) == (200, {"valido": True})
+    assert _pedir(servicio, "POST", "/validar", {"tablero": LINEA}) == (200, {"valido": False})
+    assert _pedir(servicio, "POST", "/validar", {"tablero": LINEA, "completo": False}) == (200, {"valido": True})
+    assert _pedir(servicio, "POST", "/validar", {"tablero": S.linea_a_tablero(LINEA), "completo": False})[0] == 200
+    assert _pedir(servicio, "POST", "/validar", {"tablero": "1"})[0] == 400
+
+
+def test_resolver(servicio):
+    esperado = S.tablero_a_linea(S.resolver(LINEA).tablero)
+    estado, respuesta = _pedir(servicio, "POST", "/resolver", {"tablero": LINEA})
+    assert estado == 200 and respuesta["resuelto"] and respuesta["solucion"] == esperado
+    estado, respuesta = _pedir(servicio, "POST", "/resolver", {"tablero": S.linea_a_tablero(LINEA), "algoritmo": 2})
+    assert estado == 200 and respuesta["solucion"] == esperado
+    estado, respuesta = _pedir(servicio, "POST", "/resolver", {"tablero": DIFICIL, "algoritmo": 1, "max_nodos": 10})
+    assert estado == 200 and not respuesta["resuelto"] and respuesta["interrumpido"] == "nodos"
+
+
+def test_generar(servicio):
+    estado, respuesta = _pedir(servicio, "POST", "/generar", {"dificultad": 1, "semilla": 3})
+    assert estado == 200
+    tablero, solucion = S.linea_a_tablero(respuesta["tablero"]), S.linea_a_tablero(respuesta["solucion"])
+    assert S.es_valido_sudoku(solucion)
+    assert S.contar_soluciones(tablero) == 1
+    assert _pedir(servicio, "POST", "/generar", {"dificultad": 1, "semilla": 3})[1] == respuesta
+    assert _pedir(servicio, "POST", "/generar", {"dificultad": 7})[0] == 400
+
+
+@pytest.mark.parametrize("metodo, ruta, datos, cuerpo, estado", [
+    ("POST", "/resolver", None, "{no es json", 400),
+    ("POST", "/resolver", [LINEA], None, 400),
+    ("POST", "/resolver", {}, None, 400),
+    ("POST", "/resolver", {"tablero": 5}, None, 400),
+    ("POST", "/resolver", {"tablero": "1"}, None, 400),
+    ("POST", "/resolver", {"tablero": LINEA, "algoritmo": 7}, None, 400),
+    ("POST", "/resolver", {"tablero": LINEA, "tiempo_limite": "pronto"}, None, 400),
+    ("POST", "/resolver", {"tablero": LINEA, "tiempo_limite": -1}, None, 400),
+    ("POST", "/resolver", {"tablero": LINEA, "tiempo_limite": 0}, None, 504),
+    ("POST", "/resolver", None, "x" * (S.ServicioSudoku.TAMANO_MAXIMO_CUERPO + 1), 413),
+    ("GET", "/resolver", None, None, 405),
+    ("POST", "/salud", None, None, 404),
+    ("GET", "/no-existe", None, None, 404),
+])
+def test_peticiones_con_error(servicio, metodo, ruta, datos, cuerpo, estado):
+    respuesta = _pedir(servicio, metodo, ruta, datos, cuerpo)
+    assert respuesta[0] == estado
+    assert "error" in respuesta[1]
+
+
+def test_linea_de_peticion_invalida(servicio):
+    _, host, puerto = servicio
+    with socket.create_connection((host, puerto), timeout=60) as conexion:
+        conexion.sendall(b"HOLA\r\n\r\n")
+        respuesta = conexion.makefile("rb").read()
+    assert respuesta.startswith(b"HTTP/1.1 400 ")
+
+
+def test_metricas(servicio):
+    _pedir(servicio, "GET", "/salud")
+    _pedir(servicio, "GET", "/no-existe")
+    estado, metricas = _pedir(servicio, "GET", "/metricas")
+    assert estado == 200
+    assert metricas["latencias"]["/salud"]["cantidad"] >= 1
+    assert "/no-existe" not in metricas["latencias"] and metricas["latencias"]["otras"]["cantidad"] >= 1
+    assert metricas["respuestas"]["200"] >= 1 and metricas["respuestas"]["404"] >= 1
+    assert metricas["cola"]["profundidad"] == 0
@@ -0,0 +1,68 @@
+import math
+import random
+
+import pytest
+
+import Sudoku as S
+
+np = pytest.importorskip("numpy")
+
+
+def _primera_unidad(tablero, validarCeros):
+    # Mismo orden que es_valido_sudoku: filas, columnas y bloques
+    n = len(tablero)
+    lado = math.isqrt(n)
+    filas = [list(fila) for fila in tablero]
+    columnas = [[tablero[f][c] for f in range(n)] for c in range(n)]
+    bloques = [[tablero[i + f][j + c] for f in range(lado) for c in range(lado)]
+               for i in range(0, n, lado) for j in range(0, n, lado)]
+    for unidad, celdas in enumerate(filas + columnas + bloques):
+        if (validarCeros and unidad < n and 0 in celdas) or not S.es_valido_conjunto(celdas):
+            return unidad
+    return -1
+
+
+def _tableros(n, cantidad, rng):
+    tableros = []
+    for _ in range(cantidad):
+        tablero = S.generar_tablero_completo(rng, n=n)
+        for _ in range(rng.randrange(3)):
+            # Un número cambiado (puede repetirse) o una celda vacía
+            tablero[rng.randrange(n)][rng.randrange(n)] = rng.randrange(n + 1)
+        tableros.append(tablero)
+    return tableros
+
+
+@pytest.mark.parametrize("n", [9, 16])
+@pytest.mark.parametrize("validarCeros", [True, False])
+def test_validar_lote_coincide_con_es_valido_sudoku(n, validarCeros):
+    tableros = _tableros(n, 60, random.Random(n))
+    validos, primera = S.validar_lote(S.tableros_a_arreglo(tableros), validarCeros, tamano_bloque=16)
+    assert validos.tolist() == [S.es_valido_sudoku(t, validarCeros) for t in tableros]
+    assert primera.tolist() == [_primera_unidad(t, validarCeros) for t in tableros]
+    assert 0 < validos.sum() < len(tableros)
+
+
+def test_primera_unidad_que_falla():
+    tablero = S.generar_tablero_completo(random.Random(1))
+    columna = S.copiar_tablero(tablero)
+    # Intercambiar dos números de una fila la deja bien pero rompe dos columnas
+    columna[4][2], columna[4][7] = columna[4][7], columna[4][2]
+    bloque = S.copiar_tablero(tablero)
+    # Intercambiar dos filas de distinta banda conserva filas y columnas, rompe bloques
+    bloque[0], bloque[3] = bloque[3], bloque[0]
+    vacio = S.copiar_tablero(tablero)
+    vacio[5][5] = 0
+    validos, primera = S.validar_lote(np.array([tablero, columna, bloque, vacio], dtype=np.uint8))
+    assert validos.tolist() == [True, False, False, False]
+    assert primera.tolist() == [-1, 9 + 2, 18, 5]
+    assert S.validar_lote(np.array([vacio], dtype=np.uint8), validarCeros=False)[0].tolist() == [True]
+
+
+def test_validar_lote_rechaza_formas_y_valores_invalidos():
+    with pytest.raises(ValueError):
+        S.validar_lote(np.zeros((2, 9, 8), dtype=np.uint8))
+    with pytest.raises(ValueError):
+        S.validar_lote(np.zeros((2, 8, 8), dtype=np.uint8))
+    with pytest.raises(ValueError):
+        S.validar_lote(np.full((1, 9, 9), 10, dtype=np.uint8))